@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the AI service.
+
+Runs `python -X importtime -c "import src.main"` in fresh interpreters and
+reports the total import time of src.main and the slowest modules, so that
+regressions in cold-start time are easy to spot.
+
+Usage:
+    python scripts/benchmark_import_time.py [--runs N] [--top N] [--module NAME]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+SERVICE_ROOT = Path(__file__).parent.parent
+
+
+def measure(module: str) -> Dict[str, int]:
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Args:
+        module: Dotted module name to import
+
+    Returns:
+        Cumulative import time in microseconds per imported module
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SERVICE_ROOT), env.get("PYTHONPATH")]))
+    env.setdefault("GOOGLE_API_KEY", "benchmark")
+    env.setdefault("DATABASE_URL", "postgresql://benchmark@localhost/benchmark")
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SERVICE_ROOT,
+        env=env,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        print(result.stderr, file=sys.stderr)
+        sys.exit(f"❌ Importing {module} failed")
+
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        cumulative[name.strip()] = int(cumulative_us)
+
+    return cumulative
+
+
+def main():
+    """Run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="src.main", help="Module to import (default: src.main)")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreter runs; the fastest is reported")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest modules to list")
+    args = parser.parse_args()
+
+    runs: List[Dict[str, int]] = [measure(args.module) for _ in range(max(1, args.runs))]
+    best = min(runs, key=lambda run: run[args.module])
+    totals = sorted(run[args.module] for run in runs)
+
+    print(f"⏱️  import {args.module}")
+    print(f"   best {totals[0] / 1000:.1f}ms | median {totals[len(totals) // 2] / 1000:.1f}ms over {len(totals)} runs")
+    print()
+    print("Slowest imports (cumulative, best run):")
+
+    slowest: List[Tuple[str, int]] = sorted(
+        ((name, us) for name, us in best.items() if name != args.module),
+        key=lambda item: item[1],
+        reverse=True
+    )
+    for name, us in slowest[:args.top]:
+        print(f"  {us / 1000:8.1f}ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
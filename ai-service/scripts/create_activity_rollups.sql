@@ -0,0 +1,249 @@
+-- Migration: Create weekly and monthly activity rollup tables
+-- Date: 2025-01-20
+-- Description: Per-user weekly/monthly aggregates of activity_data joined with
+-- heart_rate_data, kept current by triggers, used by get_fitness_summary
+
+-- Weekly buckets start on Monday
+CREATE TABLE IF NOT EXISTS activity_rollup_weekly (
+    user_id UUID NOT NULL,
+    bucket_start DATE NOT NULL,
+    day_count INTEGER NOT NULL,
+    steps_sum BIGINT NOT NULL DEFAULT 0,
+    steps_days INTEGER NOT NULL DEFAULT 0,
+    distance_sum NUMERIC NOT NULL DEFAULT 0,
+    calories_sum BIGINT NOT NULL DEFAULT 0,
+    active_minutes_sum BIGINT NOT NULL DEFAULT 0,
+    heart_rate_sum BIGINT NOT NULL DEFAULT 0,
+    heart_rate_days INTEGER NOT NULL DEFAULT 0,
+    floors_sum BIGINT NOT NULL DEFAULT 0,
+    days_active INTEGER NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (user_id, bucket_start)
+);
+
+-- Monthly buckets start on the 1st
+CREATE TABLE IF NOT EXISTS activity_rollup_monthly (
+    user_id UUID NOT NULL,
+    bucket_start DATE NOT NULL,
+    day_count INTEGER NOT NULL,
+    steps_sum BIGINT NOT NULL DEFAULT 0,
+    steps_days INTEGER NOT NULL DEFAULT 0,
+    distance_sum NUMERIC NOT NULL DEFAULT 0,
+    calories_sum BIGINT NOT NULL DEFAULT 0,
+    active_minutes_sum BIGINT NOT NULL DEFAULT 0,
+    heart_rate_sum BIGINT NOT NULL DEFAULT 0,
+    heart_rate_days INTEGER NOT NULL DEFAULT 0,
+    floors_sum BIGINT NOT NULL DEFAULT 0,
+    days_active INTEGER NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (user_id, bucket_start)
+);
+
+-- Recompute the week and month buckets containing one user's day.
+-- Refreshes for the same user are serialized by a transaction-scoped
+-- advisory lock: a writer waits for the other transaction to commit, and
+-- its recompute then reads the committed rows (each statement takes a new
+-- snapshot under READ COMMITTED). The last writer's full recompute wins.
+CREATE OR REPLACE FUNCTION refresh_activity_rollups(p_user_id UUID, p_date DATE)
+RETURNS VOID AS $$
+DECLARE
+    week_start DATE := date_trunc('week', p_date)::date;
+    month_start DATE := date_trunc('month', p_date)::date;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('activity_rollups'), hashtext(p_user_id::text));
+
+    DELETE FROM activity_rollup_weekly
+    WHERE user_id = p_user_id AND bucket_start = week_start;
+
+    INSERT INTO activity_rollup_weekly (
+        user_id, bucket_start, day_count, steps_sum, steps_days, distance_sum,
+        calories_sum, active_minutes_sum, heart_rate_sum, heart_rate_days,
+        floors_sum, days_active, refreshed_at
+    )
+    SELECT
+        p_user_id,
+        week_start,
+        COUNT(*),
+        COALESCE(SUM(a.steps), 0),
+        COUNT(a.steps),
+        COALESCE(SUM(a.distance), 0),
+        COALESCE(SUM(a.calories), 0),
+        COALESCE(SUM(a."activeMinutes"), 0),
+        COALESCE(SUM(h."restingHeartRate"), 0),
+        COUNT(h."restingHeartRate"),
+        COALESCE(SUM(a.floors), 0),
+        COUNT(CASE WHEN a.steps >= 5000 THEN 1 END),
+        NOW()
+    FROM activity_data a
+    LEFT JOIN heart_rate_data h ON a."userId" = h."userId" AND a.date = h.date
+    WHERE a."userId" = p_user_id
+        AND a.date >= week_start
+        AND a.date < week_start + 7
+    HAVING COUNT(*) > 0
+    ON CONFLICT (user_id, bucket_start) DO UPDATE SET
+        day_count = EXCLUDED.day_count,
+        steps_sum = EXCLUDED.steps_sum,
+        steps_days = EXCLUDED.steps_days,
+        distance_sum = EXCLUDED.distance_sum,
+        calories_sum = EXCLUDED.calories_sum,
+        active_minutes_sum = EXCLUDED.active_minutes_sum,
+        heart_rate_sum = EXCLUDED.heart_rate_sum,
+        heart_rate_days = EXCLUDED.heart_rate_days,
+        floors_sum = EXCLUDED.floors_sum,
+        days_active = EXCLUDED.days_active,
+        refreshed_at = EXCLUDED.refreshed_at;
+
+    DELETE FROM activity_rollup_monthly
+    WHERE user_id = p_user_id AND bucket_start = month_start;
+
+    INSERT INTO activity_rollup_monthly (
+        user_id, bucket_start, day_count, steps_sum, steps_days, distance_sum,
+        calories_sum, active_minutes_sum, heart_rate_sum, heart_rate_days,
+        floors_sum, days_active, refreshed_at
+    )
+    SELECT
+        p_user_id,
+        month_start,
+        COUNT(*),
+        COALESCE(SUM(a.steps), 0),
+        COUNT(a.steps),
+        COALESCE(SUM(a.distance), 0),
+        COALESCE(SUM(a.calories), 0),
+        COALESCE(SUM(a."activeMinutes"), 0),
+        COALESCE(SUM(h."restingHeartRate"), 0),
+        COUNT(h."restingHeartRate"),
+        COALESCE(SUM(a.floors), 0),
+        COUNT(CASE WHEN a.steps >= 5000 THEN 1 END),
+        NOW()
+    FROM activity_data a
+    LEFT JOIN heart_rate_data h ON a."userId" = h."userId" AND a.date = h.date
+    WHERE a."userId" = p_user_id
+        AND a.date >= month_start
+        AND a.date < (month_start + INTERVAL '1 month')::date
+    HAVING COUNT(*) > 0
+    ON CONFLICT (user_id, bucket_start) DO UPDATE SET
+        day_count = EXCLUDED.day_count,
+        steps_sum = EXCLUDED.steps_sum,
+        steps_days = EXCLUDED.steps_days,
+        distance_sum = EXCLUDED.distance_sum,
+        calories_sum = EXCLUDED.calories_sum,
+        active_minutes_sum = EXCLUDED.active_minutes_sum,
+        heart_rate_sum = EXCLUDED.heart_rate_sum,
+        heart_rate_days = EXCLUDED.heart_rate_days,
+        floors_sum = EXCLUDED.floors_sum,
+        days_active = EXCLUDED.days_active,
+        refreshed_at = EXCLUDED.refreshed_at;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Refresh affected buckets whenever an activity or heart rate day changes.
+-- These row triggers run inside every write the backend makes to
+-- activity_data and heart_rate_data: each written row recomputes one week
+-- and one month of that user's days, and an error in the refresh aborts
+-- the backend's write. For bulk imports, disable the two triggers
+-- (ALTER TABLE ... DISABLE TRIGGER) and re-run the backfill below instead.
+CREATE OR REPLACE FUNCTION activity_rollup_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM refresh_activity_rollups(NEW."userId", NEW.date);
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM refresh_activity_rollups(OLD."userId", OLD.date);
+    ELSE
+        PERFORM refresh_activity_rollups(OLD."userId", OLD.date);
+        IF NEW."userId" IS DISTINCT FROM OLD."userId" OR NEW.date IS DISTINCT FROM OLD.date THEN
+            PERFORM refresh_activity_rollups(NEW."userId", NEW.date);
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_activity_data_rollups ON activity_data;
+
+CREATE TRIGGER trigger_activity_data_rollups
+    AFTER INSERT OR UPDATE OR DELETE ON activity_data
+    FOR EACH ROW
+    EXECUTE FUNCTION activity_rollup_trigger();
+
+DROP TRIGGER IF EXISTS trigger_heart_rate_data_rollups ON heart_rate_data;
+
+CREATE TRIGGER trigger_heart_rate_data_rollups
+    AFTER INSERT OR UPDATE OR DELETE ON heart_rate_data
+    FOR EACH ROW
+    EXECUTE FUNCTION activity_rollup_trigger();
+
+-- Backfill buckets from existing data; re-running it refreshes every bucket
+INSERT INTO activity_rollup_weekly (
+    user_id, bucket_start, day_count, steps_sum, steps_days, distance_sum,
+    calories_sum, active_minutes_sum, heart_rate_sum, heart_rate_days,
+    floors_sum, days_active
+)
+SELECT
+    a."userId",
+    date_trunc('week', a.date)::date,
+    COUNT(*),
+    COALESCE(SUM(a.steps), 0),
+    COUNT(a.steps),
+    COALESCE(SUM(a.distance), 0),
+    COALESCE(SUM(a.calories), 0),
+    COALESCE(SUM(a."activeMinutes"), 0),
+    COALESCE(SUM(h."restingHeartRate"), 0),
+    COUNT(h."restingHeartRate"),
+    COALESCE(SUM(a.floors), 0),
+    COUNT(CASE WHEN a.steps >= 5000 THEN 1 END)
+FROM activity_data a
+LEFT JOIN heart_rate_data h ON a."userId" = h."userId" AND a.date = h.date
+GROUP BY 1, 2
+ON CONFLICT (user_id, bucket_start) DO UPDATE SET
+    day_count = EXCLUDED.day_count,
+    steps_sum = EXCLUDED.steps_sum,
+    steps_days = EXCLUDED.steps_days,
+    distance_sum = EXCLUDED.distance_sum,
+    calories_sum = EXCLUDED.calories_sum,
+    active_minutes_sum = EXCLUDED.active_minutes_sum,
+    heart_rate_sum = EXCLUDED.heart_rate_sum,
+    heart_rate_days = EXCLUDED.heart_rate_days,
+    floors_sum = EXCLUDED.floors_sum,
+    days_active = EXCLUDED.days_active,
+    refreshed_at = NOW();
+
+INSERT INTO activity_rollup_monthly (
+    user_id, bucket_start, day_count, steps_sum, steps_days, distance_sum,
+    calories_sum, active_minutes_sum, heart_rate_sum, heart_rate_days,
+    floors_sum, days_active
+)
+SELECT
+    a."userId",
+    date_trunc('month', a.date)::date,
+    COUNT(*),
+    COALESCE(SUM(a.steps), 0),
+    COUNT(a.steps),
+    COALESCE(SUM(a.distance), 0),
+    COALESCE(SUM(a.calories), 0),
+    COALESCE(SUM(a."activeMinutes"), 0),
+    COALESCE(SUM(h."restingHeartRate"), 0),
+    COUNT(h."restingHeartRate"),
+    COALESCE(SUM(a.floors), 0),
+    COUNT(CASE WHEN a.steps >= 5000 THEN 1 END)
+FROM activity_data a
+LEFT JOIN heart_rate_data h ON a."userId" = h."userId" AND a.date = h.date
+GROUP BY 1, 2
+ON CONFLICT (user_id, bucket_start) DO UPDATE SET
+    day_count = EXCLUDED.day_count,
+    steps_sum = EXCLUDED.steps_sum,
+    steps_days = EXCLUDED.steps_days,
+    distance_sum = EXCLUDED.distance_sum,
+    calories_sum = EXCLUDED.calories_sum,
+    active_minutes_sum = EXCLUDED.active_minutes_sum,
+    heart_rate_sum = EXCLUDED.heart_rate_sum,
+    heart_rate_days = EXCLUDED.heart_rate_days,
+    floors_sum = EXCLUDED.floors_sum,
+    days_active = EXCLUDED.days_active,
+    refreshed_at = NOW();
+
+-- Add comments
+COMMENT ON TABLE activity_rollup_weekly IS 'Per-user weekly activity aggregates (Monday buckets), maintained by triggers';
+COMMENT ON TABLE activity_rollup_monthly IS 'Per-user monthly activity aggregates, maintained by triggers';
+COMMENT ON COLUMN activity_rollup_weekly.steps_days IS 'Days with a non-null step count (AVG denominator)';
+COMMENT ON COLUMN activity_rollup_weekly.heart_rate_days IS 'Days with a resting heart rate (AVG denominator)';
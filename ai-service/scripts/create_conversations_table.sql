@@ -5,7 +5,7 @@
 -- Create conversations table
 CREATE TABLE IF NOT EXISTS conversations (
     id SERIAL PRIMARY KEY,
-    user_id INTEGER NOT NULL,
+    user_id UUID NOT NULL,
     conversation_id VARCHAR(255) NOT NULL,
     role VARCHAR(20) NOT NULL CHECK (role IN ('user', 'assistant')),
     content TEXT NOT NULL,
@@ -44,7 +44,7 @@ COMMENT ON COLUMN conversations.created_at IS 'Timestamp when message was create
 -- Optional: Create ai_insights table for caching insights
 CREATE TABLE IF NOT EXISTS ai_insights (
     id SERIAL PRIMARY KEY,
-    user_id INTEGER NOT NULL,
+    user_id UUID NOT NULL,
     period VARCHAR(20) NOT NULL CHECK (period IN ('week', 'month', 'year')),
     insights JSONB NOT NULL,
     summary JSONB,
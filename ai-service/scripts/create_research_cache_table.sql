@@ -0,0 +1,23 @@
+-- Migration: Create research_cache table for web search results
+-- Date: 2025-01-20
+-- Description: Persistent TTL cache of Serper / Google Custom Search results
+
+CREATE TABLE IF NOT EXISTS research_cache (
+    query_key TEXT PRIMARY KEY,
+    provider VARCHAR(20) NOT NULL,
+    results JSONB NOT NULL DEFAULT '[]'::jsonb,
+    is_error BOOLEAN NOT NULL DEFAULT FALSE,
+    error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+-- Create indexes
+CREATE INDEX IF NOT EXISTS idx_research_cache_expires_at
+    ON research_cache(expires_at);
+
+-- Add comments
+COMMENT ON TABLE research_cache IS 'Cached web search results keyed by canonicalized query';
+COMMENT ON COLUMN research_cache.query_key IS 'Provider-independent canonical form of the search query';
+COMMENT ON COLUMN research_cache.is_error IS 'Negative cache entry: the search failed';
+COMMENT ON COLUMN research_cache.expires_at IS 'When the cached results expire';
@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+Synthetic fitness data generator for scale benchmarks.
+
+Generates users with activity_data, heart_rate_data, sleep_data,
+weight_data and user_goals rows for N users x M days. The data has per-user
+baselines, weekly seasonality, slow drift, motivated/unmotivated stretches
+that produce goal streaks, device-off gaps and occasional outliers.
+
+Every user is generated from its own RNG seeded with (seed, user index),
+so output is deterministic by seed and independent of batching. Dates end
+at --end-date (today by default; pass it explicitly for byte-identical
+reruns).
+
+Output goes either straight into Postgres via COPY, or into the JSON
+fixture format read by InMemoryStorage (STORAGE_BACKEND=memory).
+
+Usage:
+    python scripts/generate_synthetic_data.py --users 1000 --days 365 --format copy [--replace]
+    python scripts/generate_synthetic_data.py --users 100 --days 90 --format fixture --output synthetic.json.gz
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Columns written per table, in load order (users first for the foreign keys)
+TABLE_COLUMNS = {
+    "users": (
+        "id", "email", "firstName", "lastName", "password", "createdAt", "updatedAt"
+    ),
+    "user_goals": (
+        "id", "user_id", "fitnessGoal", "currentWeight", "targetWeight", "height",
+        "currentBMI", "idealBMI", "age", "gender", "activityLevel", "dailyStepsGoal",
+        "dailyCaloriesBurnGoal", "dailyActiveMinutesGoal", "dailySleepHoursGoal",
+        "weeklyWorkoutsGoal", "aiRecommendationsEnabled", "createdAt", "updatedAt"
+    ),
+    "activity_data": (
+        "id", "userId", "date", "steps", "distance", "floors", "elevation", "calories",
+        "activeMinutes", "sedentaryMinutes", "lightlyActiveMinutes", "fairlyActiveMinutes",
+        "veryActiveMinutes", "dataSource", "createdAt", "updatedAt"
+    ),
+    "heart_rate_data": (
+        "id", "userId", "date", "restingHeartRate", "heartRateZones", "outOfRangeMinutes",
+        "fatBurnMinutes", "cardioMinutes", "peakMinutes", "dataSource", "createdAt", "updatedAt"
+    ),
+    "sleep_data": (
+        "id", "userId", "dateOfSleep", "duration", "efficiency", "startTime", "endTime",
+        "minutesAsleep", "minutesAwake", "minutesToFallAsleep", "minutesAfterWakeup",
+        "timeInBed", "type", "deepSleepMinutes", "lightSleepMinutes", "remSleepMinutes",
+        "wakeSleepMinutes", "sleepStages", "dataSource", "createdAt"
+    ),
+    "weight_data": (
+        "id", "userId", "date", "weight", "bmi", "fat", "unit", "loggedAt", "source",
+        "dataSource", "createdAt", "updatedAt"
+    ),
+}
+
+# Tables written to fixtures (users carry nothing InMemoryStorage reads)
+FIXTURE_TABLES = ("activity_data", "heart_rate_data", "sleep_data", "weight_data", "user_goals")
+
+# jsonb columns, kept as objects in fixtures and encoded for COPY
+JSON_COLUMNS = {"heartRateZones", "sleepStages"}
+
+# Column holding the user ID, for --replace
+USER_COLUMNS = {
+    "users": "id",
+    "user_goals": "user_id",
+    "activity_data": "userId",
+    "heart_rate_data": "userId",
+    "sleep_data": "userId",
+    "weight_data": "userId",
+}
+
+# Enum values from the backend's UserGoals entity
+FITNESS_GOALS = ["lose_weight", "gain_muscle", "maintain_weight", "improve_endurance", "general_fitness"]
+ACTIVITY_LEVELS = ["sedentary", "lightly_active", "moderately_active", "very_active", "extra_active"]
+
+# Rebuild the activity rollups (create_activity_rollups.sql) for loaded users
+ROLLUP_REBUILD_SQL = """
+    INSERT INTO {table} (
+        user_id, bucket_start, day_count, steps_sum, steps_days, distance_sum,
+        calories_sum, active_minutes_sum, heart_rate_sum, heart_rate_days,
+        floors_sum, days_active
+    )
+    SELECT
+        a."userId",
+        date_trunc('{unit}', a.date)::date,
+        COUNT(*),
+        COALESCE(SUM(a.steps), 0),
+        COUNT(a.steps),
+        COALESCE(SUM(a.distance), 0),
+        COALESCE(SUM(a.calories), 0),
+        COALESCE(SUM(a."activeMinutes"), 0),
+        COALESCE(SUM(h."restingHeartRate"), 0),
+        COUNT(h."restingHeartRate"),
+        COALESCE(SUM(a.floors), 0),
+        COUNT(CASE WHEN a.steps >= 5000 THEN 1 END)
+    FROM activity_data a
+    LEFT JOIN heart_rate_data h ON a."userId" = h."userId" AND a.date = h.date
+    WHERE a."userId" = ANY($1::uuid[])
+    GROUP BY 1, 2
+"""
+
+ROLLUP_TRIGGERS = {
+    "activity_data": "trigger_activity_data_rollups",
+    "heart_rate_data": "trigger_heart_rate_data_rollups",
+}
+
+Rows = Dict[str, List[Tuple[Any, ...]]]
+
+
+def user_id_for(seed: int, index: int) -> str:
+    """Deterministic user UUID for a seed and user index."""
+    return str(uuid.UUID(bytes=np.random.default_rng([seed, index, 0]).bytes(16), version=4))
+
+
+def _uuids(rng: np.random.Generator, n: int) -> List[str]:
+    """n random version-4 UUID strings drawn from rng."""
+    raw = rng.bytes(16 * n)
+    return [str(uuid.UUID(bytes=raw[i * 16:(i + 1) * 16], version=4)) for i in range(n)]
+
+
+def _runs(rng: np.random.Generator, days: int, p_start: float, mean_length: float) -> np.ndarray:
+    """
+    Boolean mask of stretches that start with probability p_start per day
+    and last a geometric number of days with the given mean.
+    """
+    mask = np.zeros(days, dtype=bool)
+    starts = np.flatnonzero(rng.random(days) < p_start)
+    lengths = rng.geometric(1 / mean_length, size=starts.size)
+    for start, length in zip(starts, lengths):
+        mask[start:start + length] = True
+    return mask
+
+
+def generate_user(seed: int, index: int, end_date: date, days: int) -> Rows:
+    """
+    Generate every table's rows for one user.
+
+    Args:
+        seed: Dataset seed
+        index: User index within the dataset
+        end_date: Last generated day
+        days: Days of history
+
+    Returns:
+        Row tuples (in TABLE_COLUMNS order) keyed by table name
+    """
+    rng = np.random.default_rng([seed, index])
+    user_id = user_id_for(seed, index)
+    first_day = end_date - timedelta(days=days - 1)
+
+    # Some users join partway through the window
+    joined = int(rng.integers(0, max(1, days // 2))) if rng.random() < 0.2 else 0
+    ordinals = np.arange(first_day.toordinal() + joined, end_date.toordinal() + 1)
+    n = ordinals.size
+    weekday = (ordinals - 1) % 7
+    weekend = weekday >= 5
+
+    # Steps: baseline x weekday pattern x drift x motivation x noise
+    base = rng.lognormal(np.log(7500), 0.35)
+    weekday_factor = 1 + rng.normal(0, 0.08, 7)
+    weekday_factor[5:] *= rng.choice([0.7, 0.85, 1.2])
+    drift = np.exp(np.clip(np.cumsum(rng.normal(0, 0.012, n)), -0.5, 0.5))
+    motivated = _runs(rng, n, 0.03, 12)
+    steps = base * weekday_factor[weekday] * drift * np.where(motivated, 1.4, 1.0) * rng.lognormal(0, 0.2, n)
+
+    # Outliers: long hikes and races, sick days, days the tracker barely synced
+    steps = np.where(rng.random(n) < 0.01, steps * rng.uniform(2, 3.5, n), steps)
+    steps = np.where(rng.random(n) < 0.01, steps * rng.uniform(0.05, 0.3, n), steps)
+    steps = np.where(rng.random(n) < 0.005, 0, steps)
+    steps = np.clip(steps, 0, 80000).astype(np.int64)
+
+    # Device-off gaps drop the whole day from every table
+    present = ~_runs(rng, n, 0.012, 5)
+
+    stride_km = rng.uniform(0.00065, 0.0008)
+    distance = (steps * stride_km * rng.normal(1, 0.03, n)).clip(0).round(2)
+    floors = rng.poisson(steps / 1200 * rng.uniform(0.3, 1.5))
+    elevation = (floors * 3.05).round(2)
+    calories = (rng.uniform(1400, 2100) + steps * 0.045 * rng.normal(1, 0.05, n)).astype(np.int64)
+    active_minutes = (steps / 110 * rng.normal(1, 0.15, n)).clip(0).astype(np.int64)
+    very_active = (active_minutes * rng.uniform(0.3, 0.6, n)).astype(np.int64)
+    fairly_active = active_minutes - very_active
+    lightly_active = (steps / 45 * rng.normal(1, 0.15, n)).clip(0, 600).astype(np.int64)
+
+    # Sleep: longer on weekends, with its own missing nights
+    asleep = rng.normal(405, 45, n).clip(180, 660) + np.where(weekend, 35, 0)
+    asleep = asleep.astype(np.int64)
+    awake = rng.integers(15, 70, n)
+    to_fall_asleep = rng.integers(0, 30, n)
+    after_wakeup = rng.integers(0, 15, n)
+    in_bed = asleep + awake + to_fall_asleep + after_wakeup
+    bedtime = rng.normal(23 * 60, 40, n) + np.where(weekend, 45, 0)
+    deep = (asleep * rng.uniform(0.13, 0.2, n)).astype(np.int64)
+    rem = (asleep * rng.uniform(0.18, 0.25, n)).astype(np.int64)
+    light = asleep - deep - rem
+    sedentary = (1440 - active_minutes - lightly_active - in_bed).clip(0)
+
+    # Resting heart rate improves slightly on motivated stretches
+    rhr_base = rng.uniform(52, 74)
+    resting_hr = np.rint(rhr_base - np.where(motivated, 2, 0) + rng.normal(0, 1.8, n)).astype(np.int64)
+    has_hr = present & (steps > 0) & (rng.random(n) < 0.95)
+    has_sleep = present & (rng.random(n) < 0.9)
+
+    # Weight: trend by goal, logged on some mornings
+    goal = FITNESS_GOALS[int(rng.integers(len(FITNESS_GOALS)))]
+    height_m = rng.normal(1.72, 0.09)
+    start_weight = float(np.clip(rng.normal(23.5, 3.5) * height_m ** 2, 45, 150))
+    trend = {"lose_weight": -0.03, "gain_muscle": 0.012}.get(goal, 0.0)
+    weight = (start_weight + trend * np.arange(n) + rng.normal(0, 0.4, n)).round(2)
+    has_weight = present & (rng.random(n) < rng.uniform(0.1, 0.6))
+    body_fat = rng.uniform(14, 32)
+
+    rows: Rows = {table: [] for table in TABLE_COLUMNS}
+    joined_at = datetime.combine(date.fromordinal(int(ordinals[0])), datetime.min.time())
+    updated_at = datetime.combine(end_date, datetime.min.time())
+
+    rows["users"].append((
+        user_id, f"synthetic-{seed}-{index}@example.com", "Synthetic", f"User {index}",
+        "!", joined_at, updated_at
+    ))
+
+    current_weight = round(float(weight[-1]), 2)
+    rows["user_goals"].append((
+        _uuids(rng, 1)[0], user_id, goal, current_weight,
+        round(current_weight * (1 + {"lose_weight": -0.1, "gain_muscle": 0.05}.get(goal, 0.0)), 2),
+        round(height_m * 100, 2), round(current_weight / height_m ** 2, 2), 22.0,
+        int(rng.integers(18, 70)), str(rng.choice(["male", "female", "other"], p=[0.48, 0.48, 0.04])),
+        ACTIVITY_LEVELS[int(np.clip(base // 2500, 0, 4))], int(rng.choice([7500, 8000, 10000, 12000])),
+        int(rng.choice([2000, 2200, 2500, 2800])), int(rng.choice([30, 45, 60])),
+        float(rng.choice([7.0, 7.5, 8.0])), int(rng.integers(3, 7)), bool(rng.random() < 0.3),
+        joined_at, updated_at
+    ))
+
+    dates = [date.fromordinal(int(o)) for o in ordinals]
+    stamps = [datetime.combine(d, datetime.min.time()) + timedelta(hours=23, minutes=59) for d in dates]
+    ids = iter(_uuids(rng, int(present.sum() + has_hr.sum() + has_sleep.sum() + has_weight.sum())))
+
+    (steps_l, distance_l, floors_l, elevation_l, calories_l, active_l, sedentary_l, lightly_l,
+     fairly_l, very_l, rhr_l, asleep_l, awake_l, to_fall_l, after_l, in_bed_l, bedtime_l,
+     deep_l, rem_l, light_l, weight_l) = (
+        a.tolist() for a in (
+            steps, distance, floors, elevation, calories, active_minutes, sedentary, lightly_active,
+            fairly_active, very_active, resting_hr, asleep, awake, to_fall_asleep, after_wakeup,
+            in_bed, bedtime, deep, rem, light, weight
+        )
+    )
+
+    for i in np.flatnonzero(present).tolist():
+        rows["activity_data"].append((
+            next(ids), user_id, dates[i], steps_l[i], distance_l[i], floors_l[i], elevation_l[i],
+            calories_l[i], active_l[i], sedentary_l[i], lightly_l[i], fairly_l[i], very_l[i],
+            "fitbit", stamps[i], stamps[i]
+        ))
+
+    for i in np.flatnonzero(has_hr).tolist():
+        fat_burn = int(active_l[i] * 0.8)
+        cardio = int(very_l[i] * 0.6)
+        peak = int(very_l[i] * 0.1)
+        out_of_range = 1440 - fat_burn - cardio - peak
+        rows["heart_rate_data"].append((
+            next(ids), user_id, dates[i], rhr_l[i],
+            [
+                {"name": "Out of Range", "min": 30, "max": 98, "minutes": out_of_range, "caloriesOut": out_of_range},
+                {"name": "Fat Burn", "min": 98, "max": 137, "minutes": fat_burn, "caloriesOut": fat_burn * 6},
+                {"name": "Cardio", "min": 137, "max": 166, "minutes": cardio, "caloriesOut": cardio * 10},
+                {"name": "Peak", "min": 166, "max": 220, "minutes": peak, "caloriesOut": peak * 13},
+            ],
+            out_of_range, fat_burn, cardio, peak, "fitbit", stamps[i], stamps[i]
+        ))
+
+    for i in np.flatnonzero(has_sleep).tolist():
+        start = datetime.combine(dates[i], datetime.min.time()) - timedelta(days=1) + timedelta(minutes=bedtime_l[i])
+        rows["sleep_data"].append((
+            next(ids), user_id, dates[i], in_bed_l[i] * 60000, round(asleep_l[i] / in_bed_l[i] * 100),
+            start, start + timedelta(minutes=in_bed_l[i]), asleep_l[i], awake_l[i], to_fall_l[i],
+            after_l[i], in_bed_l[i], "stages", deep_l[i], light_l[i], rem_l[i], awake_l[i],
+            {"deep": deep_l[i], "light": light_l[i], "rem": rem_l[i], "wake": awake_l[i]},
+            "fitbit", stamps[i]
+        ))
+
+    for i in np.flatnonzero(has_weight).tolist():
+        logged_at = datetime.combine(dates[i], datetime.min.time()) + timedelta(hours=7, minutes=i % 60)
+        rows["weight_data"].append((
+            next(ids), user_id, dates[i], weight_l[i], round(weight_l[i] / height_m ** 2, 2),
+            round(body_fat - (start_weight - weight_l[i]) * 0.3, 2), "kg", logged_at, "api",
+            "fitbit", stamps[i], stamps[i]
+        ))
+
+    return rows
+
+
+def generate_batch(seed: int, indexes: Sequence[int], end_date: date, days: int) -> Rows:
+    """Generate and merge rows for a batch of users."""
+    batch: Rows = {table: [] for table in TABLE_COLUMNS}
+    for index in indexes:
+        for table, table_rows in generate_user(seed, index, end_date, days).items():
+            batch[table].extend(table_rows)
+    return batch
+
+
+def _batches(users: int, size: int):
+    """Consecutive user index ranges of at most size users."""
+    for start in range(0, users, size):
+        yield range(start, min(start + size, users))
+
+
+async def load_copy(args: argparse.Namespace, end_date: date) -> Dict[str, int]:
+    """
+    Bulk-load generated rows into Postgres with COPY, in one transaction.
+
+    The rollup triggers are disabled during the load and the rollups of the
+    loaded users are rebuilt set-based afterwards, instead of refreshing
+    two buckets per inserted row.
+
+    Returns:
+        Rows loaded per table
+    """
+    import asyncpg  # type: ignore
+
+    conn = await asyncpg.connect(args.database_url)
+    counts = {table: 0 for table in TABLE_COLUMNS}
+    user_ids = [user_id_for(args.seed, index) for index in range(args.users)]
+
+    try:
+        tables = [
+            table for table in TABLE_COLUMNS
+            if await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", table)
+        ]
+        for table in TABLE_COLUMNS:
+            if table not in tables:
+                print(f"   ⚠ Table {table} not found (skipping)")
+        rollups = await conn.fetchval("SELECT to_regclass('activity_rollup_weekly') IS NOT NULL")
+
+        async with conn.transaction():
+            if rollups:
+                for table, trigger in ROLLUP_TRIGGERS.items():
+                    await conn.execute(f'ALTER TABLE {table} DISABLE TRIGGER {trigger}')
+
+            if args.replace:
+                for table in reversed(tables):
+                    await conn.execute(f'DELETE FROM {table} WHERE "{USER_COLUMNS[table]}" = ANY($1::uuid[])', user_ids)
+
+            for indexes in _batches(args.users, args.batch_users):
+                batch = generate_batch(args.seed, indexes, end_date, args.days)
+                for table in tables:
+                    columns = TABLE_COLUMNS[table]
+                    records = batch[table]
+                    json_at = [i for i, column in enumerate(columns) if column in JSON_COLUMNS]
+                    if json_at:
+                        records = [
+                            tuple(json.dumps(v) if i in json_at else v for i, v in enumerate(record))
+                            for record in records
+                        ]
+                    await conn.copy_records_to_table(table, records=records, columns=list(columns))
+                    counts[table] += len(records)
+                print(f"   ✓ Users {indexes.stop}/{args.users} loaded")
+
+            if rollups:
+                for table, unit in (("activity_rollup_weekly", "week"), ("activity_rollup_monthly", "month")):
+                    await conn.execute(f"DELETE FROM {table} WHERE user_id = ANY($1::uuid[])", user_ids)
+                    await conn.execute(ROLLUP_REBUILD_SQL.format(table=table, unit=unit), user_ids)
+                for table, trigger in ROLLUP_TRIGGERS.items():
+                    await conn.execute(f'ALTER TABLE {table} ENABLE TRIGGER {trigger}')
+                print("   ✓ Activity rollups rebuilt")
+
+        for table in tables:
+            await conn.execute(f"ANALYZE {table}")
+
+    finally:
+        await conn.close()
+
+    return counts
+
+
+def _fixture_value(value: Any) -> Any:
+    """JSON-friendly fixture value."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def write_fixture(args: argparse.Namespace, end_date: date) -> Dict[str, int]:
+    """
+    Write generated rows to a fixture file for InMemoryStorage.
+
+    Rows are spooled per table to temporary files as they are generated, so
+    memory stays flat in the number of users.
+
+    Returns:
+        Rows written per table
+    """
+    counts = {table: 0 for table in FIXTURE_TABLES}
+
+    with tempfile.TemporaryDirectory() as spool_dir:
+        spools = {table: open(Path(spool_dir) / f"{table}.jsonl", "w") for table in FIXTURE_TABLES}
+        try:
+            for indexes in _batches(args.users, args.batch_users):
+                batch = generate_batch(args.seed, indexes, end_date, args.days)
+                for table in FIXTURE_TABLES:
+                    columns = TABLE_COLUMNS[table]
+                    for record in batch[table]:
+                        row = {column: _fixture_value(value) for column, value in zip(columns, record)}
+                        spools[table].write(json.dumps(row) + "\n")
+                    counts[table] += len(batch[table])
+                print(f"   ✓ Users {indexes.stop}/{args.users} generated")
+        finally:
+            for spool in spools.values():
+                spool.close()
+
+        opener = gzip.open if args.output.endswith(".gz") else open
+        with opener(args.output, "wt") as out:
+            out.write("{")
+            for t, table in enumerate(FIXTURE_TABLES):
+                out.write(f'{"," if t else ""}\n"{table}": [')
+                with open(Path(spool_dir) / f"{table}.jsonl") as spool:
+                    for r, line in enumerate(spool):
+                        out.write(("," if r else "") + "\n" + line.rstrip("\n"))
+                out.write("\n]")
+            out.write("\n}\n")
+
+    return counts
+
+
+def main():
+    """Generate the dataset and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100, help="Number of users (default: 100)")
+    parser.add_argument("--days", type=int, default=365, help="Days of history per user (default: 365)")
+    parser.add_argument("--seed", type=int, default=42, help="Dataset seed (default: 42)")
+    parser.add_argument("--end-date", type=date.fromisoformat, default=date.today(), help="Last day (default: today)")
+    parser.add_argument("--format", choices=["copy", "fixture"], default="copy", help="COPY into Postgres or write a fixture")
+    parser.add_argument("--output", default="synthetic_fixture.json.gz", help="Fixture path (.gz to compress)")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"), help="Target database (default: DATABASE_URL)")
+    parser.add_argument("--replace", action="store_true", help="Delete existing rows of the generated users first")
+    parser.add_argument("--batch-users", type=int, default=500, help="Users generated per COPY batch")
+    args = parser.parse_args()
+
+    if args.format == "copy" and not args.database_url:
+        print("❌ DATABASE_URL not found in environment variables")
+        print("   Please set DATABASE_URL or pass --database-url")
+        sys.exit(1)
+
+    args.batch_users = max(1, args.batch_users)
+    start = time.perf_counter()
+    print(f"🔄 Generating {args.users} users x {args.days} days (seed {args.seed}, ending {args.end_date})...")
+
+    try:
+        if args.format == "copy":
+            counts = asyncio.run(load_copy(args, args.end_date))
+        else:
+            counts = write_fixture(args, args.end_date)
+    except Exception as e:
+        print(f"❌ Generation failed: {e}")
+        if "duplicate key" in str(e):
+            print("   These users already exist; rerun with --replace to overwrite them")
+        sys.exit(1)
+
+    elapsed = time.perf_counter() - start
+    total = sum(counts.values())
+    print(f"✅ {total} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
+    for table, count in counts.items():
+        print(f"  - {table}: {count}")
+    if args.format == "fixture":
+        print(f"\nFixture written to {args.output} (STORAGE_BACKEND=memory STORAGE_FIXTURE_PATH={args.output})")
+
+
+if __name__ == '__main__':
+    main()
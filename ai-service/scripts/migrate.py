@@ -18,6 +18,13 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Migration files, run in order
+MIGRATIONS = [
+    'create_conversations_table.sql',
+    'create_research_cache_table.sql',
+    'create_activity_rollups.sql',
+]
+
 def run_migration():
     """Run database migrations."""
     database_url = os.getenv('DATABASE_URL')
@@ -32,37 +39,9 @@ def run_migration():
     try:
         engine = create_engine(database_url)
 
-        # Read SQL migration file
-        migration_file = Path(__file__).parent / 'create_conversations_table.sql'
-
-        if not migration_file.exists():
-            print(f"❌ Migration file not found: {migration_file}")
-            sys.exit(1)
-
-        with open(migration_file, 'r') as f:
-            sql = f.read()
-
-        print("📝 Running migrations...")
-
         with engine.connect() as conn:
-            # Split by semicolon and execute each statement
-            statements = [s.strip() for s in sql.split(';') if s.strip()]
-
-            for i, statement in enumerate(statements, 1):
-                # Skip comments and empty statements
-                if statement.startswith('--') or not statement:
-                    continue
-
-                try:
-                    conn.execute(text(statement))
-                    print(f"   ✓ Statement {i}/{len(statements)} executed")
-                except Exception as e:
-                    # Some statements might fail if tables already exist
-                    if "already exists" in str(e).lower():
-                        print(f"   ⚠ Statement {i}: Table already exists (skipping)")
-                    else:
-                        print(f"   ✗ Statement {i} failed: {e}")
-                        raise
+            for migration_name in MIGRATIONS:
+                run_migration_file(conn, Path(__file__).parent / migration_name)
 
             conn.commit()
 
@@ -70,11 +49,104 @@ def run_migration():
         print("\nCreated tables:")
         print("  - conversations (AI chat history)")
         print("  - ai_insights (cached insights)")
+        print("  - research_cache (cached web search results)")
+        print("  - activity_rollup_weekly / activity_rollup_monthly (summary rollups)")
 
     except Exception as e:
         print(f"❌ Migration failed: {e}")
         sys.exit(1)
 
+
+def run_migration_file(conn, migration_file: Path):
+    """Run every statement in one SQL migration file."""
+    if not migration_file.exists():
+        print(f"❌ Migration file not found: {migration_file}")
+        sys.exit(1)
+
+    with open(migration_file, 'r') as f:
+        sql = f.read()
+
+    print(f"📝 Running {migration_file.name}...")
+
+    # Split by semicolon and execute each statement
+    statements = split_statements(sql)
+
+    for i, statement in enumerate(statements, 1):
+        # Drop comment lines; skip chunks that are only comments
+        statement = '\n'.join(
+            line for line in statement.splitlines()
+            if not line.strip().startswith('--')
+        ).strip()
+        if not statement:
+            continue
+
+        try:
+            conn.execute(text(statement))
+            print(f"   ✓ Statement {i}/{len(statements)} executed")
+        except Exception as e:
+            # Some statements might fail if tables already exist
+            if "already exists" in str(e).lower():
+                print(f"   ⚠ Statement {i}: Table already exists (skipping)")
+            else:
+                print(f"   ✗ Statement {i} failed: {e}")
+                raise
+
+
+def split_statements(sql: str) -> list:
+    """
+    Split a migration file into statements on top-level semicolons.
+
+    Semicolons inside dollar-quoted bodies ($$ ... $$, used by plpgsql
+    functions) and single-quoted strings do not end a statement.
+    """
+    statements = []
+    current = []
+    dollar_tag = None
+    in_string = False
+    i = 0
+
+    while i < len(sql):
+        char = sql[i]
+
+        if dollar_tag:
+            if sql.startswith(dollar_tag, i):
+                current.append(dollar_tag)
+                i += len(dollar_tag)
+                dollar_tag = None
+                continue
+        elif in_string:
+            if char == "'":
+                in_string = False
+        elif char == "'":
+            in_string = True
+        elif char == '-' and sql.startswith('--', i):
+            # Keep line comments intact so quotes in them are ignored
+            end = sql.find('\n', i)
+            end = len(sql) if end == -1 else end
+            current.append(sql[i:end])
+            i = end
+            continue
+        elif char == '$':
+            end = sql.find('$', i + 1)
+            tag = sql[i:end + 1] if end != -1 else ''
+            if tag and (len(tag) == 2 or (tag[1:-1].replace('_', 'a').isalnum() and not tag[1].isdigit())):
+                current.append(tag)
+                i += len(tag)
+                dollar_tag = tag
+                continue
+        elif char == ';':
+            statements.append(''.join(current).strip())
+            current = []
+            i += 1
+            continue
+
+        current.append(char)
+        i += 1
+
+    statements.append(''.join(current).strip())
+    return [s for s in statements if s]
+
+
 if __name__ == '__main__':
     print("=" * 60)
     print("AI Service Database Migration")
@@ -0,0 +1,131 @@
+"""
+Context Loader
+
+Request-scoped loader that decides which user data a chat message needs,
+fetches it in one bundled round trip and derives trend and weekly
+breakdown views from a single shared daily series.
+"""
+
+from typing import Dict, Set
+
+from .intent_classifier import IntentClassifier
+from .tools.fitness_data_tools import FitnessDataTools
+
+# Data dependencies a message can require
+TODAY = "today"
+SUMMARY = "summary"
+GOALS = "goals"
+TRENDS = "trends"
+WEEKLY_BREAKDOWN = "weekly_breakdown"
+
+# Days of history behind each derived view
+TREND_DAYS = 30
+BREAKDOWN_DAYS = 28
+
+# Terms that put each optional dependency in the plan; a dependency is
+# needed once its matched weights add up to 1 (see IntentClassifier)
+CONTEXT_VOCABULARY: Dict[str, Dict[str, float]] = {
+    TODAY: {
+        "today": 1, "today's": 1, "tonight": 1, "so far": 1, "right now": 1,
+        "current": 0.5, "currently": 0.5, "now": 0.5,
+    },
+    GOALS: {
+        "goal": 1, "goals": 1, "target": 1, "targets": 1, "on track": 1,
+        "progress": 1, "achieve": 1, "reach": 0.5,
+    },
+    TRENDS: {
+        "trend": 1, "trends": 1, "trending": 1, "pattern": 1, "patterns": 1,
+        "over time": 1, "month": 1, "monthly": 1, "getting better": 1, "getting worse": 1,
+        "improve": 0.5, "improving": 0.5, "improved": 0.5, "improvement": 0.5,
+        "progress": 0.5, "lately": 0.5, "recently": 0.5, "compared": 0.5,
+        "week": 0.5, "weeks": 0.5, "weekly": 0.5,
+    },
+    WEEKLY_BREAKDOWN: {
+        **{
+            name + suffix: 1
+            for name in ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+            for suffix in ("", "s")
+        },
+        "weekend": 1, "weekends": 1, "weekday": 1, "weekdays": 1, "day of the week": 1,
+        "which day": 1, "best day": 1, "worst day": 1, "day": 0.5, "days": 0.5,
+    },
+}
+
+
+class ContextLoader:
+    """Plans and loads the user context for one chat message."""
+
+    def __init__(self, fitness_tools: FitnessDataTools):
+        """
+        Initialize context loader.
+
+        Args:
+            fitness_tools: Fitness data tools used to query the database
+        """
+        self.fitness_tools = fitness_tools
+        self.classifier = IntentClassifier(CONTEXT_VOCABULARY)
+
+    def plan(self, message: str) -> Set[str]:
+        """
+        Determine which data the message needs.
+
+        Args:
+            message: User's message
+
+        Returns:
+            Set of data dependencies
+        """
+        # Always get basic summary
+        return {SUMMARY} | self.classifier.classify(message)
+
+    async def load(self, user_id: str, message: str) -> Dict:
+        """
+        Build the context dictionary for a message.
+
+        Everything the plan needs comes back from a single bundle query,
+        with the daily series fetched once and sized for the longest view
+        that needs it.
+
+        Args:
+            user_id: User's ID (UUID string)
+            message: User's message
+
+        Returns:
+            Context dictionary; "error" is True if the data could not be
+            fetched and the context is empty rather than "no data"
+        """
+        needs = self.plan(message)
+        tools = self.fitness_tools
+
+        if TRENDS in needs:
+            series_days = TREND_DAYS
+        elif WEEKLY_BREAKDOWN in needs:
+            series_days = BREAKDOWN_DAYS
+        else:
+            series_days = 0
+
+        bundle = await tools.get_context_bundle(user_id, periods=("week",), daily_days=series_days)
+
+        context = {}
+
+        if bundle["error"]:
+            context["error"] = True
+
+        if TODAY in needs:
+            context["today_data"] = bundle["today_data"]
+
+        if SUMMARY in needs:
+            context["fitness_summary"] = bundle["summaries"]["week"]
+
+        if GOALS in needs:
+            context["goals"] = bundle["goals"]
+
+        if TRENDS in needs:
+            context["daily_data"] = bundle["daily_data"]
+            context["trends"] = tools.compute_activity_trends(bundle["daily_data"], TREND_DAYS)
+
+        if WEEKLY_BREAKDOWN in needs:
+            recent = tools.slice_recent_days(bundle["daily_data"], BREAKDOWN_DAYS)
+            context["weekly_breakdown"] = tools.compute_weekly_breakdown(recent)
+
+        return context
@@ -6,87 +6,219 @@ Main AI agent powered by Google Gemini for fitness coaching.
 
 import os
 import json
-from typing import Dict, List, Optional
-import google.generativeai as genai
-
-from .tools.fitness_data_tools import FitnessDataTools
-from .tools.research_tools import ResearchTools
-from .tools.workout_generator_tools import WorkoutGeneratorTools
-from .tools.goal_analysis_tools import GoalAnalysisTools
-from .tools.insights_tools import InsightsTools
-from .prompts.system_prompt import get_system_prompt
-from ..utils.logger import logger
+import asyncio
+import time
+from functools import cached_property
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional
+
+from .intent_router import LLM_PATH
+from .prompts.prompt_builder import TRIM_START, PromptBuilder, PromptSection
+from .prompts.static_prompt import StaticPrompt, get_static_prompt
+from .prompts.system_prompt import RESPONSE_INSTRUCTIONS
+from ..services.llm_gate import get_llm_gate
+from ..config.settings import settings
+from ..utils.logger import log_prompt_tokens, logger
+
+# google.generativeai, the tools and the services behind them (asyncpg,
+# numpy, httpx) are imported on first use to keep process start fast
+if TYPE_CHECKING:
+    from .tools.fitness_data_tools import FitnessDataTools
+    from .tools.research_tools import ResearchTools
+    from .tools.workout_generator_tools import WorkoutGeneratorTools
+    from .tools.goal_analysis_tools import GoalAnalysisTools
+    from .tools.insights_tools import InsightsTools
+    from .context_loader import ContextLoader
+    from .intent_router import IntentRouter
+    from ..services.research_service import ResearchService
+    from ..services.insight_cache import InsightCache
+    from ..services.response_cache import ResponseCache
+    from ..services.context_cache import ContextCache
+
+GEMINI_MODEL = 'models/gemini-2.5-flash'
+
+GENERATION_CONFIG = {
+    'temperature': 0.7,
+    'top_p': 0.95,
+    'top_k': 40,
+    'max_output_tokens': 2048,
+}
 
 
 class FitnessCoachAgent:
     """AI Fitness Coach powered by Google Gemini."""
 
     def __init__(self):
-        """Initialize the fitness coach agent."""
-        # Configure Google Gemini
-        api_key = os.getenv("GOOGLE_API_KEY")
-        if not api_key:
+        """
+        Initialize the fitness coach agent.
+
+        Only the API key is checked here; the Gemini model, tools and
+        research services are built on first use so that startup stays cheap.
+        """
+        self.api_key = os.getenv("GOOGLE_API_KEY")
+        if not self.api_key:
             raise ValueError(
                 "GOOGLE_API_KEY environment variable is required. "
                 "Please set your Google AI API key to use the fitness coach agent."
             )
 
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel(
-            model_name='models/gemini-2.5-flash',
-            generation_config={
-                'temperature': 0.7,
-                'top_p': 0.95,
-                'top_k': 40,
-                'max_output_tokens': 2048,
-            }
-        )
-
-        logger.info("Google Gemini AI configured successfully")
-
-        # Initialize tools
-        self.fitness_tools = FitnessDataTools()
-        self.research_tools = ResearchTools()
-        self.workout_tools = WorkoutGeneratorTools()
-        self.goal_tools = GoalAnalysisTools()
-        self.insights_tools = InsightsTools()
+        # Caps in-flight Gemini calls for this process
+        self.llm_gate = get_llm_gate()
 
         logger.info("Fitness Coach Agent initialized")
 
+    def warmup(self):
+        """Build every lazily created component ahead of the first request."""
+        for name in (
+            "model", "static_prompt", "context_cache", "insight_cache", "response_cache",
+            "fitness_tools", "research_tools",
+            "workout_tools", "goal_tools", "insights_tools", "context_loader",
+            "intent_router"
+        ):
+            getattr(self, name)
+
+    @cached_property
+    def model(self):
+        """Gemini model, configured on first use."""
+        import google.generativeai as genai
+
+        genai.configure(api_key=self.api_key)
+        model = genai.GenerativeModel(
+            model_name=GEMINI_MODEL,
+            generation_config=GENERATION_CONFIG
+        )
+        logger.info("Google Gemini AI configured successfully")
+        return model
+
+    @cached_property
+    def static_prompt(self) -> StaticPrompt:
+        """System prompt segment rendered once and shared by every request."""
+        return get_static_prompt()
+
+    @cached_property
+    def context_cache(self) -> "ContextCache":
+        """Provider-side cache of the static prompt (no-op unless configured)."""
+        from ..services.context_cache import create_context_cache
+        return create_context_cache(settings.prompt_context_cache)
+
+    @cached_property
+    def insight_cache(self) -> "InsightCache":
+        """Read-through cache for generated insights."""
+        from ..services.insight_cache import get_insight_cache
+        return get_insight_cache()
+
+    @cached_property
+    def response_cache(self) -> "ResponseCache":
+        """Cache of chat replies keyed by message and context."""
+        from ..services.response_cache import get_response_cache
+        return get_response_cache()
+
+    @cached_property
+    def research_service(self) -> "ResearchService":
+        """Research service shared by the research and workout tools."""
+        from ..services.research_service import ResearchService
+        return ResearchService()
+
+    @cached_property
+    def fitness_tools(self) -> "FitnessDataTools":
+        """Fitness data tools."""
+        from .tools.fitness_data_tools import FitnessDataTools
+        return FitnessDataTools()
+
+    @cached_property
+    def research_tools(self) -> "ResearchTools":
+        """Web research tools."""
+        from .tools.research_tools import ResearchTools
+        return ResearchTools(self.research_service)
+
+    @cached_property
+    def workout_tools(self) -> "WorkoutGeneratorTools":
+        """Workout plan tools."""
+        from .tools.workout_generator_tools import WorkoutGeneratorTools
+        return WorkoutGeneratorTools(self.research_service)
+
+    @cached_property
+    def goal_tools(self) -> "GoalAnalysisTools":
+        """Goal analysis tools."""
+        from .tools.goal_analysis_tools import GoalAnalysisTools
+        return GoalAnalysisTools()
+
+    @cached_property
+    def insights_tools(self) -> "InsightsTools":
+        """Insight generation tools."""
+        from .tools.insights_tools import InsightsTools
+        return InsightsTools()
+
+    @cached_property
+    def context_loader(self) -> "ContextLoader":
+        """Plans and loads per-message user context in one round trip."""
+        from .context_loader import ContextLoader
+        return ContextLoader(self.fitness_tools)
+
+    @cached_property
+    def intent_router(self) -> "IntentRouter":
+        """Answers simple factual questions from data without the LLM."""
+        from .intent_router import IntentRouter
+        return IntentRouter(self.fitness_tools, self.insights_tools.analyzer)
+
     async def chat(
         self,
         user_id: str,
         message: str,
-        conversation_history: Optional[List[Dict]] = None
+        conversation_history: Optional[List[Dict]] = None,
+        use_cache: bool = True
     ) -> Dict:
         """
         Process user message and generate response.
 
+        Returns the complete reply in one piece; see chat_stream() for the
+        incremental variant. Questions the intent router recognizes are
+        answered from data without the LLM; a repeated question asked
+        against unchanged data is answered from the response cache unless
+        use_cache is False. tools_used reports the path taken.
+
         Args:
             user_id: User's ID
             message: User's message
             conversation_history: Previous messages
+            use_cache: Read and write the response cache
 
         Returns:
             Dictionary with response and metadata
         """
         try:
+            fast = await self._answer_fast_path(user_id, message)
+            if fast is not None:
+                return {**fast, "user_id": user_id, "cached": False}
+
             # Build context with user data
             context = await self._build_context(user_id, message)
 
+            # Replies built on a failed data load are never cached
+            cache_key = None
+            if use_cache and not context.get("error"):
+                cache_key = self.response_cache.key(user_id, message, context, conversation_history)
+                cached = self.response_cache.get(cache_key)
+                if cached is not None:
+                    return {**cached, "user_id": user_id, "cached": True}
+
             # Build conversation prompt
             prompt = self._build_prompt(message, context, conversation_history)
 
             # Generate response with Gemini
             response = await self._generate_with_gemini(prompt)
 
-            return {
+            result = {
                 "message": response["text"],
                 "sources": response.get("sources", []),
-                "tools_used": response.get("tools_used", []),
-                "user_id": user_id
+                "tools_used": response.get("tools_used", []) + [LLM_PATH]
             }
 
+            # Fallback replies after a Gemini error are never cached
+            if cache_key is not None and "error" not in response:
+                self.response_cache.put(cache_key, result)
+
+            return {**result, "user_id": user_id, "cached": False}
+
         except Exception as e:
             logger.error(f"Error in chat: {e}")
             return {
@@ -96,26 +228,152 @@ class FitnessCoachAgent:
                 "error": str(e)
             }
 
+    async def chat_stream(
+        self,
+        user_id: str,
+        message: str,
+        conversation_history: Optional[List[Dict]] = None,
+        use_cache: bool = True
+    ) -> AsyncIterator[Dict]:
+        """
+        Process user message and stream the response as it is generated.
+
+        Streaming counterpart of chat(): context and prompt are built the
+        same way, but text is yielded chunk by chunk. Fast path and cached
+        replies are sent as a single token event; a completed stream is
+        cached.
+
+        Args:
+            user_id: User's ID
+            message: User's message
+            conversation_history: Previous messages
+            use_cache: Read and write the response cache
+
+        Yields:
+            {"type": "token", "text": ...} events, then a single
+            {"type": "done", "sources": [...], "tools_used": [...]} event;
+            the done event carries "error" if generation failed, and the
+            fallback text is only sent when no tokens went out before it
+        """
+        sources: List[Dict] = []
+        tools_used: List[str] = []
+        cached = False
+        streamed = False
+        error = None
+
+        try:
+            fast = await self._answer_fast_path(user_id, message)
+
+            hit = None
+            if fast is None:
+                context = await self._build_context(user_id, message)
+
+                cache_key = None
+                if use_cache and not context.get("error"):
+                    cache_key = self.response_cache.key(user_id, message, context, conversation_history)
+                    hit = self.response_cache.get(cache_key)
+
+            if fast is not None:
+                tools_used = fast["tools_used"]
+                yield {"type": "token", "text": fast["message"]}
+            elif hit is not None:
+                cached = True
+                sources, tools_used = hit["sources"], hit["tools_used"]
+                yield {"type": "token", "text": hit["message"]}
+            else:
+                tools_used = [LLM_PATH]
+                prompt = self._build_prompt(message, context, conversation_history)
+
+                chunks = []
+                async for text in self._stream_with_gemini(prompt):
+                    chunks.append(text)
+                    streamed = True
+                    yield {"type": "token", "text": text}
+
+                if cache_key is not None and chunks:
+                    self.response_cache.put(cache_key, {
+                        "message": "".join(chunks),
+                        "sources": sources,
+                        "tools_used": tools_used
+                    })
+
+        except Exception as e:
+            logger.error(f"Error in chat stream: {e}")
+            error = str(e)
+            # A partial reply is left as is; the done event reports the error
+            if not streamed:
+                yield {
+                    "type": "token",
+                    "text": "I'm having trouble right now. Please try again in a moment."
+                }
+
+        done = {
+            "type": "done",
+            "sources": sources,
+            "tools_used": tools_used,
+            "cached": cached,
+            "user_id": user_id
+        }
+        if error:
+            done["error"] = error
+
+        yield done
+
     async def generate_insights(
         self,
         user_id: str,
-        period: str = "week"
+        period: str = "week",
+        use_cache: bool = True
     ) -> Dict:
         """
         Generate personalized insights for user.
 
+        Results are served through the insight cache (in-process LRU in
+        front of the ai_insights table) unless use_cache is False.
+
         Args:
             user_id: User's ID (UUID string)
             period: Time period ("week", "month", "year")
+            use_cache: Read and write the insight cache
 
         Returns:
             Dictionary with insights
         """
+        if not use_cache:
+            return await self._compute_insights(user_id, period)
+
+        return await self.insight_cache.get_or_compute(
+            str(user_id),
+            period,
+            lambda: self._compute_insights(user_id, period)
+        )
+
+    async def _compute_insights(self, user_id: str, period: str) -> Dict:
+        """
+        Compute insights from the database, bypassing the cache.
+
+        Args:
+            user_id: User's ID (UUID string)
+            period: Time period ("week", "month", "year")
+
+        Returns:
+            Dictionary with insights (with an "error" key on failure)
+        """
         try:
-            # Get user's fitness data from database
-            summary = await self.fitness_tools.get_fitness_summary(user_id, period)
-            daily_data = await self.fitness_tools.get_daily_data(user_id, 30)
-            goals = await self.fitness_tools.get_goal_progress(user_id)
+            # Get user's fitness data from database in one round trip
+            bundle = await self.fitness_tools.get_context_bundle(user_id, periods=(period,), daily_days=30)
+
+            # An empty bundle from a failed query would read as "no data";
+            # the error payload keeps it out of the insight cache
+            if bundle["error"]:
+                return {
+                    "error": "Fitness data could not be loaded",
+                    "insights": ["Unable to generate insights at this time"],
+                    "patterns": {}
+                }
+
+            daily_data = bundle["daily_series"]
+            goals = bundle["goals"]
 
             # Generate insights using tools
             insights = self.insights_tools.generate_insights(
@@ -177,43 +435,47 @@ class FitnessCoachAgent:
                 "message": "Unable to generate workout plan at this time"
             }
 
-    async def _build_context(self, user_id: str, message: str) -> Dict:
+    async def _answer_fast_path(self, user_id: str, message: str) -> Optional[Dict]:
         """
-        Build context about user for the agent.
+        Answer a message through the intent router when possible.
 
         Args:
             user_id: User's ID (UUID string)
             message: User's message
 
         Returns:
-            Context dictionary
+            Reply dictionary, or None if the message needs the LLM
         """
-        context = {}
+        if not settings.intent_fast_path_enabled:
+            return None
 
-        # Determine what data is relevant based on message
-        message_lower = message.lower()
-
-        # Get today's data if asking about today
-        if any(word in message_lower for word in ["today", "today's", "current", "now", "so far"]):
-            context["today_data"] = await self.fitness_tools.get_today_data(user_id)
+        start = time.perf_counter()
+        try:
+            reply = await self.intent_router.answer(user_id, message)
+        except Exception as e:
+            logger.warning(f"Fast path failed, falling back to LLM: {e}")
+            return None
 
-        # Always get basic summary
-        context["fitness_summary"] = await self.fitness_tools.get_fitness_summary(user_id, "week")
+        if reply is not None:
+            logger.debug(
+                f"Fast path answered | Tools: {reply['tools_used']} | "
+                f"Duration: {(time.perf_counter() - start) * 1000:.1f}ms"
+            )
 
-        # Get goals if mentioned
-        if any(word in message_lower for word in ["goal", "progress", "achieve", "target"]):
-            context["goals"] = await self.fitness_tools.get_goal_progress(user_id)
+        return reply
 
-        # Get daily data for trends
-        if any(word in message_lower for word in ["trend", "pattern", "improve", "week", "month"]):
-            context["daily_data"] = await self.fitness_tools.get_daily_data(user_id, 30)
-            context["trends"] = await self.fitness_tools.get_activity_trends(user_id, 30)
+    async def _build_context(self, user_id: str, message: str) -> Dict:
+        """
+        Build context about user for the agent.
 
-        # Get weekly breakdown
-        if any(word in message_lower for word in ["day", "monday", "tuesday", "weekend"]):
-            context["weekly_breakdown"] = await self.fitness_tools.get_weekly_breakdown(user_id)
+        Args:
+            user_id: User's ID (UUID string)
+            message: User's message
 
-        return context
+        Returns:
+            Context dictionary
+        """
+        return await self.context_loader.load(user_id, message)
 
     def _build_prompt(
         self,
@@ -222,7 +484,14 @@ class FitnessCoachAgent:
         conversation_history: Optional[List[Dict]] = None
     ) -> str:
         """
-        Build prompt for Gemini including context.
+        Build the dynamic part of the prompt for Gemini.
+
+        The static system prompt is not included here; it is prepended (or
+        served from the provider's context cache) when the request is sent.
+        Sections are fitted to the PROMPT_*_TOKENS budgets and to whatever
+        PROMPT_MAX_TOKENS leaves after the static prompt, trimming the
+        oldest history before context blocks. The user's message and the
+        response instructions are always kept.
 
         Args:
             message: User's message
@@ -230,82 +499,165 @@ class FitnessCoachAgent:
             conversation_history: Previous messages
 
         Returns:
-            Complete prompt string
+            Dynamic prompt string
+        """
+        static = self.static_prompt
+
+        history = [
+            f"**{'User' if msg['role'] == 'user' else 'Assistant'}**: {msg['content']}"
+            for msg in (conversation_history or [])[-5:]  # Last 5 messages
+        ]
+
+        build = PromptBuilder(settings.prompt_max_tokens - static.tokens).build([
+            PromptSection(
+                "context",
+                self._context_blocks(context),
+                priority=30,
+                budget=settings.prompt_context_tokens,
+                header="## User Context"
+            ),
+            PromptSection(
+                "history",
+                history,
+                priority=20,
+                budget=settings.prompt_history_tokens,
+                header="## Conversation History",
+                separator="\n\n",
+                trim=TRIM_START
+            ),
+            PromptSection(
+                "message",
+                [message],
+                priority=100,
+                budget=settings.prompt_message_tokens,
+                header="## Current User Message",
+                required=True
+            ),
+            PromptSection(
+                "instructions",
+                [RESPONSE_INSTRUCTIONS],
+                priority=100,
+                header="## Your Response",
+                required=True
+            ),
+        ])
+
+        log_prompt_tokens(
+            static.tokens + build.total_tokens,
+            settings.prompt_max_tokens,
+            {**static.breakdown, **build.breakdown},
+            build.trimmed
+        )
+
+        return build.text
+
+    async def _prepare_request(self, prompt: str):
+        """
+        Pick the model and request text for a dynamic prompt.
+
+        Args:
+            prompt: Dynamic prompt from _build_prompt
+
+        Returns:
+            (model, contents): the context-cached model with the dynamic
+            prompt alone, or the plain model with the static prompt prepended
+        """
+        model = await self.context_cache.cached_model(self.static_prompt)
+        if model is not None:
+            return model, prompt
+
+        return self.model, f"{self.static_prompt.text}\n\n{prompt}"
+
+    @staticmethod
+    def _context_blocks(context: Dict) -> List[str]:
         """
-        system_prompt = get_system_prompt()
+        Render the user context as prompt blocks, most important first.
 
-        # Build context section
-        context_section = "\n\n## User Context\n\n"
+        Args:
+            context: User context data
+
+        Returns:
+            List of markdown blocks
+        """
+        blocks = []
 
-        if "today_data" in context and context["today_data"]:
+        if context.get("today_data"):
             today = context["today_data"]
-            context_section += f"""
-**Today's Activity (Real-Time)**:
+            blocks.append(f"""**Today's Activity (Real-Time)**:
 - Steps: {today['steps']:,}
 - Distance: {today['distance']:.2f} km
 - Calories: {today['calories']:,}
 - Active Minutes: {today['active_minutes']}
 - Floors: {today['floors']}
-"""
+""")
 
         if "fitness_summary" in context:
             summary = context["fitness_summary"]
-            context_section += f"""
-**Recent Activity ({summary['period_label']})**:
+            blocks.append(f"""**Recent Activity ({summary['period_label']})**:
 - Average Steps: {summary['avg_steps']:,}/day
 - Total Distance: {summary['total_distance_km']:.1f} km
 - Total Calories: {summary['total_calories']:,}
 - Active Minutes: {summary['total_active_minutes']}
 - Days Active: {summary['days_active']}/{summary['total_days']}
-"""
-
-        if "goals" in context:
-            context_section += "\n**Goals**:\n"
-            for goal in context["goals"]:
-                context_section += f"- {goal['goal_type']}: {goal['current_value']}/{goal['target_value']} ({goal['progress_percentage']}%)\n"
+""")
+
+        if context.get("goals"):
+            goal = context["goals"][0]
+            targets = [
+                (label, goal.get(key))
+                for label, key in (
+                    ("Fitness Goal", "fitness_goal"),
+                    ("Daily Steps", "daily_steps_goal"),
+                    ("Daily Active Minutes", "daily_active_minutes_goal"),
+                    ("Daily Calories Burned", "daily_calories_burn_goal"),
+                    ("Sleep Hours", "daily_sleep_hours_goal"),
+                    ("Weekly Workouts", "weekly_workouts_goal"),
+                    ("Current Weight", "current_weight"),
+                    ("Target Weight", "target_weight"),
+                )
+            ]
+            blocks.append("**Goals**:\n" + "".join(
+                f"- {label}: {value}\n" for label, value in targets if value is not None
+            ))
 
         if "trends" in context:
             trends = context["trends"]
-            context_section += f"\n**Activity Trend**: {trends['trend'].capitalize()} ({trends['change_percentage']:+.1f}%)\n"
-
-        # Build conversation history
-        history_section = ""
-        if conversation_history and len(conversation_history) > 0:
-            history_section = "\n\n## Conversation History\n\n"
-            for msg in conversation_history[-5:]:  # Last 5 messages
-                role = "User" if msg["role"] == "user" else "Assistant"
-                history_section += f"**{role}**: {msg['content']}\n\n"
-
-        # Combine all sections
-        full_prompt = f"""{system_prompt}
-
-{context_section}
-
-{history_section}
-
-## Current User Message
-
-{message}
-
-## Your Response
-
-Provide a helpful, personalized response based on the user's data and context above. Use specific numbers from their data when relevant. Be supportive and actionable.
-"""
+            blocks.append(f"**Activity Trend**: {trends['trend'].capitalize()} ({trends['change_percentage']:+.1f}%)\n")
+
+        if "weekly_breakdown" in context:
+            breakdown = context["weekly_breakdown"]
+            days = ", ".join(
+                f"{day[:3]} {values['avg_steps']:,}"
+                for day, values in breakdown.items()
+                if isinstance(values, dict)
+            )
+            blocks.append(
+                f"**Weekly Pattern (avg steps)**: {days}\n"
+                f"- Best Day: {breakdown['best_day']}, Most Consistent: {breakdown['most_consistent_day']}\n"
+            )
 
-        return full_prompt
+        return blocks
 
     async def _generate_with_gemini(self, prompt: str) -> Dict:
         """
         Generate response using Gemini.
 
         Args:
-            prompt: Complete prompt
+            prompt: Dynamic prompt from _build_prompt
 
         Returns:
             Response dictionary
         """
         try:
-            response = self.model.generate_content(prompt)
+            model, contents = await self._prepare_request(prompt)
+
+            async with self.llm_gate.slot() as wait_ms:
+                response = await asyncio.wait_for(
+                    model.generate_content_async(contents),
+                    timeout=settings.llm_timeout_seconds
+                )
+
+            logger.debug(f"Gemini response received | Queue wait: {wait_ms:.1f}ms")
 
             return {
                 "text": response.text,
@@ -322,3 +674,42 @@ Provide a helpful, personalized response based on the user's data and context ab
                 "error": str(e)
             }
 
+    async def _stream_with_gemini(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Stream response text from Gemini.
+
+        The concurrency slot is held until the stream is exhausted. The
+        LLM timeout applies to opening the stream and to every chunk, so a
+        stalled stream raises instead of holding the slot forever.
+
+        Args:
+            prompt: Dynamic prompt from _build_prompt
+
+        Yields:
+            Text chunks as they arrive
+        """
+        model, contents = await self._prepare_request(prompt)
+
+        async with self.llm_gate.slot() as wait_ms:
+            response = await asyncio.wait_for(
+                model.generate_content_async(contents, stream=True),
+                timeout=settings.llm_timeout_seconds
+            )
+
+            logger.debug(f"Gemini stream started | Queue wait: {wait_ms:.1f}ms")
+
+            chunks = aiter(response)
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(anext(chunks), timeout=settings.llm_timeout_seconds)
+                except StopAsyncIteration:
+                    break
+
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Chunk has no text part (e.g. safety block or finish marker)
+                    continue
+
+                if text:
+                    yield text
@@ -0,0 +1,72 @@
+"""
+Intent Classifier
+
+Scores a message against a vocabulary of weighted terms per intent with a
+single precompiled regex. Terms match on word boundaries only, so "day"
+does not fire on "today" or "Monday", and an intent applies once the
+weights of its distinct matched terms reach the threshold.
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, List, Mapping, Set, Tuple
+
+# Score at which an intent applies
+THRESHOLD = 1.0
+
+
+class IntentClassifier:
+    """Word-boundary keyword classifier with scored intents."""
+
+    def __init__(self, vocabulary: Mapping[str, Mapping[str, float]], threshold: float = THRESHOLD):
+        """
+        Compile the vocabulary into one pattern.
+
+        Args:
+            vocabulary: {intent: {term or phrase: weight}}; terms are
+                lowercase, phrases match with any whitespace between words
+            threshold: Score at which an intent applies
+        """
+        self.threshold = threshold
+
+        self._weights: Dict[str, List[Tuple[str, float]]] = defaultdict(list)
+        for intent, terms in vocabulary.items():
+            for term, weight in terms.items():
+                self._weights[term].append((intent, weight))
+
+        # Longest terms first so phrases win over the words inside them
+        alternatives = sorted(self._weights, key=len, reverse=True)
+        self._pattern = re.compile(
+            r"\b(" + "|".join(r"\s+".join(map(re.escape, term.split())) for term in alternatives) + r")\b"
+        )
+
+    def scores(self, message: str) -> Dict[str, float]:
+        """
+        Score every intent with at least one matched term.
+
+        Args:
+            message: User's message
+
+        Returns:
+            {intent: summed weight of its distinct matched terms}
+        """
+        matched = {" ".join(term.split()) for term in self._pattern.findall(message.lower())}
+
+        scores: Dict[str, float] = defaultdict(float)
+        for term in matched:
+            for intent, weight in self._weights[term]:
+                scores[intent] += weight
+
+        return dict(scores)
+
+    def classify(self, message: str) -> Set[str]:
+        """
+        Find the intents of a message.
+
+        Args:
+            message: User's message
+
+        Returns:
+            Intents whose score reaches the threshold
+        """
+        return {intent for intent, score in self.scores(message).items() if score >= self.threshold}
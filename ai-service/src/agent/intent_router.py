@@ -0,0 +1,217 @@
+"""
+Intent Router
+
+Answers narrow factual questions (today's steps, the current streak, the
+best day of the week) straight from the user's data with a templated reply,
+skipping the Gemini round trip. Anything it cannot classify with confidence
+falls through to the LLM.
+"""
+
+from typing import TYPE_CHECKING, Callable, Dict, Optional
+
+from .intent_classifier import IntentClassifier
+
+if TYPE_CHECKING:
+    from .tools.fitness_data_tools import FitnessDataTools
+    from ..services.fitness_analyzer import FitnessAnalyzer
+
+# Fast path intents
+STEPS_TODAY = "steps_today"
+STREAK = "streak"
+BEST_DAY = "best_day"
+
+# tools_used markers for the path a reply took
+FAST_PATH = "fast_path"
+LLM_PATH = "llm"
+
+# Days of history each intent is answered from
+INTENT_DAYS = {
+    STEPS_TODAY: 0,
+    STREAK: 90,
+    BEST_DAY: 28,
+}
+
+DEFAULT_STEP_GOAL = 10000
+
+# Longer messages usually carry a follow-up the templates can't answer
+MAX_WORDS = 12
+
+# Marks messages that ask for advice, comparisons or other metrics
+OPEN_ENDED = "open_ended"
+
+# Term groups; a fast path intent needs a term from each of its groups
+STEPS = "steps"
+TODAY = "today"
+STREAKS = "streaks"
+RANKING = "ranking"
+DAY = "day"
+
+INTENT_GROUPS = {
+    STEPS_TODAY: (STEPS, TODAY),
+    STREAK: (STREAKS,),
+    BEST_DAY: (RANKING, DAY),
+}
+
+# A message takes the fast path when exactly one fast path intent has all
+# of its groups matched and it is not open ended
+ROUTER_VOCABULARY: Dict[str, Dict[str, float]] = {
+    STEPS: {
+        "step": 1, "steps": 1,
+    },
+    TODAY: {
+        "today": 1, "today's": 1, "so far": 1,
+    },
+    STREAKS: {
+        "streak": 1, "streaks": 1,
+    },
+    RANKING: {
+        "best": 1, "most active": 1, "strongest": 1, "top": 1,
+    },
+    DAY: {
+        "day": 1, "weekday": 1,
+    },
+    OPEN_ENDED: {
+        term: 1 for term in (
+            "why", "should", "could", "would", "improve", "increase", "boost", "better",
+            "plan", "recommend", "recommendation", "recommendations", "advice", "tip",
+            "tips", "help", "compare", "comparison", "vs", "versus", "yesterday", "last",
+            "month", "year", "calories", "distance", "minutes", "floors", "heart",
+            "sleep", "weight", "workout", "workouts",
+        )
+    },
+}
+
+
+class IntentRouter:
+    """Detects fast path intents and renders their answers from data."""
+
+    def __init__(self, fitness_tools: "FitnessDataTools", analyzer: "FitnessAnalyzer"):
+        """
+        Initialize intent router.
+
+        Args:
+            fitness_tools: Fitness data tools used to query the database
+            analyzer: Fitness analyzer for streak and best day computations
+        """
+        self.fitness_tools = fitness_tools
+        self.analyzer = analyzer
+        self.classifier = IntentClassifier(ROUTER_VOCABULARY)
+
+        self._renderers: Dict[str, Callable[[Dict], str]] = {
+            STEPS_TODAY: self._render_steps_today,
+            STREAK: self._render_streak,
+            BEST_DAY: self._render_best_day,
+        }
+
+    def classify(self, message: str) -> Optional[str]:
+        """
+        Find the single fast path intent of a message.
+
+        Args:
+            message: User's message
+
+        Returns:
+            Intent name, or None if no intent or more than one applies
+        """
+        if len(message.split()) > MAX_WORDS:
+            return None
+
+        groups = self.classifier.classify(message)
+        if OPEN_ENDED in groups:
+            return None
+
+        intents = [intent for intent, needed in INTENT_GROUPS.items() if groups.issuperset(needed)]
+        if len(intents) != 1:
+            return None
+
+        return intents[0]
+
+    async def answer(self, user_id: str, message: str) -> Optional[Dict]:
+        """
+        Answer a message on the fast path if it has a fast path intent.
+
+        Args:
+            user_id: User's ID (UUID string)
+            message: User's message
+
+        Returns:
+            Reply dictionary shaped like FitnessCoachAgent.chat(), or None
+            when the message should go to the LLM or the data could not be
+            fetched
+        """
+        intent = self.classify(message)
+        if intent is None:
+            return None
+
+        bundle = await self.fitness_tools.get_context_bundle(
+            user_id,
+            periods=(),
+            daily_days=INTENT_DAYS[intent]
+        )
+
+        # An empty bundle from a failed query would read as "no data"
+        if bundle["error"]:
+            return None
+
+        return {
+            "message": self._renderers[intent](bundle),
+            "sources": [],
+            "tools_used": [f"{FAST_PATH}:{intent}"]
+        }
+
+    @staticmethod
+    def _step_goal(bundle: Dict) -> int:
+        """Daily step goal from the user's goals, or the default."""
+        goals = bundle["goals"]
+        return (goals[0].get("daily_steps_goal") if goals else None) or DEFAULT_STEP_GOAL
+
+    def _render_steps_today(self, bundle: Dict) -> str:
+        """Reply for today's step count."""
+        today = bundle["today_data"]
+        if not today:
+            return "I don't have any activity recorded for today yet. Sync your tracker and ask me again!"
+
+        steps = today["steps"]
+        goal = self._step_goal(bundle)
+
+        if steps >= goal:
+            return f"You've taken {steps:,} steps today - your {goal:,}-step goal is done! 🎉"
+
+        return (
+            f"You've taken {steps:,} steps today, {steps / goal:.0%} of your {goal:,}-step goal. "
+            f"{goal - steps:,} to go!"
+        )
+
+    def _render_streak(self, bundle: Dict) -> str:
+        """Reply for the current step goal streak."""
+        series = bundle["daily_series"]
+        if not series:
+            return "I don't have enough recent activity data to work out a streak yet."
+
+        goal = self._step_goal(bundle)
+        streak = self.analyzer.calculate_weekly_streak(series, goal_steps=goal)
+        current = streak["current_streak"]
+        best = streak["best_streak"]
+
+        return (
+            f"You're on a {current}-day streak of hitting {goal:,} steps. "
+            f"Your best streak in the last {INTENT_DAYS[STREAK]} days is {best} day{'s' if best != 1 else ''}, "
+            f"and you reached the goal on {streak['days_hit_goal']} of {streak['total_days']} days "
+            f"({streak['percentage']}%). {self.analyzer.get_daily_motivation(current)}"
+        )
+
+    def _render_best_day(self, bundle: Dict) -> str:
+        """Reply for the most active day of the week."""
+        days = INTENT_DAYS[BEST_DAY]
+        daily_data = self.fitness_tools.slice_recent_days(bundle["daily_data"], days)
+
+        best_day = self.analyzer.identify_best_day(daily_data)
+        if best_day is None:
+            return f"I don't have any activity from the last {days} days to find your best day yet."
+
+        avg_steps = self.fitness_tools.compute_weekly_breakdown(daily_data)[best_day]["avg_steps"]
+
+        return (
+            f"{best_day} is your most active day, averaging {avg_steps:,} steps "
+            f"over the last {days // 7} weeks."
+        )
@@ -0,0 +1,219 @@
+"""
+Prompt Builder
+
+Assembles the chat prompt from sections under a token budget. Every section
+has its own budget and a priority; once each section fits its budget, the
+lowest priority sections are trimmed first until the whole prompt fits.
+Tokens are counted locally with an estimate of Gemini's subword tokenizer
+(about one token per four characters of a word, one per punctuation mark),
+so no API round trip is needed to size a prompt.
+"""
+
+import re
+from typing import List, Optional, Sequence
+
+# Word pieces of up to four characters and single punctuation marks
+_TOKEN = re.compile(r"\w{1,4}|[^\w\s]")
+_TRAILING_WORD = re.compile(r"\w+$")
+
+# Which end of a section loses items first
+TRIM_END = "end"
+TRIM_START = "start"
+
+ELLIPSIS = "…"
+
+
+def count_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text.
+
+    Args:
+        text: Any prompt text
+
+    Returns:
+        Estimated token count
+    """
+    return len(_TOKEN.findall(text))
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """
+    Cut a text down to at most max_tokens estimated tokens.
+
+    Args:
+        text: Text to shorten
+        max_tokens: Token limit (the ellipsis counts as one)
+
+    Returns:
+        The text unchanged if it fits, else its head followed by an ellipsis
+    """
+    tokens = list(_TOKEN.finditer(text))
+    if len(tokens) <= max_tokens:
+        return text
+
+    if max_tokens <= 0:
+        return ""
+
+    cut = tokens[max_tokens - 1].start()
+    head = text[:cut]
+
+    # Don't end on part of a word split into several pieces
+    if text[cut].isalnum() and head[-1:].isalnum():
+        head = _TRAILING_WORD.sub("", head) or head
+
+    return head.rstrip() + ELLIPSIS
+
+
+class PromptSection:
+    """Named part of a prompt made of items that can be dropped one at a time."""
+
+    def __init__(
+        self,
+        name: str,
+        items: Sequence[str],
+        priority: int,
+        budget: Optional[int] = None,
+        header: str = "",
+        separator: str = "\n",
+        trim: str = TRIM_END,
+        required: bool = False
+    ):
+        """
+        Initialize prompt section.
+
+        Args:
+            name: Section name used in the token breakdown
+            items: Text items, in prompt order
+            priority: Higher priorities are trimmed later
+            budget: Token budget for the section (None for unlimited)
+            header: Heading emitted before the items when any remain
+            separator: Text between items
+            trim: TRIM_END drops the last items first, TRIM_START the first
+            required: Never dropped to meet the total budget
+        """
+        self.name = name
+        self.items = [item for item in items if item]
+        self.priority = priority
+        self.budget = budget
+        self.header = header
+        self.separator = separator
+        self.trim = trim
+        self.required = required
+
+        self.dropped = 0
+        self.truncated = False
+
+        self._item_tokens = [count_tokens(item) for item in self.items]
+        self._header_tokens = count_tokens(header)
+
+    @property
+    def tokens(self) -> int:
+        """Estimated tokens of the rendered section."""
+        if not self.items:
+            return 0
+        return self._header_tokens + sum(self._item_tokens)
+
+    def text(self) -> str:
+        """Rendered section ("" when every item was dropped)."""
+        if not self.items:
+            return ""
+
+        body = self.separator.join(self.items)
+        return f"{self.header}\n\n{body}" if self.header else body
+
+    def drop_one(self):
+        """Drop one item from the trim end."""
+        index = 0 if self.trim == TRIM_START else -1
+        self.items.pop(index)
+        self._item_tokens.pop(index)
+        self.dropped += 1
+
+    def fit(self, max_tokens: int):
+        """
+        Trim the section to at most max_tokens.
+
+        Whole items are dropped from the trim end while more than one is
+        left; a single item that is still too long is truncated.
+
+        Args:
+            max_tokens: Token limit for the section
+        """
+        while self.items and self.tokens > max_tokens and len(self.items) > 1:
+            self.drop_one()
+
+        if self.items and self.tokens > max_tokens:
+            index = 0 if self.trim == TRIM_START else -1
+            text = truncate_tokens(self.items[index], max_tokens - self._header_tokens)
+
+            if text:
+                self.items[index] = text
+                self._item_tokens[index] = count_tokens(text)
+                self.truncated = True
+            else:
+                self.drop_one()
+
+
+class PromptBuild:
+    """Assembled prompt with its per-section token breakdown."""
+
+    def __init__(self, text: str, sections: List[PromptSection], max_tokens: int):
+        """
+        Initialize prompt build.
+
+        Args:
+            text: Final prompt text
+            sections: Sections after trimming
+            max_tokens: Total token budget the prompt was built for
+        """
+        self.text = text
+        self.max_tokens = max_tokens
+        self.breakdown = {section.name: section.tokens for section in sections}
+        self.trimmed = {
+            section.name: {"dropped_items": section.dropped, "truncated": section.truncated}
+            for section in sections
+            if section.dropped or section.truncated
+        }
+
+    @property
+    def total_tokens(self) -> int:
+        """Estimated tokens of the whole prompt."""
+        return sum(self.breakdown.values())
+
+
+class PromptBuilder:
+    """Fits prompt sections into a total token budget."""
+
+    def __init__(self, max_tokens: int):
+        """
+        Initialize prompt builder.
+
+        Args:
+            max_tokens: Token budget for the whole prompt
+        """
+        self.max_tokens = max_tokens
+
+    def build(self, sections: List[PromptSection]) -> PromptBuild:
+        """
+        Trim sections to their budgets and the total, then render them.
+
+        Args:
+            sections: Sections in prompt order
+
+        Returns:
+            PromptBuild with the prompt text and token breakdown
+        """
+        for section in sections:
+            if section.budget is not None:
+                section.fit(section.budget)
+
+        # Lowest priority first; required sections only keep their own budget
+        for section in sorted(sections, key=lambda s: s.priority):
+            if section.required:
+                continue
+
+            while section.items and sum(s.tokens for s in sections) > self.max_tokens:
+                section.drop_one()
+
+        text = "\n\n".join(section.text() for section in sections if section.items)
+
+        return PromptBuild(text, sections, self.max_tokens)
@@ -0,0 +1,89 @@
+"""
+Static Prompt
+
+The part of every chat prompt that is the same for all requests: the system
+prompt and its examples, fitted to their token budgets. It is rendered once
+at startup into an immutable object and always sent ahead of the dynamic
+part, so a provider can cache it as a prefix.
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+from .prompt_builder import PromptBuilder, PromptSection
+from .system_prompt import EXAMPLES_HEADING, get_system_prompt, split_prompt_sections
+from ...config.settings import settings
+
+
+@dataclass(frozen=True)
+class StaticPrompt:
+    """
+    Rendered static prompt segment (immutable).
+
+    Attributes:
+        text: Rendered prompt text
+        breakdown: Estimated tokens per section
+        tokens: Estimated tokens of the whole text
+        fingerprint: SHA-256 of the text
+    """
+
+    text: str
+    breakdown: Mapping[str, int]
+    tokens: int = field(init=False)
+    fingerprint: str = field(init=False)
+
+    def __post_init__(self):
+        # Frozen dataclasses only allow setting fields through object
+        object.__setattr__(self, "breakdown", MappingProxyType(dict(self.breakdown)))
+        object.__setattr__(self, "tokens", sum(self.breakdown.values()))
+        object.__setattr__(self, "fingerprint", hashlib.sha256(self.text.encode()).hexdigest())
+
+
+def build_static_prompt(system_tokens: int, examples_tokens: int) -> StaticPrompt:
+    """
+    Render the system prompt and its examples within their budgets.
+
+    Args:
+        system_tokens: Token budget for the system prompt
+        examples_tokens: Token budget for the example interactions
+
+    Returns:
+        StaticPrompt
+    """
+    blocks = split_prompt_sections(get_system_prompt())
+    position = next((i for i, block in enumerate(blocks) if block.startswith(EXAMPLES_HEADING)), len(blocks))
+
+    system = PromptSection(
+        "system",
+        [block for block in blocks if not block.startswith(EXAMPLES_HEADING)],
+        priority=40,
+        budget=system_tokens,
+        separator="\n\n"
+    )
+    examples = PromptSection(
+        "examples",
+        [block for block in blocks if block.startswith(EXAMPLES_HEADING)],
+        priority=10,
+        budget=examples_tokens
+    )
+    build = PromptBuilder(system_tokens + examples_tokens).build([system, examples])
+
+    # The builder renders sections one after the other; put the examples
+    # back where they sit in the system prompt so instruction order holds
+    parts = system.items[:position] + [examples.text()] + system.items[position:]
+
+    return StaticPrompt("\n\n".join(part.strip() for part in parts if part), build.breakdown)
+
+
+# Singleton instance
+_static_prompt: Optional[StaticPrompt] = None
+
+
+def get_static_prompt() -> StaticPrompt:
+    """Get static prompt singleton."""
+    global _static_prompt
+    if _static_prompt is None:
+        _static_prompt = build_static_prompt(settings.prompt_system_tokens, settings.prompt_examples_tokens)
+    return _static_prompt
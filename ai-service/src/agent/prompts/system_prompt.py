@@ -2,6 +2,9 @@
 System Prompts for Fitness Coach Agent
 """
 
+import re
+from typing import List
+
 SYSTEM_PROMPT = """You are an expert AI Fitness Coach specializing in personalized fitness guidance, workout programming, and health insights.
 
 ## Your Role
@@ -193,6 +196,21 @@ Be:
 - **Strategic**: Create action plans
 """
 
+# Heading of the system prompt's example section, the first part trimmed
+# when a chat prompt runs over its token budget
+EXAMPLES_HEADING = "## Example Interactions"
+
+RESPONSE_INSTRUCTIONS = (
+    "Provide a helpful, personalized response based on the user's data and context above. "
+    "Use specific numbers from their data when relevant. Be supportive and actionable."
+)
+
+
+def split_prompt_sections(prompt: str) -> List[str]:
+    """Split a prompt into its introduction and "## " sections."""
+    return re.split(r"\n(?=## )", prompt.strip())
+
+
 def get_system_prompt() -> str:
     """Get the main system prompt."""
     return SYSTEM_PROMPT
@@ -4,17 +4,32 @@ Fitness Data Tools
 Agent tools for querying and analyzing user fitness data.
 """
 
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
 from datetime import datetime, timedelta
 from ...services.database_service import get_database_service
 
+if TYPE_CHECKING:
+    from ...services.storage import FitnessStorage
+
+# Period name -> (days covered, display label)
+PERIODS = {
+    "week": (7, "Past Week"),
+    "month": (30, "Past Month"),
+    "year": (365, "Past Year"),
+}
+
 
 class FitnessDataTools:
     """Tools for accessing user fitness data from database."""
 
-    def __init__(self):
-        """Initialize fitness data tools."""
-        self.db = get_database_service()
+    def __init__(self, db: Optional["FitnessStorage"] = None):
+        """
+        Initialize fitness data tools.
+
+        Args:
+            db: Storage backend (the configured backend if None)
+        """
+        self.db = db if db is not None else get_database_service()
 
     async def get_fitness_summary(self, user_id: str, period: str = "week") -> Dict:
         """
@@ -27,25 +42,39 @@ class FitnessDataTools:
         Returns:
             Dictionary with fitness summary
         """
-        # Calculate date range
-        end_date = datetime.now()
-
-        if period == "week":
-            start_date = end_date - timedelta(days=7)
-            period_label = "Past Week"
-        elif period == "month":
-            start_date = end_date - timedelta(days=30)
-            period_label = "Past Month"
-        elif period == "year":
-            start_date = end_date - timedelta(days=365)
-            period_label = "Past Year"
-        else:
-            start_date = end_date - timedelta(days=7)
-            period_label = "Past Week"
+        start_date, end_date, period_label = self._period_range(period)
 
         # Query real data from database
         summary = await self.db.get_fitness_summary(user_id, start_date, end_date)
 
+        return self._format_summary(summary, user_id, period, period_label, start_date, end_date)
+
+    @staticmethod
+    def _period_range(period: str) -> Tuple[datetime, datetime, str]:
+        """
+        Resolve a period name to its date range and label.
+
+        Args:
+            period: Time period ("week", "month", "year")
+
+        Returns:
+            Tuple of (start_date, end_date, period_label)
+        """
+        end_date = datetime.now()
+        days, period_label = PERIODS.get(period, PERIODS["week"])
+
+        return end_date - timedelta(days=days), end_date, period_label
+
+    @staticmethod
+    def _format_summary(
+        summary: Optional[Dict],
+        user_id: str,
+        period: str,
+        period_label: str,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Dict:
+        """Attach period metadata to a database summary, or build an empty one."""
         if not summary:
             return {
                 "user_id": user_id,
@@ -72,6 +101,73 @@ class FitnessDataTools:
 
         return summary
 
+    async def get_context_bundle(
+        self,
+        user_id: str,
+        periods: Sequence[str] = ("week",),
+        daily_days: int = 30
+    ) -> Dict:
+        """
+        Get summaries, daily data, today's data and goals in one round trip.
+
+        Args:
+            user_id: User's ID (UUID string)
+            periods: Summary periods to include ("week", "month", "year")
+            daily_days: Number of days of daily data to include (0 for none)
+
+        Returns:
+            Dictionary with "summaries" ({period: summary}), "daily_data",
+            "today_data" and "goals", shaped like the individual tools,
+            "daily_series" (daily_data as a DailySeries, for the analyzers)
+            and "error" (True if the data could not be fetched)
+        """
+        ranges = {period: self._period_range(period) for period in periods}
+        windows = {period: PERIODS.get(period, PERIODS["week"])[0] for period in periods}
+
+        bundle = await self.db.get_user_context_bundle(
+            user_id,
+            windows=tuple(windows.values()),
+            daily_days=daily_days
+        )
+
+        summaries = {}
+        for period, (start_date, end_date, period_label) in ranges.items():
+            summaries[period] = self._format_summary(
+                bundle["summaries"].get(windows[period]),
+                user_id,
+                period,
+                period_label,
+                start_date,
+                end_date
+            )
+
+        return {
+            "summaries": summaries,
+            "daily_data": bundle["daily"],
+            "daily_series": bundle["daily_series"],
+            "today_data": bundle["today"],
+            "goals": bundle["goals"],
+            "error": bundle.get("error", False)
+        }
+
+    @staticmethod
+    def slice_recent_days(daily_data: List[Dict], days: int) -> List[Dict]:
+        """
+        Keep only records from the last N days.
+
+        Uses the same cut-off as get_daily_data(), so a longer series can
+        stand in for a shorter fetch.
+
+        Args:
+            daily_data: Daily records with ISO date strings
+            days: Number of days to keep
+
+        Returns:
+            Filtered list of daily records
+        """
+        cutoff = (datetime.now() - timedelta(days=days)).date().isoformat()
+        return [d for d in daily_data if d["date"] >= cutoff]
+
     async def get_daily_data(self, user_id: str, days: int = 30) -> List[Dict]:
         """
         Get daily fitness data for the last N days.
@@ -123,6 +219,19 @@ class FitnessDataTools:
         """
         daily_data = await self.get_daily_data(user_id, days)
 
+        return self.compute_activity_trends(daily_data, days)
+
+    def compute_activity_trends(self, daily_data: List[Dict], days: int = 30) -> Dict:
+        """
+        Analyze activity trends from already-fetched daily data.
+
+        Args:
+            daily_data: Daily records sorted by date DESC
+            days: Number of days the data covers
+
+        Returns:
+            Dictionary with trend analysis
+        """
         if not daily_data or len(daily_data) < 2:
             return {
                 "trend": "insufficient_data",
@@ -172,6 +281,18 @@ class FitnessDataTools:
         # Get last 4 weeks of data
         daily_data = await self.get_daily_data(user_id, 28)
 
+        return self.compute_weekly_breakdown(daily_data)
+
+    def compute_weekly_breakdown(self, daily_data: List[Dict]) -> Dict:
+        """
+        Break down already-fetched daily data by day of week.
+
+        Args:
+            daily_data: Daily records (typically the last 4 weeks)
+
+        Returns:
+            Dictionary with day-by-day averages
+        """
         if not daily_data:
             return {
                 "Monday": {"avg_steps": 0, "avg_active_minutes": 0},
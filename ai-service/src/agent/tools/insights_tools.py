@@ -4,8 +4,9 @@ Insights Tools
 Agent tools for generating personalized fitness insights.
 """
 
-from typing import Dict, List
+from typing import Dict, List, Union
 from ...services.fitness_analyzer import FitnessAnalyzer
+from ...services.daily_series import DailySeries
 from datetime import datetime, timedelta
 
 
@@ -18,8 +19,8 @@ class InsightsTools:
 
     def generate_insights(
         self,
-        user_id: int,
-        daily_data: List[Dict],
+        user_id: str,
+        daily_data: Union[DailySeries, List[Dict]],
         goals: List[Dict],
         days: int = 30
     ) -> Dict:
@@ -27,22 +28,25 @@ class InsightsTools:
         Generate comprehensive insights from user data.
 
         Args:
-            user_id: User's ID
-            daily_data: List of daily fitness records
+            user_id: User's ID (UUID string)
+            daily_data: Daily fitness series or list of daily records
             goals: List of user goals
             days: Number of days analyzed
 
         Returns:
             Dictionary with insights
         """
+        # Patterns, streak and aggregates are computed once and shared
+        analysis = self.analyzer.analyze(daily_data)
+
         # Use fitness analyzer to get patterns
-        patterns = self.analyzer.analyze_patterns(daily_data)
+        patterns = analysis.patterns
 
         # Generate insights
-        insights = self.analyzer.generate_insights(daily_data, goals)
+        insights = self.analyzer.generate_insights(analysis, goals)
 
         # Calculate streak
-        streak = self.analyzer.calculate_weekly_streak(daily_data)
+        streak = analysis.streak()
 
         # Get motivation message
         motivation = self.analyzer.get_daily_motivation(streak["current_streak"])
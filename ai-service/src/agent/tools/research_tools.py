@@ -11,9 +11,14 @@ from ...services.research_service import ResearchService
 class ResearchTools:
     """Tools for researching exercises and fitness topics."""
 
-    def __init__(self):
-        """Initialize research tools."""
-        self.research_service = ResearchService()
+    def __init__(self, research_service: Optional[ResearchService] = None):
+        """
+        Initialize research tools.
+
+        Args:
+            research_service: Shared research service (a new one if None)
+        """
+        self.research_service = research_service or ResearchService()
 
     async def search_exercises(
         self,
@@ -5,15 +5,21 @@ Agent tools for generating personalized workout plans.
 """
 
 from typing import Dict, List, Optional
+from ...services.research_service import ResearchService
 from ...services.workout_generator import WorkoutGenerator
 
 
 class WorkoutGeneratorTools:
     """Tools for generating workout plans."""
 
-    def __init__(self):
-        """Initialize workout generator tools."""
-        self.generator = WorkoutGenerator()
+    def __init__(self, research_service: Optional[ResearchService] = None):
+        """
+        Initialize workout generator tools.
+
+        Args:
+            research_service: Shared research service (a new one if None)
+        """
+        self.generator = WorkoutGenerator(research_service)
 
     async def create_workout_plan(
         self,
@@ -0,0 +1,24 @@
+"""
+API Dependencies
+
+Shared objects injected into route handlers with FastAPI's Depends.
+"""
+
+from fastapi import Request
+
+from ..agent.fitness_coach import FitnessCoachAgent
+
+
+def get_agent(request: Request) -> FitnessCoachAgent:
+    """
+    Get the application-wide fitness coach agent.
+
+    The agent is built once in the app lifespan and stored on app.state.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        Shared FitnessCoachAgent
+    """
+    return request.app.state.agent
@@ -2,23 +2,24 @@
 Chat API Routes
 """
 
-from fastapi import APIRouter, HTTPException  # type: ignore
+import json
+from fastapi import APIRouter, Depends, HTTPException  # type: ignore
+from fastapi.responses import StreamingResponse  # type: ignore
 from pydantic import BaseModel  # type: ignore
-from typing import List, Optional, Dict, Union
+from typing import AsyncIterator, List, Optional, Dict, Union
 from ...agent.fitness_coach import FitnessCoachAgent
+from ..dependencies import get_agent
 from ...utils.logger import logger
 
 router = APIRouter()
 
-# Initialize agent (singleton)
-agent = FitnessCoachAgent()
-
 
 class ChatRequest(BaseModel):
     """Chat request model."""
     user_id: Union[int, str]  # Support both int and UUID string
     message: str
     conversation_id: Optional[str] = None
+    use_cache: bool = True  # False to always generate a fresh reply
 
 
 class ChatResponse(BaseModel):
@@ -27,10 +28,11 @@ class ChatResponse(BaseModel):
     sources: List[Dict] = []
     tools_used: List[str] = []
     conversation_id: Optional[str] = None
+    cached: bool = False
 
 
 @router.post("/", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, agent: FitnessCoachAgent = Depends(get_agent)):
     """
     Chat with the AI fitness coach.
 
@@ -43,14 +45,14 @@ async def chat(request: ChatRequest):
     try:
         logger.info(f"Chat request from user {request.user_id}: {request.message[:50]}...")
 
-        # TODO: Load conversation history from database if conversation_id provided
-        conversation_history = []
+        conversation_history = await _load_conversation_history(request)
 
         # Generate response (convert user_id to string)
         response = await agent.chat(
             user_id=str(request.user_id),
             message=request.message,
-            conversation_history=conversation_history
+            conversation_history=conversation_history,
+            use_cache=request.use_cache
         )
 
         # TODO: Save conversation to database
@@ -59,7 +61,8 @@ async def chat(request: ChatRequest):
             message=response["message"],
             sources=response.get("sources", []),
             tools_used=response.get("tools_used", []),
-            conversation_id=request.conversation_id
+            conversation_id=request.conversation_id,
+            cached=response.get("cached", False)
         )
 
     except Exception as e:
@@ -67,14 +70,73 @@ async def chat(request: ChatRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/stream")
+async def chat_stream(request: ChatRequest, agent: FitnessCoachAgent = Depends(get_agent)):
+    """
+    Chat with the AI fitness coach, streaming the reply as Server-Sent Events.
+
+    Emits `token` events with partial text while Gemini generates, followed
+    by a single `done` event carrying sources, tools_used and conversation_id.
+
+    Args:
+        request: Chat request with user_id and message
+
+    Returns:
+        text/event-stream response
+    """
+    logger.info(f"Chat stream request from user {request.user_id}: {request.message[:50]}...")
+
+    conversation_history = await _load_conversation_history(request)
+
+    async def event_stream() -> AsyncIterator[str]:
+        async for event in agent.chat_stream(
+            user_id=str(request.user_id),
+            message=request.message,
+            conversation_history=conversation_history,
+            use_cache=request.use_cache
+        ):
+            event_type = event.pop("type")
+            if event_type == "done":
+                event["conversation_id"] = request.conversation_id
+            yield _format_sse(event_type, event)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+async def _load_conversation_history(request: ChatRequest) -> List[Dict]:
+    """
+    Load the previous messages of the request's conversation.
+
+    Args:
+        request: Chat request, optionally with a conversation_id
+
+    Returns:
+        Messages as {"role": ..., "content": ...} dicts, oldest first
+    """
+    # TODO: Load conversation history from database if conversation_id provided
+    return []
+
+
+def _format_sse(event: str, data: Dict) -> str:
+    """Format a single Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
 @router.get("/history/{conversation_id}")
-async def get_chat_history(conversation_id: str, user_id: int):
+async def get_chat_history(conversation_id: str, user_id: str):
     """
     Get chat history for a conversation.
 
     Args:
         conversation_id: Conversation ID
-        user_id: User ID
+        user_id: User's ID (UUID string)
 
     Returns:
         List of messages
@@ -93,12 +155,12 @@ async def get_chat_history(conversation_id: str, user_id: int):
 
 
 @router.delete("/history")
-async def clear_chat_history(_user_id: int, _conversation_id: str):
+async def clear_chat_history(_user_id: str, _conversation_id: str):
     """
     Clear chat history for a conversation.
 
     Args:
-        _user_id: User ID (unused until database implementation)
+        _user_id: User's ID (UUID string, unused until database implementation)
         _conversation_id: Conversation ID (unused until database implementation)
 
     Returns:
@@ -2,8 +2,11 @@
 Health Check Routes
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
 import os
+from ...services.http_client import get_http_client
+from ...services.llm_gate import get_llm_gate
 
 router = APIRouter()
 
@@ -21,5 +24,48 @@ async def health_check():
     return {
         "status": "healthy",
         "service": "ai-service",
-        "google_api_configured": has_google_api_key
+        "google_api_configured": has_google_api_key,
+        "llm": get_llm_gate().stats(),
+        "http": get_http_client().stats()
     }
+
+
+@router.get("/ready")
+async def readiness_check(request: Request):
+    """
+    Readiness check endpoint.
+
+    Returns 503 until the startup warmup has built the agent's model and
+    tools, so load balancers only route traffic to warmed-up replicas.
+
+    Returns:
+        Readiness status
+    """
+    if not getattr(request.app.state, "ready", False):
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+
+    return {"status": "ready"}
+
+
+@router.get("/health/db")
+async def database_health_check():
+    """
+    Database connection pool health.
+
+    Returns:
+        Pool size, idle, in-use and waiting counts and per-statement
+        execution stats (503 if no pool)
+    """
+    # Imported here so the liveness routes stay free of asyncpg/numpy
+    from ...services.database_service import get_database_service
+
+    try:
+        db = get_database_service()
+        stats = db.pool_stats()
+    except Exception as e:
+        return JSONResponse(status_code=503, content={"status": "unavailable", "error": str(e)})
+
+    if not stats["connected"]:
+        return JSONResponse(status_code=503, content={"status": "disconnected", "pool": stats})
+
+    return {"status": "healthy", "pool": stats, "statements": db.statement_stats()}
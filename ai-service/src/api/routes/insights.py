@@ -2,17 +2,15 @@
 Insights API Routes
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from typing import List, Dict, Union
 from ...agent.fitness_coach import FitnessCoachAgent
+from ..dependencies import get_agent
 from ...utils.logger import logger
 
 router = APIRouter()
 
-# Initialize agent (singleton)
-agent = FitnessCoachAgent()
-
 
 class InsightsRequest(BaseModel):
     """Insights request model."""
@@ -29,7 +27,7 @@ class InsightsResponse(BaseModel):
 
 
 @router.post("/", response_model=InsightsResponse)
-async def generate_insights(request: InsightsRequest):
+async def generate_insights(request: InsightsRequest, agent: FitnessCoachAgent = Depends(get_agent)):
     """
     Generate personalized fitness insights.
 
@@ -60,7 +58,7 @@ async def generate_insights(request: InsightsRequest):
 
 
 @router.get("/daily")
-async def get_daily_insight(user_id: Union[int, str] = Query(...)):
+async def get_daily_insight(user_id: Union[int, str] = Query(...), agent: FitnessCoachAgent = Depends(get_agent)):
     """
     Get today's daily insight.
 
@@ -73,10 +71,11 @@ async def get_daily_insight(user_id: Union[int, str] = Query(...)):
     try:
         logger.info(f"Getting daily insight for user {user_id}")
 
-        # Get real data from database
-        today_data = await agent.fitness_tools.get_today_data(user_id)
-        weekly_data = await agent.fitness_tools.get_daily_data(user_id, 7)
-        user_goals_list = await agent.fitness_tools.get_goal_progress(user_id)
+        # Get real data from database in one round trip
+        bundle = await agent.fitness_tools.get_context_bundle(user_id, periods=(), daily_days=7)
+        today_data = bundle["today_data"]
+        weekly_data = bundle["daily_data"]
+        user_goals_list = bundle["goals"]
 
         if not today_data:
             today_data = {"steps": 0, "calories": 0}
@@ -107,9 +106,12 @@ class WeeklyInsightsRequest(BaseModel):
 
 
 @router.post("/weekly", response_model=InsightsResponse)
-async def generate_weekly_insights(request: WeeklyInsightsRequest):
+async def generate_weekly_insights(request: WeeklyInsightsRequest, agent: FitnessCoachAgent = Depends(get_agent)):
     """
-    Generate fresh AI insights based on last 7 days of workout data.
+    Generate AI insights based on last 7 days of workout data.
+
+    Results come from the insight cache and may be up to
+    INSIGHT_CACHE_TTL_SECONDS old (longer while a stale entry refreshes).
 
     Args:
         request: Weekly insights request with user_id
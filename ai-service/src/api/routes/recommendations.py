@@ -2,17 +2,15 @@
 Recommendations API Routes
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Union
 from ...agent.fitness_coach import FitnessCoachAgent
+from ..dependencies import get_agent
 from ...utils.logger import logger
 
 router = APIRouter()
 
-# Initialize agent (singleton)
-agent = FitnessCoachAgent()
-
 
 class WorkoutPlanRequest(BaseModel):
     """Workout plan request model."""
@@ -32,7 +30,7 @@ class QuickWorkoutRequest(BaseModel):
 
 
 @router.post("/workout-plan")
-async def generate_workout_plan(request: WorkoutPlanRequest):
+async def generate_workout_plan(request: WorkoutPlanRequest, agent: FitnessCoachAgent = Depends(get_agent)):
     """
     Generate a personalized workout plan.
 
@@ -65,7 +63,8 @@ async def generate_workout_plan(request: WorkoutPlanRequest):
 async def get_quick_workout(
     goal: str = Query(..., description="Fitness goal"),
     duration_minutes: int = Query(20, description="Workout duration in minutes"),
-    equipment: Optional[str] = Query(None, description="Comma-separated equipment list")
+    equipment: Optional[str] = Query(None, description="Comma-separated equipment list"),
+    agent: FitnessCoachAgent = Depends(get_agent)
 ):
     """
     Get a quick workout suggestion for today.
@@ -12,8 +12,24 @@ from typing import Optional
 class Settings(BaseSettings):
     """Application settings."""
 
+    # Storage backend: "postgres" or "memory" (fixture data, for load tests)
+    storage_backend: str = os.getenv("STORAGE_BACKEND", "postgres")
+    storage_fixture_path: Optional[str] = os.getenv("STORAGE_FIXTURE_PATH")
+
     # Database
     database_url: Optional[str] = os.getenv("DATABASE_URL")
+    db_pool_min_size: int = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+    db_pool_max_size: int = int(os.getenv("DB_POOL_MAX_SIZE", "20"))
+    db_pool_max_inactive_connection_lifetime: float = float(
+        os.getenv("DB_POOL_MAX_INACTIVE_CONNECTION_LIFETIME", "300")
+    )
+    db_command_timeout: float = float(os.getenv("DB_COMMAND_TIMEOUT", "60"))
+    db_batch_chunk_size: int = int(os.getenv("DB_BATCH_CHUNK_SIZE", "1000"))
+    db_cursor_prefetch: int = int(os.getenv("DB_CURSOR_PREFETCH", "500"))
+    db_slow_query_ms: float = float(os.getenv("DB_SLOW_QUERY_MS", "250"))
+    db_slow_query_explain_rate: float = float(os.getenv("DB_SLOW_QUERY_EXPLAIN_RATE", "0"))
+    db_slow_query_log_file: Optional[str] = os.getenv("DB_SLOW_QUERY_LOG_FILE")
+    summary_rollups_enabled: bool = os.getenv("SUMMARY_ROLLUPS_ENABLED", "true").lower() == "true"
 
     # Google API
     google_api_key: Optional[str] = os.getenv("GOOGLE_API_KEY")
@@ -31,6 +47,43 @@ class Settings(BaseSettings):
     # Environment
     environment: str = os.getenv("ENVIRONMENT", "development")
 
+    # LLM
+    llm_max_concurrency: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    llm_timeout_seconds: float = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+
+    # Chat prompt token budgets (locally estimated tokens)
+    prompt_max_tokens: int = int(os.getenv("PROMPT_MAX_TOKENS", "3000"))
+    prompt_system_tokens: int = int(os.getenv("PROMPT_SYSTEM_TOKENS", "1200"))
+    prompt_examples_tokens: int = int(os.getenv("PROMPT_EXAMPLES_TOKENS", "500"))
+    prompt_context_tokens: int = int(os.getenv("PROMPT_CONTEXT_TOKENS", "400"))
+    prompt_history_tokens: int = int(os.getenv("PROMPT_HISTORY_TOKENS", "800"))
+    prompt_message_tokens: int = int(os.getenv("PROMPT_MESSAGE_TOKENS", "500"))
+
+    # Provider-side caching of the static prompt prefix (only "none" so far)
+    prompt_context_cache: str = os.getenv("PROMPT_CONTEXT_CACHE", "none")
+
+    # Insight cache
+    insight_cache_ttl_seconds: int = int(os.getenv("INSIGHT_CACHE_TTL_SECONDS", "900"))
+    insight_cache_stale_seconds: int = int(os.getenv("INSIGHT_CACHE_STALE_SECONDS", "3600"))
+    insight_cache_max_entries: int = int(os.getenv("INSIGHT_CACHE_MAX_ENTRIES", "1024"))
+
+    # Answer steps-today / streak / best-day questions without the LLM
+    intent_fast_path_enabled: bool = os.getenv("INTENT_FAST_PATH_ENABLED", "true").lower() == "true"
+
+    # Chat response cache
+    response_cache_ttl_seconds: int = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "600"))
+    response_cache_max_entries: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2048"))
+
+    # Research cache
+    research_cache_ttl_seconds: int = int(os.getenv("RESEARCH_CACHE_TTL_SECONDS", "86400"))
+    research_cache_negative_ttl_seconds: int = int(os.getenv("RESEARCH_CACHE_NEGATIVE_TTL_SECONDS", "300"))
+
+    # Outbound HTTP
+    http_max_connections: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    http_max_keepalive_connections: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    http_max_connections_per_host: int = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "10"))
+    http_keepalive_expiry_seconds: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"))
+
     # Service
     host: str = os.getenv("HOST", "0.0.0.0")
     port: int = int(os.getenv("PORT", "8000"))
@@ -1,12 +1,81 @@
+import asyncio
+import importlib
+import time
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from .agent.fitness_coach import FitnessCoachAgent
 from .api.routes import chat, insights, recommendations, health
+from .services.http_client import close_http_client
 from .utils.logger import logger
 
+
+# Slow imports behind the agent's components, done off the event loop
+WARMUP_IMPORTS = ("google.generativeai", "numpy", "asyncpg", "httpx")
+
+# Delay before retrying a failed warmup, doubled per attempt up to the max
+WARMUP_RETRY_SECONDS = 1.0
+WARMUP_RETRY_MAX_SECONDS = 60.0
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown."""
+    logger.info("🚀 Workout Buddy AI Service starting...")
+
+    # One agent shared by every route; heavy pieces are built on first use
+    app.state.agent = FitnessCoachAgent()
+
+    # /health answers immediately; /ready waits for the warmup to finish
+    app.state.ready = False
+    warmup_task = asyncio.create_task(_warmup(app))
+
+    yield
+
+    warmup_task.cancel()
+    await close_http_client()
+
+    from .services.database_service import close_database_service
+    await close_database_service()
+    logger.info("👋 AI Service stopped")
+
+
+async def _warmup(app: FastAPI):
+    """
+    Build the agent components and the DB pool, then mark the app ready.
+
+    A failed attempt (e.g. the database is not up yet) is retried with
+    exponential backoff until it succeeds or the app shuts down.
+    """
+    start = time.perf_counter()
+    delay = WARMUP_RETRY_SECONDS
+
+    while True:
+        try:
+            # Importing in a thread keeps /health answering; the components
+            # are then built on the loop, since cached_property is not
+            # thread-safe and a request may build the same one meanwhile
+            for module in WARMUP_IMPORTS:
+                await asyncio.to_thread(importlib.import_module, module)
+            app.state.agent.warmup()
+
+            from .services.database_service import get_database_service
+            await get_database_service().warmup()
+            break
+        except Exception as e:
+            logger.error(f"Warmup failed, retrying in {delay:.0f}s: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, WARMUP_RETRY_MAX_SECONDS)
+
+    app.state.ready = True
+    logger.info(f"✅ AI Service ready (warmup {(time.perf_counter() - start) * 1000:.0f}ms)")
+
+
 app = FastAPI(
     title="Workout Buddy AI Service",
     description="AI-powered fitness analysis and workout generation service powered by Google Gemini",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -24,11 +93,6 @@ app.include_router(chat.router, prefix="/chat", tags=["chat"])
 app.include_router(insights.router, prefix="/insights", tags=["insights"])
 app.include_router(recommendations.router, prefix="/recommendations", tags=["recommendations"])
 
-@app.on_event("startup")
-async def startup():
-    logger.info("🚀 Workout Buddy AI Service starting...")
-    logger.info("✅ AI Service ready")
-
 @app.get("/")
 async def root():
     return {
@@ -37,9 +101,12 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "chat": "/chat",
+            "chat_stream": "/chat/stream",
             "insights": "/insights",
             "recommendations": "/recommendations",
             "health": "/health",
+            "ready": "/ready",
+            "health_db": "/health/db",
             "docs": "/docs"
         }
     }
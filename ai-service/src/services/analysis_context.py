@@ -0,0 +1,103 @@
+"""
+Analysis Context
+
+Per-series analysis results computed once and shared by every consumer in
+a request (patterns, streaks, calorie/distance aggregates, best day), plus
+a small fingerprint-keyed memo so repeat analyses of identical data return
+the same context. Dict results are handed out as copies, so a caller that
+edits its copy cannot change what other callers read.
+"""
+
+from collections import OrderedDict
+from copy import deepcopy
+from functools import cached_property
+from typing import TYPE_CHECKING, Dict, Optional
+import statistics
+
+from .daily_series import DailySeries
+
+if TYPE_CHECKING:
+    from .fitness_analyzer import FitnessAnalyzer
+
+
+class AnalysisContext:
+    """Lazily computed, shared analysis of one daily series."""
+
+    def __init__(self, series: DailySeries, analyzer: "FitnessAnalyzer"):
+        """
+        Initialize analysis context.
+
+        Args:
+            series: Daily fitness series to analyze
+            analyzer: Analyzer providing the underlying computations
+        """
+        self.series = series
+        self.analyzer = analyzer
+        self._streaks: Dict[int, Dict] = {}
+
+    @property
+    def patterns(self) -> Dict:
+        """Trends, patterns, recommendations and step stats (a copy)."""
+        return deepcopy(self._patterns)
+
+    @cached_property
+    def _patterns(self) -> Dict:
+        """Memoized patterns; never handed out directly."""
+        return self.analyzer._compute_patterns(self.series)
+
+    def streak(self, goal_steps: int = 10000) -> Dict:
+        """Current/best streak info for a daily step goal (a copy)."""
+        if goal_steps not in self._streaks:
+            self._streaks[goal_steps] = self.analyzer._compute_streak(self.series, goal_steps)
+        return deepcopy(self._streaks[goal_steps])
+
+    @cached_property
+    def best_day(self) -> Optional[str]:
+        """Day of the week with the highest average steps."""
+        return self.analyzer._compute_best_day(self.series)
+
+    @cached_property
+    def calorie_average(self) -> Optional[float]:
+        """Average calories over days with calories recorded (None if none)."""
+        calories = self.series.calories[self.series.calories != 0].tolist()
+        return statistics.mean(calories) if calories else None
+
+    @cached_property
+    def total_distance(self) -> Optional[float]:
+        """Total distance over days with distance recorded (None if none)."""
+        distances = self.series.distance[self.series.distance != 0].tolist()
+        return sum(distances) if distances else None
+
+
+class AnalysisMemo:
+    """Bounded LRU of analysis contexts keyed by series fingerprint."""
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Initialize memo.
+
+        Args:
+            max_entries: Maximum number of contexts kept
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, AnalysisContext]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[AnalysisContext]:
+        """Return the context for a fingerprint, marking it recently used."""
+        context = self._entries.get(key)
+        if context is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return context
+
+    def put(self, key: str, context: AnalysisContext):
+        """Store a context, evicting the least recently used if full."""
+        self._entries[key] = context
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,59 @@
+"""
+Context Cache
+
+Provider-side caching of the static prompt prefix. With a cache the static
+prompt is uploaded once and each request carries only its dynamic part;
+NoopContextCache is the local stand-in that always sends the full prompt.
+No provider cache is implemented yet: Gemini explicit caching needs
+google-generativeai >= 0.7, and the service pins 0.3.2.
+"""
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Protocol
+
+from ..utils.logger import logger
+
+if TYPE_CHECKING:
+    from ..agent.prompts.static_prompt import StaticPrompt
+
+
+class ContextCache(Protocol):
+    """Provider cache of the static prompt prefix."""
+
+    name: str
+
+    async def cached_model(self, static_prompt: "StaticPrompt") -> Optional[Any]:
+        """Model whose requests already include the static prompt, or None."""
+        ...
+
+
+class NoopContextCache:
+    """Local stand-in: nothing is cached, every request sends the full prompt."""
+
+    name = "none"
+
+    async def cached_model(self, static_prompt: "StaticPrompt") -> Optional[Any]:
+        """Always None."""
+        return None
+
+
+# Provider name -> context cache class
+PROVIDERS: Dict[str, Callable[[], ContextCache]] = {
+    NoopContextCache.name: NoopContextCache,
+}
+
+
+def create_context_cache(provider: str) -> ContextCache:
+    """
+    Create the context cache for a provider name.
+
+    Args:
+        provider: Key of PROVIDERS ("none" for the no-op stand-in)
+
+    Returns:
+        Context cache, NoopContextCache for unknown providers
+    """
+    cache_class = PROVIDERS.get(provider)
+    if cache_class is None:
+        logger.warning(f"Unknown prompt context cache '{provider}', sending full prompts")
+        cache_class = NoopContextCache
+    return cache_class()
@@ -0,0 +1,186 @@
+"""
+Daily Series
+
+Compact columnar representation of a user's daily fitness records: one
+typed NumPy column per metric plus a date-ordinal column, instead of one
+Python dict per day.
+"""
+
+import hashlib
+from datetime import date
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+import numpy as np
+
+# Metric column -> dtype. Order matches the daily record dict.
+COLUMNS = {
+    "steps": np.int64,
+    "distance": np.float64,
+    "calories": np.int64,
+    "active_minutes": np.int64,
+    "floors": np.int64,
+    "heart_rate_avg": np.int64,
+    "very_active_minutes": np.int64,
+    "fairly_active_minutes": np.int64,
+    "lightly_active_minutes": np.int64,
+}
+
+# Source field in a database row for each column
+ROW_FIELDS = {
+    "steps": "steps",
+    "distance": "distance",
+    "calories": "calories",
+    "active_minutes": "active_minutes",
+    "floors": "floors",
+    "heart_rate_avg": "resting_heart_rate",
+    "very_active_minutes": "very_active_minutes",
+    "fairly_active_minutes": "fairly_active_minutes",
+    "lightly_active_minutes": "lightly_active_minutes",
+}
+
+# Names for weekdays() values
+DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def _to_ordinal(value: Any) -> int:
+    """Convert a date, datetime or ISO string to a proleptic Gregorian ordinal."""
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    return value.toordinal()
+
+
+class DailySeries:
+    """Columnar daily fitness series, kept in the order it was loaded."""
+
+    def __init__(self, dates: np.ndarray, columns: Dict[str, np.ndarray]):
+        """
+        Initialize daily series.
+
+        Args:
+            dates: Date ordinals (int32), one per day
+            columns: Metric name -> column array, same length as dates
+        """
+        self.dates = dates
+        self.columns = columns
+
+    @classmethod
+    def empty(cls) -> "DailySeries":
+        """Create a series with no days."""
+        return cls(
+            np.empty(0, dtype=np.int32),
+            {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+        )
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, Any]]) -> "DailySeries":
+        """
+        Build a series directly from database rows (asyncpg records).
+
+        Args:
+            rows: Rows with the columns selected by the daily activity query
+
+        Returns:
+            DailySeries with NULLs mapped to 0
+        """
+        rows = list(rows)
+        n = len(rows)
+
+        dates = np.fromiter((row["date"].toordinal() for row in rows), dtype=np.int32, count=n)
+        columns = {
+            name: np.fromiter((row[ROW_FIELDS[name]] or 0 for row in rows), dtype=dtype, count=n)
+            for name, dtype in COLUMNS.items()
+        }
+
+        return cls(dates, columns)
+
+    @classmethod
+    def from_dicts(cls, records: List[Dict]) -> "DailySeries":
+        """
+        Build a series from daily record dicts.
+
+        Args:
+            records: Daily records as returned by get_user_fitness_data
+
+        Returns:
+            DailySeries with missing metrics mapped to 0
+        """
+        n = len(records)
+
+        dates = np.fromiter((_to_ordinal(r["date"]) for r in records), dtype=np.int32, count=n)
+        columns = {
+            name: np.fromiter((r.get(name) or 0 for r in records), dtype=dtype, count=n)
+            for name, dtype in COLUMNS.items()
+        }
+
+        return cls(dates, columns)
+
+    @classmethod
+    def coerce(cls, data: Union["DailySeries", List[Dict], None]) -> "DailySeries":
+        """Return data as a DailySeries, converting a list of dicts if needed."""
+        if isinstance(data, DailySeries):
+            return data
+        if not data:
+            return cls.empty()
+        return cls.from_dicts(data)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __bool__(self) -> bool:
+        return len(self.dates) > 0
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        """Expose metric columns as attributes (series.steps, series.calories, ...)."""
+        columns = self.__dict__.get("columns")
+        if columns is not None and name in columns:
+            return columns[name]
+        raise AttributeError(name)
+
+    def weekdays(self) -> np.ndarray:
+        """Day of week per row (Monday=0 ... Sunday=6)."""
+        # date.fromordinal(1) is a Monday
+        return (self.dates - 1) % 7
+
+    def take(self, index: Union[np.ndarray, slice]) -> "DailySeries":
+        """Select rows by index array, boolean mask or slice."""
+        return DailySeries(
+            self.dates[index],
+            {name: column[index] for name, column in self.columns.items()}
+        )
+
+    def since(self, start: date) -> "DailySeries":
+        """Keep only rows on or after a date."""
+        return self.take(self.dates >= start.toordinal())
+
+    def to_dicts(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Dict view for JSON output, in the daily record shape.
+
+        Args:
+            limit: Only convert the first N rows
+
+        Returns:
+            List of daily record dicts
+        """
+        end = len(self) if limit is None else min(limit, len(self))
+        dates = self.dates[:end].tolist()
+        columns = {name: column[:end].tolist() for name, column in self.columns.items()}
+
+        return [
+            {
+                "date": date.fromordinal(dates[i]).isoformat(),
+                **{name: values[i] for name, values in columns.items()}
+            }
+            for i in range(end)
+        ]
+
+    def fingerprint(self) -> str:
+        """Content hash of dates and all metric columns."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.dates.tobytes())
+        for name in COLUMNS:
+            digest.update(self.columns[name].tobytes())
+        return digest.hexdigest()
+
+    def nbytes(self) -> int:
+        """Memory used by the column buffers."""
+        return self.dates.nbytes + sum(column.nbytes for column in self.columns.values())
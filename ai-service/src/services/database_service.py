@@ -5,44 +5,591 @@ Service for querying fitness data from PostgreSQL database.
 """
 
 import os
-from typing import List, Dict, Optional, Any
-from datetime import datetime
+import json
+import time
+import asyncio
+import uuid
+from itertools import groupby
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Iterator, List, Dict, Optional, Any, Mapping, Sequence
+from datetime import date, datetime, timedelta
 import asyncpg  # type: ignore
+from .daily_series import DailySeries
+from .statement_registry import LatencyHistogram, StatementRegistry
+from ..config.settings import settings
 from ..utils.logger import logger
 
+if TYPE_CHECKING:
+    from .storage import FitnessStorage
+
+# Daily activity rows joined with resting heart rate, newest first
+DAILY_ACTIVITY_QUERY = """
+    SELECT
+        a.date,
+        a.steps,
+        a.distance,
+        a.calories,
+        a."activeMinutes" as active_minutes,
+        a.floors,
+        a."veryActiveMinutes" as very_active_minutes,
+        a."fairlyActiveMinutes" as fairly_active_minutes,
+        a."lightlyActiveMinutes" as lightly_active_minutes,
+        COALESCE(h."restingHeartRate", 0) as resting_heart_rate
+    FROM activity_data a
+    LEFT JOIN heart_rate_data h ON a."userId" = h."userId" AND a.date = h.date
+    WHERE a."userId" = $1
+        AND a.date >= $2
+        AND a.date <= $3
+    ORDER BY a.date DESC
+"""
+
+# Aggregates over a date range
+FITNESS_SUMMARY_QUERY = """
+    SELECT
+        COUNT(*) as total_days,
+        AVG(a.steps) as avg_steps,
+        SUM(a.distance) as total_distance,
+        SUM(a.calories) as total_calories,
+        SUM(a."activeMinutes") as total_active_minutes,
+        AVG(h."restingHeartRate") as avg_heart_rate,
+        SUM(a.floors) as floors_climbed,
+        COUNT(CASE WHEN a.steps >= 5000 THEN 1 END) as days_active
+    FROM activity_data a
+    LEFT JOIN heart_rate_data h ON a."userId" = h."userId" AND a.date = h.date
+    WHERE a."userId" = $1
+        AND a.date >= $2
+        AND a.date <= $3
+"""
+
+# Aggregates composed from whole monthly/weekly rollup buckets ($2, $3) plus
+# the leftover raw days ($4); averages are re-derived from sums and counts
+ROLLUP_SUMMARY_QUERY = """
+    WITH parts AS (
+        SELECT
+            day_count, steps_sum, steps_days, distance_sum, calories_sum,
+            active_minutes_sum, heart_rate_sum, heart_rate_days, floors_sum, days_active
+        FROM activity_rollup_monthly
+        WHERE user_id = $1 AND bucket_start = ANY($2::date[])
+        UNION ALL
+        SELECT
+            day_count, steps_sum, steps_days, distance_sum, calories_sum,
+            active_minutes_sum, heart_rate_sum, heart_rate_days, floors_sum, days_active
+        FROM activity_rollup_weekly
+        WHERE user_id = $1 AND bucket_start = ANY($3::date[])
+        UNION ALL
+        SELECT
+            1,
+            a.steps,
+            (a.steps IS NOT NULL)::int,
+            a.distance,
+            a.calories,
+            a."activeMinutes",
+            h."restingHeartRate",
+            (h."restingHeartRate" IS NOT NULL)::int,
+            a.floors,
+            (a.steps >= 5000)::int
+        FROM activity_data a
+        LEFT JOIN heart_rate_data h ON a."userId" = h."userId" AND a.date = h.date
+        WHERE a."userId" = $1 AND a.date = ANY($4::date[])
+    )
+    SELECT
+        COALESCE(SUM(day_count), 0) as total_days,
+        SUM(steps_sum)::numeric / NULLIF(SUM(steps_days), 0) as avg_steps,
+        SUM(distance_sum) as total_distance,
+        SUM(calories_sum) as total_calories,
+        SUM(active_minutes_sum) as total_active_minutes,
+        SUM(heart_rate_sum)::numeric / NULLIF(SUM(heart_rate_days), 0) as avg_heart_rate,
+        SUM(floors_sum) as floors_climbed,
+        COALESCE(SUM(days_active), 0) as days_active
+    FROM parts
+"""
+
+# Latest goal record for a user
+USER_GOALS_QUERY = """
+    SELECT
+        id,
+        "fitnessGoal" as fitness_goal,
+        "currentWeight" as current_weight,
+        "targetWeight" as target_weight,
+        height,
+        "currentBMI" as current_bmi,
+        "idealBMI" as ideal_bmi,
+        age,
+        gender,
+        "activityLevel" as activity_level,
+        "dailyStepsGoal" as daily_steps_goal,
+        "dailyCaloriesBurnGoal" as daily_calories_burn_goal,
+        "dailyActiveMinutesGoal" as daily_active_minutes_goal,
+        "dailySleepHoursGoal" as daily_sleep_hours_goal,
+        "weeklyWorkoutsGoal" as weekly_workouts_goal,
+        "aiRecommendationsEnabled" as ai_recommendations_enabled,
+        "aiRecommendations" as ai_recommendations,
+        "createdAt" as created_at,
+        "updatedAt" as updated_at
+    FROM user_goals
+    WHERE user_id = $1
+    ORDER BY "updatedAt" DESC
+    LIMIT 1
+"""
+
+# Today's activity row joined with resting heart rate
+TODAY_ACTIVITY_QUERY = """
+    SELECT
+        a.steps,
+        a.distance,
+        a.calories,
+        a."activeMinutes" as active_minutes,
+        a.floors,
+        COALESCE(h."restingHeartRate", 0) as resting_heart_rate
+    FROM activity_data a
+    LEFT JOIN heart_rate_data h ON a."userId" = h."userId" AND a.date = h.date
+    WHERE a."userId" = $1
+        AND a.date = $2
+"""
+
+# Daily rows, window summaries, today's row and latest goal in one statement
+CONTEXT_BUNDLE_QUERY = """
+    WITH base AS (
+        SELECT
+            a.date,
+            a.steps,
+            a.distance,
+            a.calories,
+            a."activeMinutes" as active_minutes,
+            a.floors,
+            a."veryActiveMinutes" as very_active_minutes,
+            a."fairlyActiveMinutes" as fairly_active_minutes,
+            a."lightlyActiveMinutes" as lightly_active_minutes,
+            h."restingHeartRate" as resting_heart_rate
+        FROM activity_data a
+        LEFT JOIN heart_rate_data h ON a."userId" = h."userId" AND a.date = h.date
+        WHERE a."userId" = $1
+            AND a.date >= $2
+            AND a.date <= $3
+    ),
+    summaries AS (
+        SELECT
+            w.days,
+            COUNT(b.date) as total_days,
+            AVG(b.steps) as avg_steps,
+            SUM(b.distance) as total_distance,
+            SUM(b.calories) as total_calories,
+            SUM(b.active_minutes) as total_active_minutes,
+            AVG(b.resting_heart_rate) as avg_heart_rate,
+            SUM(b.floors) as floors_climbed,
+            COUNT(CASE WHEN b.steps >= 5000 THEN 1 END) as days_active
+        FROM unnest($4::int[]) AS w(days)
+        LEFT JOIN base b ON b.date >= $3::date - w.days
+        GROUP BY w.days
+    ),
+    latest_goal AS (
+        SELECT
+            id,
+            "fitnessGoal" as fitness_goal,
+            "currentWeight" as current_weight,
+            "targetWeight" as target_weight,
+            height,
+            "currentBMI" as current_bmi,
+            "idealBMI" as ideal_bmi,
+            age,
+            gender,
+            "activityLevel" as activity_level,
+            "dailyStepsGoal" as daily_steps_goal,
+            "dailyCaloriesBurnGoal" as daily_calories_burn_goal,
+            "dailyActiveMinutesGoal" as daily_active_minutes_goal,
+            "dailySleepHoursGoal" as daily_sleep_hours_goal,
+            "weeklyWorkoutsGoal" as weekly_workouts_goal,
+            "aiRecommendationsEnabled" as ai_recommendations_enabled,
+            "aiRecommendations"::text as ai_recommendations,
+            "createdAt" as created_at,
+            "updatedAt" as updated_at
+        FROM user_goals
+        WHERE user_id = $1::uuid
+        ORDER BY "updatedAt" DESC
+        LIMIT 1
+    )
+    SELECT
+        (SELECT json_agg(b ORDER BY b.date DESC) FROM base b
+            WHERE b.date >= $3::date - $5::int) as daily,
+        (SELECT json_agg(s) FROM summaries s) as summaries,
+        (SELECT row_to_json(b) FROM base b WHERE b.date = $3) as today,
+        (SELECT row_to_json(g) FROM latest_goal g) as goal
+"""
+
+# Cached insights for a user and period
+GET_CACHED_INSIGHTS_QUERY = """
+    SELECT insights, generated_at, expires_at
+    FROM ai_insights
+    WHERE user_id = $1
+        AND period = $2
+"""
+
+# Upsert cached insights for a user and period
+SAVE_CACHED_INSIGHTS_QUERY = """
+    INSERT INTO ai_insights (user_id, period, insights, summary, generated_at, expires_at)
+    VALUES ($1, $2, $3::jsonb, $4::jsonb, NOW(), $5)
+    ON CONFLICT (user_id, period) DO UPDATE SET
+        insights = EXCLUDED.insights,
+        summary = EXCLUDED.summary,
+        generated_at = EXCLUDED.generated_at,
+        expires_at = EXCLUDED.expires_at
+"""
+
+# Unexpired research cache entry
+GET_RESEARCH_CACHE_QUERY = """
+    SELECT provider, results, is_error, error
+    FROM research_cache
+    WHERE query_key = $1
+        AND expires_at > NOW()
+"""
+
+# Upsert a research cache entry
+SAVE_RESEARCH_CACHE_QUERY = """
+    INSERT INTO research_cache (query_key, provider, results, is_error, error, created_at, expires_at)
+    VALUES ($1, $2, $3::jsonb, $4, $5, NOW(), $6)
+    ON CONFLICT (query_key) DO UPDATE SET
+        provider = EXCLUDED.provider,
+        results = EXCLUDED.results,
+        is_error = EXCLUDED.is_error,
+        error = EXCLUDED.error,
+        created_at = EXCLUDED.created_at,
+        expires_at = EXCLUDED.expires_at
+"""
+
+# Daily activity rows for a chunk of users, grouped by user, newest first
+BATCH_DAILY_ACTIVITY_QUERY = """
+    SELECT
+        a."userId" as user_id,
+        a.date,
+        a.steps,
+        a.distance,
+        a.calories,
+        a."activeMinutes" as active_minutes,
+        a.floors,
+        a."veryActiveMinutes" as very_active_minutes,
+        a."fairlyActiveMinutes" as fairly_active_minutes,
+        a."lightlyActiveMinutes" as lightly_active_minutes,
+        COALESCE(h."restingHeartRate", 0) as resting_heart_rate
+    FROM activity_data a
+    LEFT JOIN heart_rate_data h ON a."userId" = h."userId" AND a.date = h.date
+    WHERE a."userId" = ANY($1)
+        AND a.date >= $2
+        AND a.date <= $3
+    ORDER BY a."userId", a.date DESC
+"""
+
+# Latest goal record for each user in a chunk
+BATCH_USER_GOALS_QUERY = """
+    SELECT DISTINCT ON (user_id)
+        user_id,
+        id,
+        "fitnessGoal" as fitness_goal,
+        "currentWeight" as current_weight,
+        "targetWeight" as target_weight,
+        height,
+        "currentBMI" as current_bmi,
+        "idealBMI" as ideal_bmi,
+        age,
+        gender,
+        "activityLevel" as activity_level,
+        "dailyStepsGoal" as daily_steps_goal,
+        "dailyCaloriesBurnGoal" as daily_calories_burn_goal,
+        "dailyActiveMinutesGoal" as daily_active_minutes_goal,
+        "dailySleepHoursGoal" as daily_sleep_hours_goal,
+        "weeklyWorkoutsGoal" as weekly_workouts_goal,
+        "aiRecommendationsEnabled" as ai_recommendations_enabled,
+        "aiRecommendations" as ai_recommendations,
+        "createdAt" as created_at,
+        "updatedAt" as updated_at
+    FROM user_goals
+    WHERE user_id = ANY($1)
+    ORDER BY user_id, "updatedAt" DESC
+"""
+
+# Named statements prepared on every pooled connection
+STATEMENTS = {
+    "daily_activity": DAILY_ACTIVITY_QUERY,
+    "fitness_summary": FITNESS_SUMMARY_QUERY,
+    "rollup_summary": ROLLUP_SUMMARY_QUERY,
+    "user_goals": USER_GOALS_QUERY,
+    "today_activity": TODAY_ACTIVITY_QUERY,
+    "batch_daily_activity": BATCH_DAILY_ACTIVITY_QUERY,
+    "batch_user_goals": BATCH_USER_GOALS_QUERY,
+    "context_bundle": CONTEXT_BUNDLE_QUERY,
+    "get_cached_insights": GET_CACHED_INSIGHTS_QUERY,
+    "save_cached_insights": SAVE_CACHED_INSIGHTS_QUERY,
+    "get_research_cache": GET_RESEARCH_CACHE_QUERY,
+    "save_research_cache": SAVE_RESEARCH_CACHE_QUERY,
+}
+
+
+def _iso(value: Any) -> Optional[str]:
+    """ISO-format a date/datetime, passing through strings from JSON rows."""
+    if value is None:
+        return None
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def _daily_record(row: Mapping[str, Any]) -> Dict[str, Any]:
+    """Map a daily activity row to the public daily record shape."""
+    return {
+        "date": _iso(row["date"]),
+        "steps": row["steps"] or 0,
+        "distance": float(row["distance"] or 0),
+        "calories": row["calories"] or 0,
+        "active_minutes": row["active_minutes"] or 0,
+        "floors": row["floors"] or 0,
+        "heart_rate_avg": row["resting_heart_rate"] or 0,
+        "very_active_minutes": row["very_active_minutes"] or 0,
+        "fairly_active_minutes": row["fairly_active_minutes"] or 0,
+        "lightly_active_minutes": row["lightly_active_minutes"] or 0
+    }
+
+
+def _today_record(row: Mapping[str, Any]) -> Dict[str, Any]:
+    """Map today's activity row to the public today record shape."""
+    return {
+        "steps": row["steps"] or 0,
+        "distance": float(row["distance"] or 0),
+        "calories": row["calories"] or 0,
+        "active_minutes": row["active_minutes"] or 0,
+        "floors": row["floors"] or 0,
+        "heart_rate": row["resting_heart_rate"] or 0
+    }
+
+
+def _summary_record(row: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+    """Map an aggregate row to the public summary shape (None if no days)."""
+    if not row or row["total_days"] == 0:
+        return None
+
+    total_days = row["total_days"]
+    days_active = row["days_active"] or 0
+
+    return {
+        "avg_steps": int(row["avg_steps"] or 0),
+        "total_distance_km": float(row["total_distance"] or 0),
+        "total_calories": int(row["total_calories"] or 0),
+        "total_active_minutes": int(row["total_active_minutes"] or 0),
+        "avg_heart_rate": int(row["avg_heart_rate"] or 0),
+        "floors_climbed": int(row["floors_climbed"] or 0),
+        "days_active": days_active,
+        "total_days": total_days,
+        "activity_percentage": round((days_active / total_days) * 100, 1) if total_days > 0 else 0
+    }
+
+
+def _next_month(day: date) -> date:
+    """First day of the month after day's month."""
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _rollup_plan(start: date, end: date) -> tuple:
+    """
+    Cover the inclusive range [start, end] with rollup buckets.
+
+    Whole calendar months come from the monthly rollup, whole Monday-based
+    weeks in the remaining head and tail from the weekly rollup, and the
+    few days left over at either edge are read raw.
+
+    Args:
+        start: First day of the range
+        end: Last day of the range
+
+    Returns:
+        Tuple of (month starts, week starts, leftover days)
+    """
+    stop = end + timedelta(days=1)
+    months: List[date] = []
+    weeks: List[date] = []
+    days: List[date] = []
+
+    month = start if start.day == 1 else _next_month(start)
+    while _next_month(month) <= stop:
+        months.append(month)
+        month = _next_month(month)
+
+    segments = [(start, months[0]), (_next_month(months[-1]), stop)] if months else [(start, stop)]
+    for seg_start, seg_stop in segments:
+        week = seg_start + timedelta(days=(7 - seg_start.weekday()) % 7)
+        seg_weeks = []
+        while week + timedelta(days=7) <= seg_stop:
+            seg_weeks.append(week)
+            week += timedelta(days=7)
+        weeks.extend(seg_weeks)
+
+        edges = [(seg_start, seg_weeks[0]), (week, seg_stop)] if seg_weeks else [(seg_start, seg_stop)]
+        for day_start, day_stop in edges:
+            days.extend(day_start + timedelta(days=i) for i in range((day_stop - day_start).days))
+
+    return months, weeks, days
+
+
+def _user_uuids(user_ids: Sequence[str]) -> List[str]:
+    """Deduplicated user IDs in the lowercase form asyncpg returns UUIDs in."""
+    return list(dict.fromkeys(str(uuid.UUID(str(user_id))) for user_id in user_ids))
+
+
+def _chunks(items: Sequence[str], size: int) -> Iterator[Sequence[str]]:
+    """Split a sequence into consecutive chunks of at most size items."""
+    size = max(1, size)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _goal_record(row: Mapping[str, Any]) -> Dict[str, Any]:
+    """Map a user_goals row to the public goal shape."""
+    return {
+        "id": row["id"],
+        "fitness_goal": row["fitness_goal"],
+        "current_weight": float(row["current_weight"]) if row["current_weight"] else None,
+        "target_weight": float(row["target_weight"]) if row["target_weight"] else None,
+        "height": float(row["height"]) if row["height"] else None,
+        "current_bmi": float(row["current_bmi"]) if row["current_bmi"] else None,
+        "ideal_bmi": float(row["ideal_bmi"]) if row["ideal_bmi"] else None,
+        "age": row["age"],
+        "gender": row["gender"],
+        "activity_level": row["activity_level"],
+        "daily_steps_goal": row["daily_steps_goal"],
+        "daily_calories_burn_goal": row["daily_calories_burn_goal"],
+        "daily_active_minutes_goal": row["daily_active_minutes_goal"],
+        "daily_sleep_hours_goal": float(row["daily_sleep_hours_goal"]) if row["daily_sleep_hours_goal"] else None,
+        "weekly_workouts_goal": row["weekly_workouts_goal"],
+        "ai_recommendations_enabled": row["ai_recommendations_enabled"],
+        "ai_recommendations": row["ai_recommendations"],
+        "created_at": _iso(row["created_at"]),
+        "updated_at": _iso(row["updated_at"])
+    }
+
 
 class DatabaseService:
-    """Service for database operations."""
+    """Service for database operations (the PostgreSQL FitnessStorage)."""
 
     def __init__(self):
         """Initialize database service."""
         self.pool: Optional[asyncpg.Pool] = None
+        self._connect_lock = asyncio.Lock()
         self.database_url = os.getenv("DATABASE_URL")
+        self.statements = StatementRegistry(
+            STATEMENTS,
+            slow_query_ms=settings.db_slow_query_ms,
+            explain_sample_rate=settings.db_slow_query_explain_rate
+        )
+
+        # Cleared if the rollup tables turn out not to be migrated
+        self.use_rollups = settings.summary_rollups_enabled
+
+        # Callers currently queued for a pooled connection
+        self.waiting = 0
+        self.acquire_wait = LatencyHistogram()
 
         if not self.database_url:
             raise ValueError("DATABASE_URL environment variable is required")
 
     async def connect(self):
         """Create database connection pool."""
-        if not self.pool:
+        # Concurrent first queries must not each create their own pool
+        async with self._connect_lock:
+            if self.pool:
+                return
+
             try:
                 self.pool = await asyncpg.create_pool(
                     self.database_url,
-                    min_size=1,
-                    max_size=10,
-                    command_timeout=60
+                    min_size=settings.db_pool_min_size,
+                    max_size=settings.db_pool_max_size,
+                    max_inactive_connection_lifetime=settings.db_pool_max_inactive_connection_lifetime,
+                    command_timeout=settings.db_command_timeout,
+                    # Registry statements stay prepared for the connection's
+                    # lifetime; the default cache size (100) covers them
+                    max_cached_statement_lifetime=0,
+                    init=self.statements.prepare_all
+                )
+                logger.info(
+                    f"Database connection pool created "
+                    f"(min={settings.db_pool_min_size}, max={settings.db_pool_max_size})"
                 )
-                logger.info("Database connection pool created")
             except Exception as e:
                 logger.error(f"Failed to create database pool: {e}")
                 raise
 
+    async def warmup(self):
+        """Create the pool and round-trip every pre-opened connection once."""
+        await self.connect()
+        assert self.pool is not None
+
+        await asyncio.gather(*(
+            self.pool.fetchval("SELECT 1") for _ in range(self.pool.get_min_size())
+        ))
+        logger.info(f"Database pool warmed up ({self.pool.get_size()} connections)")
+
     async def close(self):
         """Close database connection pool."""
         if self.pool:
             await self.pool.close()
+            self.pool = None
             logger.info("Database connection pool closed")
 
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[asyncpg.Connection]:
+        """
+        Acquire a pooled connection, creating the pool if needed.
+
+        Yields:
+            asyncpg connection, released back to the pool on exit
+        """
+        if not self.pool:
+            await self.connect()
+        assert self.pool is not None
+
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            conn = await self.pool.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.acquire_wait.observe((time.perf_counter() - start) * 1000)
+
+        try:
+            yield conn
+        finally:
+            await self.pool.release(conn)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        Get connection pool statistics.
+
+        Returns:
+            Dictionary with pool size, idle, in-use and waiting counts,
+            and the distribution of time spent waiting to acquire
+        """
+        if not self.pool:
+            return {"connected": False, "waiting": self.waiting}
+
+        size = self.pool.get_size()
+        idle = self.pool.get_idle_size()
+        return {
+            "connected": True,
+            "size": size,
+            "idle": idle,
+            "in_use": size - idle,
+            "waiting": self.waiting,
+            "min_size": self.pool.get_min_size(),
+            "max_size": self.pool.get_max_size(),
+            "acquires": self.acquire_wait.count,
+            "acquire_wait_ms": self.acquire_wait.to_dict()
+        }
+
+    def statement_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-statement execution counts and latency.
+
+        Returns:
+            Counters keyed by statement name, busiest first
+        """
+        return self.statements.stats_dict()
+
     async def get_user_fitness_data(
         self,
         user_id: str,
@@ -60,59 +607,146 @@ class DatabaseService:
         Returns:
             List of daily fitness records
         """
-        if not self.pool:
-            await self.connect()
-
-        query = """
-            SELECT
-                a.date,
-                a.steps,
-                a.distance,
-                a.calories,
-                a."activeMinutes" as active_minutes,
-                a.floors,
-                a."veryActiveMinutes" as very_active_minutes,
-                a."fairlyActiveMinutes" as fairly_active_minutes,
-                a."lightlyActiveMinutes" as lightly_active_minutes,
-                COALESCE(h."restingHeartRate", 0) as resting_heart_rate
-            FROM activity_data a
-            LEFT JOIN heart_rate_data h ON a."userId" = h."userId" AND a.date = h.date
-            WHERE a."userId" = $1
-                AND a.date >= $2
-                AND a.date <= $3
-            ORDER BY a.date DESC
-        """
-
         try:
-            assert self.pool is not None
-            async with self.pool.acquire() as conn:
-                rows = await conn.fetch(
-                    query,
+            async with self.acquire() as conn:
+                rows = await self.statements.fetch(
+                    conn,
+                    "daily_activity",
                     user_id,
                     start_date.date(),
                     end_date.date()
                 )
 
-                return [
-                    {
-                        "date": row["date"].isoformat(),
-                        "steps": row["steps"] or 0,
-                        "distance": float(row["distance"] or 0),
-                        "calories": row["calories"] or 0,
-                        "active_minutes": row["active_minutes"] or 0,
-                        "floors": row["floors"] or 0,
-                        "heart_rate_avg": row["resting_heart_rate"] or 0,
-                        "very_active_minutes": row["very_active_minutes"] or 0,
-                        "fairly_active_minutes": row["fairly_active_minutes"] or 0,
-                        "lightly_active_minutes": row["lightly_active_minutes"] or 0
-                    }
-                    for row in rows
-                ]
+                return [_daily_record(row) for row in rows]
 
         except Exception as e:
             logger.error(f"Error fetching fitness data: {e}")
             return []
 
+    async def stream_user_fitness_series(
+        self,
+        user_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        chunk_days: Optional[int] = None
+    ) -> AsyncIterator[DailySeries]:
+        """
+        Stream user's fitness data for a date range in columnar chunks.
+
+        Rows are read through a server-side cursor, so memory use depends
+        on the chunk size rather than the length of the range. Unlike the
+        list-returning methods, errors are raised: a silently truncated
+        stream would skew any aggregate built from it.
+
+        Args:
+            user_id: User's ID (UUID string)
+            start_date: Start date
+            end_date: End date
+            chunk_days: Days per chunk and cursor prefetch
+                (settings.db_cursor_prefetch if None)
+
+        Yields:
+            DailySeries chunks, newest days first
+        """
+        chunk_days = max(1, chunk_days or settings.db_cursor_prefetch)
+
+        async with self.acquire() as conn:
+            # Server-side cursors only live inside a transaction
+            async with conn.transaction(readonly=True):
+                rows = []
+                async for row in self.statements.cursor(
+                    conn,
+                    "daily_activity",
+                    user_id,
+                    start_date.date(),
+                    end_date.date(),
+                    prefetch=chunk_days
+                ):
+                    rows.append(row)
+                    if len(rows) == chunk_days:
+                        yield DailySeries.from_rows(rows)
+                        rows = []
+
+                if rows:
+                    yield DailySeries.from_rows(rows)
+
+    async def get_fitness_data_for_users(
+        self,
+        user_ids: Sequence[str],
+        start_date: datetime,
+        end_date: datetime,
+        chunk_size: Optional[int] = None
+    ) -> Dict[str, DailySeries]:
+        """
+        Get fitness data for many users as per-user columnar series.
+
+        Batched variant of get_user_fitness_data for cohort jobs: one
+        query per chunk of users instead of one per user. IDs are matched
+        case-insensitively (a non-UUID ID raises ValueError), and database
+        errors propagate so a failed query never reads as missing data.
+
+        Args:
+            user_ids: Users' IDs (UUID strings)
+            start_date: Start date
+            end_date: End date
+            chunk_size: Users per query (settings.db_batch_chunk_size if None)
+
+        Returns:
+            Dictionary of DailySeries (date DESC) for every requested user,
+            keyed by lowercase UUID string; users without data get an
+            empty series
+        """
+        user_ids = _user_uuids(user_ids)
+        result = {user_id: DailySeries.empty() for user_id in user_ids}
+
+        async with self.acquire() as conn:
+            for chunk in _chunks(user_ids, chunk_size or settings.db_batch_chunk_size):
+                rows = await self.statements.fetch(
+                    conn,
+                    "batch_daily_activity",
+                    chunk,
+                    start_date.date(),
+                    end_date.date()
+                )
+
+                for user_id, user_rows in groupby(rows, key=lambda row: str(row["user_id"])):
+                    result[user_id] = DailySeries.from_rows(user_rows)
+
+        return result
+
+    async def get_goals_for_users(
+        self,
+        user_ids: Sequence[str],
+        chunk_size: Optional[int] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the latest goal record for many users.
+
+        Batched variant of get_user_goals: one query per chunk of users.
+        IDs are matched case-insensitively (a non-UUID ID raises
+        ValueError), and database errors propagate so a failed query never
+        reads as users without goals.
+
+        Args:
+            user_ids: Users' IDs (UUID strings)
+            chunk_size: Users per query (settings.db_batch_chunk_size if None)
+
+        Returns:
+            Dictionary of goal records keyed by lowercase UUID string;
+            users without goals are omitted
+        """
+        user_ids = _user_uuids(user_ids)
+        result = {}
+
+        async with self.acquire() as conn:
+            for chunk in _chunks(user_ids, chunk_size or settings.db_batch_chunk_size):
+                rows = await self.statements.fetch(conn, "batch_user_goals", chunk)
+
+                for row in rows:
+                    result[str(row["user_id"])] = _goal_record(row)
+
+        return result
+
     async def get_fitness_summary(
         self,
         user_id: str,
@@ -122,6 +756,11 @@ class DatabaseService:
         """
         Get aggregated fitness summary for period.
 
+        Reads whole months and weeks from the activity rollup tables and
+        only the leftover edge days from activity_data, so a year-long
+        summary touches a few dozen rows instead of 365. Falls back to
+        aggregating raw rows when the rollups are disabled or missing.
+
         Args:
             user_id: User's ID
             start_date: Start date
@@ -130,53 +769,38 @@ class DatabaseService:
         Returns:
             Summary dictionary
         """
-        if not self.pool:
-            await self.connect()
-
-        query = """
-            SELECT
-                COUNT(*) as total_days,
-                AVG(a.steps) as avg_steps,
-                SUM(a.distance) as total_distance,
-                SUM(a.calories) as total_calories,
-                SUM(a."activeMinutes") as total_active_minutes,
-                AVG(h."restingHeartRate") as avg_heart_rate,
-                SUM(a.floors) as floors_climbed,
-                COUNT(CASE WHEN a.steps >= 5000 THEN 1 END) as days_active
-            FROM activity_data a
-            LEFT JOIN heart_rate_data h ON a."userId" = h."userId" AND a.date = h.date
-            WHERE a."userId" = $1
-                AND a.date >= $2
-                AND a.date <= $3
-        """
+        start, end = start_date.date(), end_date.date()
 
         try:
-            assert self.pool is not None
-            async with self.pool.acquire() as conn:
-                row = await conn.fetchrow(
-                    query,
+            async with self.acquire() as conn:
+                if self.use_rollups:
+                    months, weeks, days = _rollup_plan(start, end)
+                    try:
+                        row = await self.statements.fetchrow(
+                            conn,
+                            "rollup_summary",
+                            user_id,
+                            months,
+                            weeks,
+                            days
+                        )
+                        return _summary_record(row)
+                    except asyncpg.UndefinedTableError:
+                        logger.warning(
+                            "Activity rollup tables not found (run scripts/migrate.py); "
+                            "summarizing raw activity rows"
+                        )
+                        self.use_rollups = False
+
+                row = await self.statements.fetchrow(
+                    conn,
+                    "fitness_summary",
                     user_id,
-                    start_date.date(),
-                    end_date.date()
+                    start,
+                    end
                 )
 
-                if not row or row["total_days"] == 0:
-                    return None
-
-                total_days = row["total_days"]
-                days_active = row["days_active"] or 0
-
-                return {
-                    "avg_steps": int(row["avg_steps"] or 0),
-                    "total_distance_km": float(row["total_distance"] or 0),
-                    "total_calories": int(row["total_calories"] or 0),
-                    "total_active_minutes": int(row["total_active_minutes"] or 0),
-                    "avg_heart_rate": int(row["avg_heart_rate"] or 0),
-                    "floors_climbed": int(row["floors_climbed"] or 0),
-                    "days_active": days_active,
-                    "total_days": total_days,
-                    "activity_percentage": round((days_active / total_days) * 100, 1) if total_days > 0 else 0
-                }
+                return _summary_record(row)
 
         except Exception as e:
             logger.error(f"Error fetching fitness summary: {e}")
@@ -192,65 +816,11 @@ class DatabaseService:
         Returns:
             List with user's goals (typically one record)
         """
-        if not self.pool:
-            await self.connect()
-
-        query = """
-            SELECT
-                id,
-                "fitnessGoal" as fitness_goal,
-                "currentWeight" as current_weight,
-                "targetWeight" as target_weight,
-                height,
-                "currentBMI" as current_bmi,
-                "idealBMI" as ideal_bmi,
-                age,
-                gender,
-                "activityLevel" as activity_level,
-                "dailyStepsGoal" as daily_steps_goal,
-                "dailyCaloriesBurnGoal" as daily_calories_burn_goal,
-                "dailyActiveMinutesGoal" as daily_active_minutes_goal,
-                "dailySleepHoursGoal" as daily_sleep_hours_goal,
-                "weeklyWorkoutsGoal" as weekly_workouts_goal,
-                "aiRecommendationsEnabled" as ai_recommendations_enabled,
-                "aiRecommendations" as ai_recommendations,
-                "createdAt" as created_at,
-                "updatedAt" as updated_at
-            FROM user_goals
-            WHERE user_id = $1
-            ORDER BY "updatedAt" DESC
-            LIMIT 1
-        """
-
         try:
-            assert self.pool is not None
-            async with self.pool.acquire() as conn:
-                rows = await conn.fetch(query, user_id)
-
-                return [
-                    {
-                        "id": row["id"],
-                        "fitness_goal": row["fitness_goal"],
-                        "current_weight": float(row["current_weight"]) if row["current_weight"] else None,
-                        "target_weight": float(row["target_weight"]) if row["target_weight"] else None,
-                        "height": float(row["height"]) if row["height"] else None,
-                        "current_bmi": float(row["current_bmi"]) if row["current_bmi"] else None,
-                        "ideal_bmi": float(row["ideal_bmi"]) if row["ideal_bmi"] else None,
-                        "age": row["age"],
-                        "gender": row["gender"],
-                        "activity_level": row["activity_level"],
-                        "daily_steps_goal": row["daily_steps_goal"],
-                        "daily_calories_burn_goal": row["daily_calories_burn_goal"],
-                        "daily_active_minutes_goal": row["daily_active_minutes_goal"],
-                        "daily_sleep_hours_goal": float(row["daily_sleep_hours_goal"]) if row["daily_sleep_hours_goal"] else None,
-                        "weekly_workouts_goal": row["weekly_workouts_goal"],
-                        "ai_recommendations_enabled": row["ai_recommendations_enabled"],
-                        "ai_recommendations": row["ai_recommendations"],
-                        "created_at": row["created_at"].isoformat() if row["created_at"] else None,
-                        "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None
-                    }
-                    for row in rows
-                ]
+            async with self.acquire() as conn:
+                rows = await self.statements.fetch(conn, "user_goals", user_id)
+
+                return [_goal_record(row) for row in rows]
 
         except Exception as e:
             logger.error(f"Error fetching goals: {e}")
@@ -266,56 +836,252 @@ class DatabaseService:
         Returns:
             Today's fitness record or None
         """
-        if not self.pool:
-            await self.connect()
+        try:
+            async with self.acquire() as conn:
+                row = await self.statements.fetchrow(
+                    conn,
+                    "today_activity",
+                    user_id,
+                    datetime.now().date()
+                )
+
+                if not row:
+                    return None
+
+                return _today_record(row)
+
+        except Exception as e:
+            logger.error(f"Error fetching today's data: {e}")
+            return None
+
+    async def get_user_context_bundle(
+        self,
+        user_id: str,
+        windows: Sequence[int] = (7,),
+        daily_days: int = 30
+    ) -> Dict[str, Any]:
+        """
+        Get daily rows, period summaries, today's row and goals in one query.
+
+        A single CTE statement replaces separate calls to
+        get_user_fitness_data, get_fitness_summary, get_today_fitness_data
+        and get_user_goals. Window N covers the same dates as
+        get_fitness_summary(now - N days, now).
 
-        query = """
-            SELECT
-                a.steps,
-                a.distance,
-                a.calories,
-                a."activeMinutes" as active_minutes,
-                a.floors,
-                COALESCE(h."restingHeartRate", 0) as resting_heart_rate
-            FROM activity_data a
-            LEFT JOIN heart_rate_data h ON a."userId" = h."userId" AND a.date = h.date
-            WHERE a."userId" = $1
-                AND a.date = $2
+        Args:
+            user_id: User's ID (UUID string)
+            windows: Summary window sizes in days (e.g. (7, 30))
+            daily_days: Days of daily rows to return (0 for none)
+
+        Returns:
+            Dictionary with "daily" (list, date DESC), "daily_series" (the
+            same days as a DailySeries), "summaries" ({days: summary or
+            None}), "today" (record or None) and "goals" (list with the
+            latest goal record); the empty bundle with "error": True if
+            the query failed
         """
+        windows = sorted({int(w) for w in windows})
+        end_date = datetime.now().date()
+        start_date = end_date - timedelta(days=max(windows + [daily_days]))
+
+        empty = {
+            "daily": [],
+            "daily_series": DailySeries.empty(),
+            "summaries": {days: None for days in windows},
+            "today": None,
+            "goals": []
+        }
 
         try:
-            assert self.pool is not None
-            async with self.pool.acquire() as conn:
-                row = await conn.fetchrow(
-                    query,
+            async with self.acquire() as conn:
+                row = await self.statements.fetchrow(
+                    conn,
+                    "context_bundle",
                     user_id,
-                    datetime.now().date()
+                    start_date,
+                    end_date,
+                    windows,
+                    daily_days
+                )
+
+                if not row:
+                    return empty
+
+                daily = json.loads(row["daily"]) if row["daily"] else []
+                summaries = json.loads(row["summaries"]) if row["summaries"] else []
+                today = json.loads(row["today"]) if row["today"] else None
+                goal = json.loads(row["goal"]) if row["goal"] else None
+
+                records = [_daily_record(r) for r in daily] if daily_days > 0 else []
+
+                # Built once here so analyzers never convert the records again
+                return {
+                    "daily": records,
+                    "daily_series": DailySeries.from_dicts(records),
+                    "summaries": {r["days"]: _summary_record(r) for r in summaries},
+                    "today": _today_record(today) if today else None,
+                    "goals": [_goal_record(goal)] if goal else []
+                }
+
+        except Exception as e:
+            logger.error(f"Error fetching user context bundle: {e}")
+            return {**empty, "error": True}
+
+    async def get_cached_insights(self, user_id: str, period: str) -> Optional[Dict[str, Any]]:
+        """
+        Get cached insights for a user and period from ai_insights.
+
+        Args:
+            user_id: User's ID (UUID string)
+            period: Insight period ("week", "month", "year")
+
+        Returns:
+            Dictionary with insights, generated_at and expires_at, or None
+        """
+        try:
+            async with self.acquire() as conn:
+                row = await self.statements.fetchrow(conn, "get_cached_insights", user_id, period)
+
+                if not row:
+                    return None
+
+                return {
+                    "insights": json.loads(row["insights"]),
+                    "generated_at": row["generated_at"],
+                    "expires_at": row["expires_at"]
+                }
+
+        except Exception as e:
+            logger.error(f"Error fetching cached insights: {e}")
+            return None
+
+    async def save_cached_insights(
+        self,
+        user_id: str,
+        period: str,
+        insights: Dict[str, Any],
+        expires_at: datetime
+    ) -> bool:
+        """
+        Insert or replace cached insights for a user and period.
+
+        Args:
+            user_id: User's ID (UUID string)
+            period: Insight period ("week", "month", "year")
+            insights: Insights payload to cache
+            expires_at: When the cached insights expire
+
+        Returns:
+            True if saved
+        """
+        try:
+            async with self.acquire() as conn:
+                await self.statements.execute(
+                    conn,
+                    "save_cached_insights",
+                    user_id,
+                    period,
+                    json.dumps(insights),
+                    json.dumps(insights.get("summary")),
+                    expires_at
                 )
+                return True
+
+        except Exception as e:
+            logger.error(f"Error saving cached insights: {e}")
+            return False
+
+    async def get_research_cache(self, query_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get an unexpired research_cache entry.
+
+        Args:
+            query_key: Canonicalized search query
+
+        Returns:
+            Dictionary with provider, results, is_error and error, or None
+        """
+        try:
+            async with self.acquire() as conn:
+                row = await self.statements.fetchrow(conn, "get_research_cache", query_key)
 
                 if not row:
                     return None
 
                 return {
-                    "steps": row["steps"] or 0,
-                    "distance": float(row["distance"] or 0),
-                    "calories": row["calories"] or 0,
-                    "active_minutes": row["active_minutes"] or 0,
-                    "floors": row["floors"] or 0,
-                    "heart_rate": row["resting_heart_rate"] or 0
+                    "provider": row["provider"],
+                    "results": json.loads(row["results"]),
+                    "is_error": row["is_error"],
+                    "error": row["error"]
                 }
 
         except Exception as e:
-            logger.error(f"Error fetching today's data: {e}")
+            logger.error(f"Error fetching research cache: {e}")
             return None
 
+    async def save_research_cache(
+        self,
+        query_key: str,
+        provider: str,
+        results: List[Dict[str, Any]],
+        error: Optional[str],
+        expires_at: datetime
+    ) -> bool:
+        """
+        Insert or replace a research_cache entry.
+
+        Args:
+            query_key: Canonicalized search query
+            provider: Search provider ("serper" or "google")
+            results: Search results to cache
+            error: Error message for a negative entry, None on success
+            expires_at: When the entry expires
+
+        Returns:
+            True if saved
+        """
+        try:
+            async with self.acquire() as conn:
+                await self.statements.execute(
+                    conn,
+                    "save_research_cache",
+                    query_key,
+                    provider,
+                    json.dumps(results),
+                    error is not None,
+                    error,
+                    expires_at
+                )
+                return True
+
+        except Exception as e:
+            logger.error(f"Error saving research cache: {e}")
+            return False
+
 
 # Singleton instance
 _db_service = None
 
 
-def get_database_service() -> DatabaseService:
-    """Get database service singleton."""
+def get_database_service() -> "FitnessStorage":
+    """
+    Get the storage backend singleton selected by settings.storage_backend.
+
+    Returns:
+        DatabaseService, or InMemoryStorage loaded from
+        settings.storage_fixture_path when the backend is "memory"
+    """
     global _db_service
     if _db_service is None:
-        _db_service = DatabaseService()
+        if settings.storage_backend == "memory":
+            from .memory_storage import InMemoryStorage
+            _db_service = InMemoryStorage.from_fixture(settings.storage_fixture_path)
+        else:
+            _db_service = DatabaseService()
     return _db_service
+
+
+async def close_database_service():
+    """Close the database pool if the service was created."""
+    if _db_service is not None:
+        await _db_service.close()
@@ -5,25 +5,74 @@ Analyzes user fitness data to generate insights, identify patterns,
 and provide data-driven recommendations.
 """
 
-from typing import List, Dict, Optional
+from typing import AsyncIterable, List, Dict, Optional, Union
 import statistics
-from datetime import datetime, timedelta
+import numpy as np
+from .daily_series import DAY_NAMES, DailySeries
+from .step_stats import compute_step_stats, stats_to_dict
+from .analysis_context import AnalysisContext, AnalysisMemo
+from .streaming_stats import StreamingAccumulator
+
+# Accepted daily data inputs: columnar series, list of daily record dicts,
+# or an AnalysisContext already built for the request
+DailyData = Union[DailySeries, List[Dict], AnalysisContext]
 
 
 class FitnessAnalyzer:
     """Analyze fitness data and generate insights."""
 
-    def analyze_patterns(self, daily_data: List[Dict]) -> Dict:
+    def __init__(self, memo_size: int = 256):
+        """
+        Initialize fitness analyzer.
+
+        Args:
+            memo_size: Number of analysis contexts kept for repeat data
+        """
+        self.memo = AnalysisMemo(memo_size)
+
+    def analyze(self, daily_data: DailyData) -> AnalysisContext:
+        """
+        Get the shared analysis context for daily data.
+
+        Identical series (same dates and values) map to the same context,
+        so repeat analyses return already computed results.
+
+        Args:
+            daily_data: Daily fitness series, list of daily records, or context
+
+        Returns:
+            AnalysisContext for the data
+        """
+        if isinstance(daily_data, AnalysisContext):
+            return daily_data
+
+        series = DailySeries.coerce(daily_data)
+        key = series.fingerprint()
+
+        # Hits and misses are counted on self.memo rather than logged;
+        # this runs on every analysis call
+        context = self.memo.get(key)
+        if context is None:
+            context = AnalysisContext(series, self)
+            self.memo.put(key, context)
+
+        return context
+
+    def analyze_patterns(self, daily_data: DailyData) -> Dict:
         """
         Analyze patterns in daily fitness data.
 
         Args:
-            daily_data: List of daily fitness records
+            daily_data: Daily fitness series, list of daily records, or context
 
         Returns:
             Dictionary with trends, patterns, and recommendations
         """
-        if not daily_data:
+        return self.analyze(daily_data).patterns
+
+    def _compute_patterns(self, series: DailySeries) -> Dict:
+        """Compute analyze_patterns output for a series (uncached)."""
+        if not series:
             return {
                 "trends": [],
                 "patterns": [],
@@ -31,10 +80,11 @@ class FitnessAnalyzer:
                 "stats": {}
             }
 
-        # Extract step data
-        steps = [d['steps'] for d in daily_data if d.get('steps')]
+        # One vectorized pass over the step column
+        stats = compute_step_stats(series.steps)
+        days_analyzed = int(stats["days_analyzed"][0])
 
-        if not steps:
+        if not days_analyzed:
             return {
                 "trends": ["No step data available"],
                 "patterns": [],
@@ -42,12 +92,13 @@ class FitnessAnalyzer:
                 "stats": {}
             }
 
-        # Calculate statistics
-        avg_steps = statistics.mean(steps)
-        median_steps = statistics.median(steps)
-        stdev_steps = statistics.stdev(steps) if len(steps) > 1 else 0
-        min_steps = min(steps)
-        max_steps = max(steps)
+        avg_steps = float(stats["average"][0])
+        median_steps = float(stats["median"][0])
+        stdev_steps = float(stats["std_dev"][0])
+        min_steps = int(stats["min"][0])
+        max_steps = int(stats["max"][0])
+        consistency_score = float(stats["consistency"][0])
+        active_days = int(stats["days_hit_goal"][0])
 
         trends = []
         patterns = []
@@ -64,8 +115,6 @@ class FitnessAnalyzer:
             trends.append(f"📊 Activity level below recommended - averaging {int(avg_steps):,} steps/day")
 
         # Pattern: Consistency
-        consistency_score = 100 - min((stdev_steps / avg_steps * 100) if avg_steps > 0 else 100, 100)
-
         if consistency_score >= 80:
             patterns.append(f"⭐ High consistency ({consistency_score:.0f}%) - your activity is very predictable")
         elif consistency_score >= 60:
@@ -94,12 +143,9 @@ class FitnessAnalyzer:
             recommendations.append("⚠️ Some very low activity days detected - try to maintain baseline activity")
 
         # Check for improvement trend
-        if len(steps) >= 7:
-            first_half = steps[:len(steps)//2]
-            second_half = steps[len(steps)//2:]
-
-            first_avg = statistics.mean(first_half)
-            second_avg = statistics.mean(second_half)
+        if days_analyzed >= 7:
+            first_avg = float(stats["first_half_avg"][0])
+            second_avg = float(stats["second_half_avg"][0])
 
             if second_avg > first_avg * 1.1:
                 improvement = ((second_avg / first_avg) - 1) * 100
@@ -110,46 +156,88 @@ class FitnessAnalyzer:
                     trends.append(f"📉 Activity declined {decline:.1f}% - let's get back on track")
 
         # Activity streaks
-        active_days = sum(1 for s in steps if s >= 10000)
-        if len(steps) >= 7:
-            streak_percentage = (active_days / len(steps)) * 100
+        if days_analyzed >= 7:
+            streak_percentage = (active_days / days_analyzed) * 100
             if streak_percentage >= 80:
-                patterns.append(f"🔥 Strong streak: {active_days}/{len(steps)} days hit 10k goal ({streak_percentage:.0f}%)")
+                patterns.append(f"🔥 Strong streak: {active_days}/{days_analyzed} days hit 10k goal ({streak_percentage:.0f}%)")
 
         return {
             "trends": trends,
             "patterns": patterns,
             "recommendations": recommendations,
-            "stats": {
-                "average": int(avg_steps),
-                "median": int(median_steps),
-                "min": int(min_steps),
-                "max": int(max_steps),
-                "std_dev": int(stdev_steps),
-                "consistency": round(consistency_score, 1),
-                "days_analyzed": len(steps),
-                "days_hit_goal": active_days
-            }
+            "stats": stats_to_dict(stats)
         }
 
-    def generate_insights(self, daily_data: List[Dict], goals: List[Dict]) -> List[str]:
+    def analyze_patterns_batch(self, steps_matrix: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Compute pattern statistics for many users at once.
+
+        Each row is one user's daily steps in load order, with 0 for days
+        without data (ragged histories can be right-padded with zeros).
+        stats_to_dict(result, row) gives the same "stats" dict that
+        analyze_patterns returns for that user.
+
+        Args:
+            steps_matrix: Integer array of shape (users, days)
+
+        Returns:
+            Dictionary of per-user stats arrays (see compute_step_stats)
+        """
+        return compute_step_stats(steps_matrix)
+
+    async def analyze_stream(
+        self,
+        chunks: AsyncIterable[DailySeries],
+        goal_steps: int = 10000
+    ) -> Dict:
+        """
+        Analyze a long history chunk by chunk with flat memory use.
+
+        Consumes e.g. DatabaseService.stream_user_fitness_series. Results
+        match analyze_patterns()["stats"], calculate_weekly_streak() and
+        identify_best_day() on the same days loaded at once, except that
+        the half-split trend is not computed.
+
+        Args:
+            chunks: DailySeries chunks, newest days first
+            goal_steps: Daily step goal for the streak (default: 10,000)
+
+        Returns:
+            Dictionary with stats, streak, best_day, calorie_average,
+            total_distance and days
+        """
+        accumulator = StreamingAccumulator(goal_steps)
+        async for chunk in chunks:
+            accumulator.update(chunk)
+
+        return {
+            "stats": accumulator.stats(),
+            "streak": accumulator.streak(),
+            "best_day": accumulator.best_day(),
+            "calorie_average": accumulator.calorie_average(),
+            "total_distance": accumulator.total_distance(),
+            "days": accumulator.days
+        }
+
+    def generate_insights(self, daily_data: DailyData, goals: List[Dict]) -> List[str]:
         """
         Generate human-readable insights from fitness data.
 
         Args:
-            daily_data: List of daily fitness records
+            daily_data: Daily fitness series, list of daily records, or context
             goals: List of user goals
 
         Returns:
             List of insight strings
         """
         insights = []
+        context = self.analyze(daily_data)
 
-        if not daily_data:
+        if not context.series:
             return ["Start tracking your fitness data to get personalized insights!"]
 
         # Analyze activity patterns
-        analysis = self.analyze_patterns(daily_data)
+        analysis = context.patterns
 
         # Add top insights from analysis
         insights.extend(analysis['trends'][:2])
@@ -174,16 +262,14 @@ class FitnessAnalyzer:
             insights.append(analysis['recommendations'][0])
 
         # Analyze calorie trends if available
-        calories = [d.get('calories', 0) for d in daily_data if d.get('calories')]
-        if calories:
-            avg_calories = statistics.mean(calories)
+        avg_calories = context.calorie_average
+        if avg_calories is not None:
             if avg_calories > 2500:
                 insights.append(f"🔥 High calorie burn: averaging {int(avg_calories)} calories/day")
 
         # Analyze distance if available
-        distances = [d.get('distance', 0) for d in daily_data if d.get('distance')]
-        if distances:
-            total_distance = sum(distances)
+        total_distance = context.total_distance
+        if total_distance is not None:
             if total_distance > 50:  # km
                 insights.append(f"🏃 Great distance covered: {total_distance:.1f}km total")
 
@@ -227,18 +313,22 @@ class FitnessAnalyzer:
         }
         return descriptions.get(level, "")
 
-    def calculate_weekly_streak(self, daily_data: List[Dict], goal_steps: int = 10000) -> Dict:
+    def calculate_weekly_streak(self, daily_data: DailyData, goal_steps: int = 10000) -> Dict:
         """
         Calculate current streak of days hitting step goal.
 
         Args:
-            daily_data: List of daily fitness records (should be sorted by date DESC)
+            daily_data: Daily fitness series, list of daily records, or context
             goal_steps: Daily step goal (default: 10,000)
 
         Returns:
             Dictionary with current streak, best streak, and streak info
         """
-        if not daily_data:
+        return self.analyze(daily_data).streak(goal_steps)
+
+    def _compute_streak(self, series: DailySeries, goal_steps: int) -> Dict:
+        """Compute calculate_weekly_streak output for a series (uncached)."""
+        if not series:
             return {
                 "current_streak": 0,
                 "best_streak": 0,
@@ -248,12 +338,13 @@ class FitnessAnalyzer:
             }
 
         # Sort by date descending (most recent first)
-        sorted_data = sorted(daily_data, key=lambda x: x['date'], reverse=True)
+        order = (-series.dates).argsort(kind="stable")
+        hits = (series.steps[order] >= goal_steps).tolist()
 
         # Calculate current streak (consecutive days from most recent)
         current_streak = 0
-        for record in sorted_data:
-            if record.get('steps', 0) >= goal_steps:
+        for hit in hits:
+            if hit:
                 current_streak += 1
             else:
                 break
@@ -263,15 +354,15 @@ class FitnessAnalyzer:
         temp_streak = 0
         days_hit_goal = 0
 
-        for record in sorted_data:
-            if record.get('steps', 0) >= goal_steps:
+        for hit in hits:
+            if hit:
                 temp_streak += 1
                 days_hit_goal += 1
                 best_streak = max(best_streak, temp_streak)
             else:
                 temp_streak = 0
 
-        total_days = len(sorted_data)
+        total_days = len(hits)
         percentage = (days_hit_goal / total_days * 100) if total_days > 0 else 0
 
         return {
@@ -282,28 +373,29 @@ class FitnessAnalyzer:
             "percentage": round(percentage, 1)
         }
 
-    def identify_best_day(self, daily_data: List[Dict]) -> Optional[str]:
+    def identify_best_day(self, daily_data: DailyData) -> Optional[str]:
         """
         Identify the day of the week with best activity.
 
         Args:
-            daily_data: List of daily fitness records
+            daily_data: Daily fitness series, list of daily records, or context
 
         Returns:
             Day name (e.g., "Monday") or None
         """
-        if not daily_data:
+        return self.analyze(daily_data).best_day
+
+    def _compute_best_day(self, series: DailySeries) -> Optional[str]:
+        """Compute identify_best_day output for a series (uncached)."""
+        if not series:
             return None
 
         from collections import defaultdict
 
         day_stats = defaultdict(list)
 
-        for record in daily_data:
-            if 'date' in record and 'steps' in record:
-                date = datetime.fromisoformat(record['date'])
-                day_name = date.strftime('%A')
-                day_stats[day_name].append(record['steps'])
+        for weekday, steps in zip(series.weekdays().tolist(), series.steps.tolist()):
+            day_stats[DAY_NAMES[weekday]].append(steps)
 
         if not day_stats:
             return None
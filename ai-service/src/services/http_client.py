@@ -0,0 +1,139 @@
+"""
+Shared HTTP Client
+
+Application-lifetime httpx client for outbound API calls. Connections are
+kept alive and reused across requests, HTTP/2 is negotiated when the h2
+package is installed, and concurrent requests to any single host are capped.
+"""
+
+import asyncio
+import importlib.util
+from typing import TYPE_CHECKING, Any, Dict, Optional
+from urllib.parse import urlsplit
+
+from ..config.settings import settings
+from ..utils.logger import logger
+
+# httpx is imported with the first client so app start does not pay for it
+if TYPE_CHECKING:
+    import httpx
+
+
+class SharedHTTPClient:
+    """Pooled httpx client with per-host concurrency limits."""
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        max_connections_per_host: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 10.0
+    ):
+        """
+        Initialize shared client settings; the client itself is created on first use.
+
+        Args:
+            max_connections: Total connection limit across all hosts
+            max_keepalive_connections: Idle connections kept open for reuse
+            max_connections_per_host: Concurrent requests allowed per host
+            keepalive_expiry: Seconds an idle connection stays open
+            timeout: Default request timeout in seconds
+        """
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.max_connections_per_host = max(1, max_connections_per_host)
+        self.timeout = timeout
+        self.http2 = importlib.util.find_spec("h2") is not None
+
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self.requests = 0
+
+    @property
+    def client(self) -> "httpx.AsyncClient":
+        """Underlying httpx client, created lazily."""
+        if self._client is None or self._client.is_closed:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry
+                ),
+                timeout=self.timeout
+            )
+            logger.info(f"HTTP client pool created (http2={self.http2})")
+        return self._client
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> "httpx.Response":
+        """
+        Send a request through the shared pool.
+
+        Args:
+            method: HTTP method
+            url: Absolute request URL
+            **kwargs: Passed through to httpx.AsyncClient.request
+
+        Returns:
+            httpx response
+        """
+        host = urlsplit(url).netloc
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self.max_connections_per_host)
+
+        async with slot:
+            self.requests += 1
+            return await self.client.request(method, url, **kwargs)
+
+    async def get(self, url: str, **kwargs: Any) -> "httpx.Response":
+        """Send a GET request through the shared pool."""
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> "httpx.Response":
+        """Send a POST request through the shared pool."""
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self):
+        """Close all pooled connections."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info("HTTP client pool closed")
+        self._client = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Current pool configuration and usage."""
+        return {
+            "open": self._client is not None and not self._client.is_closed,
+            "http2": self.http2,
+            "requests": self.requests,
+            "hosts": len(self._host_slots),
+            "max_connections_per_host": self.max_connections_per_host
+        }
+
+
+# Singleton instance
+_http_client = None
+
+
+def get_http_client() -> SharedHTTPClient:
+    """Get shared HTTP client singleton."""
+    global _http_client
+    if _http_client is None:
+        _http_client = SharedHTTPClient(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            max_connections_per_host=settings.http_max_connections_per_host,
+            keepalive_expiry=settings.http_keepalive_expiry_seconds
+        )
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared HTTP client if it was created."""
+    if _http_client is not None:
+        await _http_client.aclose()
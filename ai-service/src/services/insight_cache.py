@@ -0,0 +1,223 @@
+"""
+Insight Cache
+
+Two-tier read-through cache for generated insights: an in-process LRU with
+TTL in front of the ai_insights table. Entries past their TTL are still
+served for a grace period while a single background refresh recomputes
+them (stale-while-revalidate). Callers get their own copy of a cached
+value, so editing a result cannot change what later readers see.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from copy import deepcopy
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from .database_service import get_database_service
+from ..config.settings import settings
+from ..utils.logger import logger, log_cache_hit, log_error
+
+if TYPE_CHECKING:
+    from .storage import FitnessStorage
+
+CacheKey = Tuple[str, str]
+Compute = Callable[[], Awaitable[Dict]]
+
+
+class _Entry:
+    """Locally cached value with monotonic freshness deadlines."""
+
+    __slots__ = ("value", "fresh_until", "stale_until")
+
+    def __init__(self, value: Dict, fresh_until: float, stale_until: float):
+        self.value = value
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+
+class InsightCache:
+    """Read-through insight cache backed by the ai_insights table."""
+
+    def __init__(
+        self,
+        ttl_seconds: int = 900,
+        stale_seconds: int = 3600,
+        max_entries: int = 1024,
+        db: Optional["FitnessStorage"] = None
+    ):
+        """
+        Initialize insight cache.
+
+        Args:
+            ttl_seconds: How long computed insights stay fresh
+            stale_seconds: How long past expiry stale insights may be served
+            max_entries: Maximum entries in the in-process LRU
+            db: Storage backend holding ai_insights (the configured backend if None)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self._db = db
+
+        self._local: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
+        self._background: Set[asyncio.Task] = set()
+
+        self.stats = {"local_hits": 0, "db_hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0}
+
+    async def get_or_compute(self, user_id: str, period: str, compute: Compute) -> Dict:
+        """
+        Return cached insights, computing and storing them on a miss.
+
+        Args:
+            user_id: User's ID (UUID string)
+            period: Insight period ("week", "month", "year")
+            compute: Coroutine factory producing fresh insights
+
+        Returns:
+            Insights dictionary (the caller's own copy)
+        """
+        key = (str(user_id), period)
+        now = time.monotonic()
+
+        # Tier 1: in-process LRU
+        entry = self._local.get(key)
+        if entry is not None:
+            if now < entry.fresh_until:
+                self._local.move_to_end(key)
+                self.stats["local_hits"] += 1
+                log_cache_hit(f"insights:{key[0]}:{period}")
+                return deepcopy(entry.value)
+
+            if now < entry.stale_until:
+                self.stats["stale_hits"] += 1
+                log_cache_hit(f"insights:{key[0]}:{period} (stale)")
+                self._refresh_in_background(key, compute)
+                return deepcopy(entry.value)
+
+            del self._local[key]
+
+        # Tier 2: ai_insights table
+        cached = await self._load(key)
+        if cached is not None:
+            value, fresh_for = cached
+            self._store_local(key, value, fresh_for)
+
+            if fresh_for > 0:
+                self.stats["db_hits"] += 1
+                log_cache_hit(f"insights:{key[0]}:{period} (db)")
+            else:
+                self.stats["stale_hits"] += 1
+                log_cache_hit(f"insights:{key[0]}:{period} (db, stale)")
+                self._refresh_in_background(key, compute)
+
+            return deepcopy(value)
+
+        self.stats["misses"] += 1
+        log_cache_hit(f"insights:{key[0]}:{period}", hit=False)
+        return deepcopy(await self._compute_once(key, compute))
+
+    @property
+    def db(self) -> "FitnessStorage":
+        """Storage backend holding ai_insights."""
+        return self._db if self._db is not None else get_database_service()
+
+    async def _load(self, key: CacheKey) -> Optional[Tuple[Dict, float]]:
+        """Read an entry from ai_insights; returns (value, seconds still fresh)."""
+        try:
+            row = await self.db.get_cached_insights(*key)
+        except Exception as e:
+            log_error(e, "insight cache read")
+            return None
+
+        if not row or not row["expires_at"]:
+            return None
+
+        fresh_for = (row["expires_at"] - datetime.now(timezone.utc)).total_seconds()
+        if fresh_for <= -self.stale_seconds:
+            return None
+
+        return row["insights"], fresh_for
+
+    async def _compute_once(self, key: CacheKey, compute: Compute) -> Dict:
+        """Compute and store a value, sharing one computation per key."""
+        future = self._inflight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+
+        try:
+            value = await compute()
+            future.set_result(value)
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody else may be awaiting; mark the exception as retrieved
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+            # Cancelled before finishing; release anyone awaiting the result
+            if not future.done():
+                future.cancel()
+
+        # Error payloads are returned but never cached
+        if "error" not in value:
+            self._store_local(key, value, self.ttl_seconds)
+            await self._save(key, value)
+
+        return value
+
+    async def _save(self, key: CacheKey, value: Dict):
+        """Write an entry through to ai_insights."""
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl_seconds)
+
+        try:
+            await self.db.save_cached_insights(key[0], key[1], value, expires_at)
+        except Exception as e:
+            log_error(e, "insight cache write")
+
+    def _store_local(self, key: CacheKey, value: Dict, fresh_for: float):
+        """Put an entry in the LRU, evicting the least recently used."""
+        now = time.monotonic()
+        self._local[key] = _Entry(value, now + fresh_for, now + fresh_for + self.stale_seconds)
+        self._local.move_to_end(key)
+
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    def _refresh_in_background(self, key: CacheKey, compute: Compute):
+        """Recompute a stale entry without blocking the caller."""
+        if key in self._inflight:
+            return
+
+        self.stats["refreshes"] += 1
+        task = asyncio.create_task(self._refresh(key, compute))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _refresh(self, key: CacheKey, compute: Compute):
+        """Background refresh body; failures keep serving the stale value."""
+        try:
+            await self._compute_once(key, compute)
+        except Exception as e:
+            logger.warning(f"Insight cache refresh failed for {key}: {e}")
+
+
+# Singleton instance
+_insight_cache: Optional[InsightCache] = None
+
+
+def get_insight_cache() -> InsightCache:
+    """Get insight cache singleton."""
+    global _insight_cache
+    if _insight_cache is None:
+        _insight_cache = InsightCache(
+            ttl_seconds=settings.insight_cache_ttl_seconds,
+            stale_seconds=settings.insight_cache_stale_seconds,
+            max_entries=settings.insight_cache_max_entries
+        )
+    return _insight_cache
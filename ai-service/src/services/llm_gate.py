@@ -0,0 +1,100 @@
+"""
+LLM Concurrency Gate
+
+Caps the number of in-flight LLM calls per process and records how long
+callers wait for a slot.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+from ..config.settings import settings
+from ..utils.logger import logger
+
+
+class LLMGate:
+    """Semaphore-based gate with queue-wait metrics."""
+
+    def __init__(self, max_concurrency: int):
+        """
+        Initialize the gate.
+
+        Args:
+            max_concurrency: Maximum number of concurrent LLM calls
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        self.in_flight = 0
+        self.waiting = 0
+        self.total_acquired = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.last_wait_ms = 0.0
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Acquire a slot for one LLM call.
+
+        Yields:
+            Time spent waiting for the slot, in milliseconds
+        """
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        wait_ms = (time.perf_counter() - start) * 1000
+        self._record_wait(wait_ms)
+
+        self.in_flight += 1
+        try:
+            yield wait_ms
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def _record_wait(self, wait_ms: float):
+        """Record queue wait for one acquired slot."""
+        self.total_acquired += 1
+        self.total_wait_ms += wait_ms
+        self.last_wait_ms = wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+        if wait_ms > 100:
+            logger.debug(f"⏳ LLM gate: waited {wait_ms:.1f}ms for slot | In flight: {self.in_flight}")
+
+    def stats(self) -> Dict:
+        """
+        Get gate metrics.
+
+        Returns:
+            Dictionary with concurrency and queue-wait stats
+        """
+        avg_wait = self.total_wait_ms / self.total_acquired if self.total_acquired else 0
+
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "total_calls": self.total_acquired,
+            "avg_queue_wait_ms": round(avg_wait, 2),
+            "max_queue_wait_ms": round(self.max_wait_ms, 2),
+            "last_queue_wait_ms": round(self.last_wait_ms, 2)
+        }
+
+
+# Singleton instance
+_llm_gate: Optional[LLMGate] = None
+
+
+def get_llm_gate() -> LLMGate:
+    """Get LLM gate singleton."""
+    global _llm_gate
+    if _llm_gate is None:
+        _llm_gate = LLMGate(settings.llm_max_concurrency)
+    return _llm_gate
@@ -0,0 +1,397 @@
+"""
+In-Memory Storage
+
+FitnessStorage backend that serves fixture data from process memory with
+the same return shapes as DatabaseService. Selected with
+STORAGE_BACKEND=memory to load-test the API and analyzers without a
+database, separating Python cost from query cost.
+
+Fixtures are JSON objects (optionally gzipped) keyed by table name, with
+rows using the database column names:
+
+    {
+        "activity_data": [{"userId": "...", "date": "2025-01-01", "steps": 8000, ...}],
+        "heart_rate_data": [{"userId": "...", "date": "2025-01-01", "restingHeartRate": 60}],
+        "user_goals": [{"id": "...", "user_id": "...", "fitnessGoal": "...", ...}]
+    }
+
+Other tables in the fixture are ignored.
+"""
+
+import gzip
+import json
+import uuid
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .daily_series import DailySeries
+from .database_service import _daily_record, _goal_record, _summary_record, _today_record
+from ..config.settings import settings
+from ..utils.logger import logger
+
+# Daily activity query column -> activity_data column
+ACTIVITY_FIELDS = {
+    "steps": "steps",
+    "distance": "distance",
+    "calories": "calories",
+    "active_minutes": "activeMinutes",
+    "floors": "floors",
+    "very_active_minutes": "veryActiveMinutes",
+    "fairly_active_minutes": "fairlyActiveMinutes",
+    "lightly_active_minutes": "lightlyActiveMinutes",
+}
+
+# Goal query column -> user_goals column
+GOAL_FIELDS = {
+    "id": "id",
+    "fitness_goal": "fitnessGoal",
+    "current_weight": "currentWeight",
+    "target_weight": "targetWeight",
+    "height": "height",
+    "current_bmi": "currentBMI",
+    "ideal_bmi": "idealBMI",
+    "age": "age",
+    "gender": "gender",
+    "activity_level": "activityLevel",
+    "daily_steps_goal": "dailyStepsGoal",
+    "daily_calories_burn_goal": "dailyCaloriesBurnGoal",
+    "daily_active_minutes_goal": "dailyActiveMinutesGoal",
+    "daily_sleep_hours_goal": "dailySleepHoursGoal",
+    "weekly_workouts_goal": "weeklyWorkoutsGoal",
+    "ai_recommendations_enabled": "aiRecommendationsEnabled",
+    "ai_recommendations": "aiRecommendations",
+    "created_at": "createdAt",
+    "updated_at": "updatedAt",
+}
+
+
+def load_fixture(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Load a fixture file.
+
+    Args:
+        path: JSON fixture path (gzipped if it ends in .gz)
+
+    Returns:
+        Rows keyed by table name
+    """
+    if path.endswith(".gz"):
+        with gzip.open(path, "rt") as f:
+            return json.load(f)
+
+    with open(path) as f:
+        return json.load(f)
+
+
+def _as_date(value: Any) -> date:
+    """Convert a date, datetime or ISO string to a date."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _now_like(value: datetime) -> datetime:
+    """Current time, timezone-aware only if value is."""
+    return datetime.now(timezone.utc) if value.tzinfo else datetime.now()
+
+
+def _aggregate(rows: Sequence[Mapping[str, Any]]) -> Dict[str, Any]:
+    """Aggregate daily rows like the fitness summary query (SQL NULL semantics)."""
+    def values(field: str) -> List[Any]:
+        return [row[field] for row in rows if row[field] is not None]
+
+    def total(field: str) -> Any:
+        present = values(field)
+        return sum(present) if present else None
+
+    def average(field: str) -> Optional[float]:
+        present = values(field)
+        return sum(present) / len(present) if present else None
+
+    return {
+        "total_days": len(rows),
+        "avg_steps": average("steps"),
+        "total_distance": total("distance"),
+        "total_calories": total("calories"),
+        "total_active_minutes": total("active_minutes"),
+        "avg_heart_rate": average("resting_heart_rate"),
+        "floors_climbed": total("floors"),
+        "days_active": sum(1 for row in rows if row["steps"] is not None and row["steps"] >= 5000)
+    }
+
+
+class InMemoryStorage:
+    """FitnessStorage backed by fixture rows held in memory."""
+
+    def __init__(
+        self,
+        activity_data: Iterable[Mapping[str, Any]] = (),
+        heart_rate_data: Iterable[Mapping[str, Any]] = (),
+        user_goals: Iterable[Mapping[str, Any]] = ()
+    ):
+        """
+        Initialize in-memory storage.
+
+        Args:
+            activity_data: activity_data rows
+            heart_rate_data: heart_rate_data rows
+            user_goals: user_goals rows
+        """
+        heart_rates = {
+            (str(row["userId"]), _as_date(row["date"])): row.get("restingHeartRate")
+            for row in heart_rate_data
+        }
+
+        # Per user: daily activity query rows and their dates, oldest first
+        by_user: Dict[str, Dict[date, Dict[str, Any]]] = {}
+        for row in activity_data:
+            user_id = str(row["userId"])
+            day = _as_date(row["date"])
+            record: Dict[str, Any] = {"date": day}
+            record.update({field: row.get(column) for field, column in ACTIVITY_FIELDS.items()})
+            record["resting_heart_rate"] = heart_rates.get((user_id, day))
+            by_user.setdefault(user_id, {})[day] = record
+
+        self._dates: Dict[str, List[date]] = {}
+        self._rows: Dict[str, List[Dict[str, Any]]] = {}
+        for user_id, days in by_user.items():
+            ordered = sorted(days)
+            self._dates[user_id] = ordered
+            self._rows[user_id] = [days[day] for day in ordered]
+
+        # Latest goal row per user, like USER_GOALS_QUERY
+        self._goals: Dict[str, Dict[str, Any]] = {}
+        for row in user_goals:
+            user_id = str(row["user_id"])
+            goal = {field: row.get(column) for field, column in GOAL_FIELDS.items()}
+            if goal["ai_recommendations"] is not None and not isinstance(goal["ai_recommendations"], str):
+                goal["ai_recommendations"] = json.dumps(goal["ai_recommendations"])
+            current = self._goals.get(user_id)
+            if current is None or str(goal["updated_at"] or "") >= str(current["updated_at"] or ""):
+                self._goals[user_id] = goal
+
+        self._insights: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._research: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def from_fixture(cls, path: Optional[str]) -> "InMemoryStorage":
+        """
+        Create storage from a fixture file.
+
+        Args:
+            path: Fixture path (None for empty storage)
+
+        Returns:
+            InMemoryStorage instance
+        """
+        if not path:
+            logger.warning("STORAGE_FIXTURE_PATH not set, in-memory storage starts empty")
+            return cls()
+
+        tables = load_fixture(path)
+        storage = cls(
+            tables.get("activity_data", ()),
+            tables.get("heart_rate_data", ()),
+            tables.get("user_goals", ())
+        )
+        logger.info(
+            f"In-memory storage loaded {path}: {len(storage._rows)} users, "
+            f"{sum(len(rows) for rows in storage._rows.values())} days"
+        )
+        return storage
+
+    def _range(self, user_id: str, start: date, end: date) -> List[Dict[str, Any]]:
+        """Rows for start <= date <= end, newest first."""
+        dates = self._dates.get(str(user_id))
+        if not dates:
+            return []
+        rows = self._rows[str(user_id)]
+        return rows[bisect_left(dates, start):bisect_right(dates, end)][::-1]
+
+    def _goal(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Latest goal row, with a UUID id typed like asyncpg returns it."""
+        goal = self._goals.get(str(user_id))
+        if goal is None:
+            return None
+
+        # Hand-written fixtures may use any id; only UUID-shaped ones convert
+        try:
+            goal_id = uuid.UUID(str(goal.get("id")))
+        except ValueError:
+            return goal
+        return {**goal, "id": goal_id}
+
+    async def warmup(self):
+        """Nothing to prepare."""
+
+    async def close(self):
+        """Nothing to release."""
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        Get storage statistics in the pool_stats shape.
+
+        Returns:
+            Dictionary with backend name, user and day counts
+        """
+        return {
+            "connected": True,
+            "backend": "memory",
+            "users": len(self._rows),
+            "days": sum(len(rows) for rows in self._rows.values())
+        }
+
+    def statement_stats(self) -> Dict[str, Dict[str, Any]]:
+        """No SQL statements run in memory."""
+        return {}
+
+    async def get_user_fitness_data(
+        self,
+        user_id: str,
+        start_date: datetime,
+        end_date: datetime
+    ) -> List[Dict[str, Any]]:
+        """Daily records for a date range, newest first."""
+        return [_daily_record(row) for row in self._range(user_id, start_date.date(), end_date.date())]
+
+    async def stream_user_fitness_series(
+        self,
+        user_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        chunk_days: Optional[int] = None
+    ) -> AsyncIterator[DailySeries]:
+        """Daily records for a date range in columnar chunks, newest first."""
+        chunk_days = max(1, chunk_days or settings.db_cursor_prefetch)
+        rows = self._range(user_id, start_date.date(), end_date.date())
+        for start in range(0, len(rows), chunk_days):
+            yield DailySeries.from_rows(rows[start:start + chunk_days])
+
+    async def get_fitness_data_for_users(
+        self,
+        user_ids: Sequence[str],
+        start_date: datetime,
+        end_date: datetime,
+        chunk_size: Optional[int] = None
+    ) -> Dict[str, DailySeries]:
+        """Columnar series for many users, keyed by user ID."""
+        start, end = start_date.date(), end_date.date()
+        return {
+            user_id: DailySeries.from_rows(self._range(user_id, start, end))
+            for user_id in dict.fromkeys(str(user_id) for user_id in user_ids)
+        }
+
+    async def get_goals_for_users(
+        self,
+        user_ids: Sequence[str],
+        chunk_size: Optional[int] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Latest goal record for many users, keyed by user ID."""
+        result = {}
+        for user_id in dict.fromkeys(str(user_id) for user_id in user_ids):
+            goal = self._goal(user_id)
+            if goal is not None:
+                result[user_id] = _goal_record(goal)
+        return result
+
+    async def get_fitness_summary(
+        self,
+        user_id: str,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Optional[Dict[str, Any]]:
+        """Aggregated summary for a date range (None if no days)."""
+        return _summary_record(_aggregate(self._range(user_id, start_date.date(), end_date.date())))
+
+    async def get_user_goals(self, user_id: str) -> List[Dict[str, Any]]:
+        """List with the user's latest goal record."""
+        goal = self._goal(user_id)
+        return [_goal_record(goal)] if goal else []
+
+    async def get_today_fitness_data(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Today's record or None."""
+        today = datetime.now().date()
+        rows = self._range(user_id, today, today)
+        return _today_record(rows[0]) if rows else None
+
+    async def get_user_context_bundle(
+        self,
+        user_id: str,
+        windows: Sequence[int] = (7,),
+        daily_days: int = 30
+    ) -> Dict[str, Any]:
+        """Daily rows, window summaries, today's row and goals together."""
+        windows = sorted({int(w) for w in windows})
+        end_date = datetime.now().date()
+        base = self._range(user_id, end_date - timedelta(days=max(windows + [daily_days])), end_date)
+
+        def since(days: int) -> List[Dict[str, Any]]:
+            cutoff = end_date - timedelta(days=days)
+            return [row for row in base if row["date"] >= cutoff]
+
+        # The bundle query returns the goal id as JSON text
+        goal = self._goals.get(str(user_id))
+        today = base[0] if base and base[0]["date"] == end_date else None
+        daily = since(daily_days) if daily_days > 0 else []
+
+        return {
+            "daily": [_daily_record(row) for row in daily],
+            "daily_series": DailySeries.from_rows(daily),
+            "summaries": {days: _summary_record(_aggregate(since(days))) for days in windows},
+            "today": _today_record(today) if today else None,
+            "goals": [_goal_record(goal)] if goal else []
+        }
+
+    async def get_cached_insights(self, user_id: str, period: str) -> Optional[Dict[str, Any]]:
+        """Cached insights for a user and period, or None."""
+        entry = self._insights.get((str(user_id), period))
+        if entry is None:
+            return None
+        return {**entry, "insights": json.loads(entry["insights"])}
+
+    async def save_cached_insights(
+        self,
+        user_id: str,
+        period: str,
+        insights: Dict[str, Any],
+        expires_at: datetime
+    ) -> bool:
+        """Insert or replace cached insights."""
+        self._insights[(str(user_id), period)] = {
+            "insights": json.dumps(insights),
+            "generated_at": _now_like(expires_at),
+            "expires_at": expires_at
+        }
+        return True
+
+    async def get_research_cache(self, query_key: str) -> Optional[Dict[str, Any]]:
+        """Unexpired research cache entry, or None."""
+        entry = self._research.get(query_key)
+        if entry is None or entry["expires_at"] <= _now_like(entry["expires_at"]):
+            return None
+        return {
+            "provider": entry["provider"],
+            "results": json.loads(entry["results"]),
+            "is_error": entry["error"] is not None,
+            "error": entry["error"]
+        }
+
+    async def save_research_cache(
+        self,
+        query_key: str,
+        provider: str,
+        results: List[Dict[str, Any]],
+        error: Optional[str],
+        expires_at: datetime
+    ) -> bool:
+        """Insert or replace a research cache entry."""
+        self._research[query_key] = {
+            "provider": provider,
+            "results": json.dumps(results),
+            "error": error,
+            "expires_at": expires_at
+        }
+        return True
@@ -0,0 +1,137 @@
+"""
+Research Cache
+
+Persistent TTL cache of web search results in the research_cache table.
+Queries are keyed by their canonical form so that equivalent searches share
+an entry. Failed searches are cached too (for a shorter TTL) so a provider
+outage does not turn every plan request into a 10 s timeout.
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from .database_service import get_database_service
+from ..config.settings import settings
+from ..utils.logger import log_cache_hit, log_error
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def canonicalize_query(query: str) -> str:
+    """
+    Normalize a search query into its cache key.
+
+    Args:
+        query: Raw search query
+
+    Returns:
+        Lowercased query with whitespace collapsed
+    """
+    return _WHITESPACE.sub(" ", query).strip().lower()
+
+
+class ResearchCache:
+    """Postgres-backed search result cache with positive and negative TTLs."""
+
+    def __init__(self, ttl_seconds: int = 86400, negative_ttl_seconds: int = 300):
+        """
+        Initialize research cache.
+
+        Args:
+            ttl_seconds: How long successful search results are reused
+            negative_ttl_seconds: How long a failed search is remembered
+        """
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.stats = {"hits": 0, "negative_hits": 0, "misses": 0}
+
+    async def get(self, query: str) -> Optional[Dict]:
+        """
+        Look up an unexpired entry for a query.
+
+        Args:
+            query: Search query (canonicalized internally)
+
+        Returns:
+            Dictionary with results, is_error and error, or None on a miss
+        """
+        key = canonicalize_query(query)
+
+        try:
+            entry = await get_database_service().get_research_cache(key)
+        except Exception as e:
+            log_error(e, "research cache read")
+            entry = None
+
+        if entry is None:
+            self.stats["misses"] += 1
+            log_cache_hit(f"research:{key}", hit=False)
+            return None
+
+        if entry["is_error"]:
+            self.stats["negative_hits"] += 1
+            log_cache_hit(f"research:{key} (negative)")
+        else:
+            self.stats["hits"] += 1
+            log_cache_hit(f"research:{key}")
+
+        return entry
+
+    async def put(self, query: str, provider: str, results: List[Dict]):
+        """
+        Store successful search results.
+
+        Args:
+            query: Search query (canonicalized internally)
+            provider: Search provider that produced the results
+            results: Raw (unfiltered) search results
+        """
+        await self._save(query, provider, results, None, self.ttl_seconds)
+
+    async def put_error(self, query: str, provider: str, error: str):
+        """
+        Remember a failed search for the negative TTL.
+
+        Args:
+            query: Search query (canonicalized internally)
+            provider: Search provider that failed
+            error: Error message to replay on hits
+        """
+        await self._save(query, provider, [], error, self.negative_ttl_seconds)
+
+    async def _save(
+        self,
+        query: str,
+        provider: str,
+        results: List[Dict],
+        error: Optional[str],
+        ttl_seconds: int
+    ):
+        """Write an entry; cache failures never fail the search itself."""
+        if ttl_seconds <= 0:
+            return
+
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)
+
+        try:
+            await get_database_service().save_research_cache(
+                canonicalize_query(query), provider, results, error, expires_at
+            )
+        except Exception as e:
+            log_error(e, "research cache write")
+
+
+# Singleton instance
+_research_cache = None
+
+
+def get_research_cache() -> ResearchCache:
+    """Get research cache singleton."""
+    global _research_cache
+    if _research_cache is None:
+        _research_cache = ResearchCache(
+            ttl_seconds=settings.research_cache_ttl_seconds,
+            negative_ttl_seconds=settings.research_cache_negative_ttl_seconds
+        )
+    return _research_cache
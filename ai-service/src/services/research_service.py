@@ -7,7 +7,8 @@ Used to find latest exercise science, training methods, and fitness research.
 
 from typing import List, Dict, Optional
 import os
-import httpx
+from .http_client import get_http_client
+from .research_cache import get_research_cache
 from ..utils.logger import logger
 
 
@@ -20,6 +21,8 @@ class ResearchService:
         self.google_cx = os.getenv('GOOGLE_SEARCH_CX')
 
         self.has_search = bool(self.serper_api_key or (self.google_api_key and self.google_cx))
+        self.cache = get_research_cache()
+        self.http = get_http_client()
 
     async def search_exercises(
         self,
@@ -56,16 +59,34 @@ class ResearchService:
                 "to enable web research for exercises."
             )
 
+        try:
+            results = await self._search(query)
+            return self._filter_trusted_sources(results)
+        except Exception as e:
+            logger.error(f"Search failed: {e}")
+            raise ValueError(f"Failed to search for exercises: {str(e)}")
+
+    async def _search(self, query: str) -> List[Dict]:
+        """Search with the configured provider, served from the research cache when possible."""
+        cached = await self.cache.get(query)
+        if cached is not None:
+            if cached["is_error"]:
+                raise RuntimeError(f"{cached['error']} (cached failure)")
+            return cached["results"]
+
+        provider = "serper" if self.serper_api_key else "google"
+
         try:
             if self.serper_api_key:
                 results = await self._search_serper(query)
             else:
                 results = await self._search_google(query)
-
-            return self._filter_trusted_sources(results)
         except Exception as e:
-            logger.error(f"Search failed: {e}")
-            raise ValueError(f"Failed to search for exercises: {str(e)}")
+            await self.cache.put_error(query, provider, str(e))
+            raise
+
+        await self.cache.put(query, provider, results)
+        return results
 
     async def _search_serper(self, query: str) -> List[Dict]:
         """Search using Serper API."""
@@ -76,10 +97,9 @@ class ResearchService:
         }
         payload = {"q": query, "num": 10}
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, json=payload, headers=headers, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
+        response = await self.http.post(url, json=payload, headers=headers, timeout=10.0)
+        response.raise_for_status()
+        data = response.json()
 
         results = []
         for item in data.get('organic', []):
@@ -103,10 +123,9 @@ class ResearchService:
             'num': 10
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
+        response = await self.http.get(url, params=params, timeout=10.0)
+        response.raise_for_status()
+        data = response.json()
 
         results = []
         for item in data.get('items', []):
@@ -166,11 +185,7 @@ class ResearchService:
 
         if self.has_search:
             try:
-                if self.serper_api_key:
-                    results = await self._search_serper(query)
-                else:
-                    results = await self._search_google(query)
-
+                results = await self._search(query)
                 return self._filter_trusted_sources(results)
             except Exception as e:
                 logger.error(f"Research failed: {e}")
@@ -0,0 +1,189 @@
+"""
+Response Cache
+
+In-process LRU with TTL for chat replies. Entries are keyed by the user, a
+normalized form of the message and a fingerprint of the data the reply was
+generated from, so a repeated question is answered from cache only while
+the user's data (summary, goals, trend values, ...) is unchanged.
+"""
+
+import hashlib
+import json
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config.settings import settings
+from ..utils.logger import log_cache_hit
+
+CacheKey = Tuple[str, str, str]
+
+_PUNCTUATION = re.compile(r"[^\w\s']+")
+_WHITESPACE = re.compile(r"\s+")
+
+# Raw rows behind derived context views; the views themselves are fingerprinted
+FINGERPRINT_EXCLUDE = {"daily_data"}
+
+# Fields stamped with the request time (e.g. a summary's period bounds from
+# datetime.now()); they differ on every load and never reach the prompt
+VOLATILE_FIELDS = {"start_date", "end_date"}
+
+# Messages of history that reach the prompt
+HISTORY_MESSAGES = 5
+
+
+def normalize_message(message: str) -> str:
+    """
+    Normalize a chat message into its cache key form.
+
+    Args:
+        message: Raw user message
+
+    Returns:
+        Lowercased message without punctuation, whitespace collapsed
+    """
+    return _WHITESPACE.sub(" ", _PUNCTUATION.sub(" ", message.lower())).strip()
+
+
+def context_fingerprint(context: Dict[str, Any], conversation_history: Optional[List[Dict]] = None) -> str:
+    """
+    Hash the context and recent history a reply is generated from.
+
+    Args:
+        context: Context dictionary from _build_context
+        conversation_history: Previous messages
+
+    Returns:
+        Hex digest; equal for equal prompt inputs
+    """
+    visible = {key: _stable(value) for key, value in context.items() if key not in FINGERPRINT_EXCLUDE}
+    history = [
+        (msg.get("role"), msg.get("content"))
+        for msg in (conversation_history or [])[-HISTORY_MESSAGES:]
+    ]
+    payload = json.dumps([visible, history], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _stable(value: Any) -> Any:
+    """Copy of a context value without VOLATILE_FIELDS at any depth."""
+    if isinstance(value, dict):
+        return {key: _stable(item) for key, item in value.items() if key not in VOLATILE_FIELDS}
+    if isinstance(value, list):
+        return [_stable(item) for item in value]
+    return value
+
+
+class _Entry:
+    """Cached reply with its monotonic expiry."""
+
+    __slots__ = ("value", "expires_at")
+
+    def __init__(self, value: Dict, expires_at: float):
+        self.value = value
+        self.expires_at = expires_at
+
+
+class ResponseCache:
+    """TTL + LRU cache of chat replies keyed by message and context."""
+
+    def __init__(self, ttl_seconds: int = 600, max_entries: int = 2048):
+        """
+        Initialize response cache.
+
+        Args:
+            ttl_seconds: How long a reply may be reused
+            max_entries: Maximum cached replies before LRU eviction
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def key(
+        self,
+        user_id: str,
+        message: str,
+        context: Dict[str, Any],
+        conversation_history: Optional[List[Dict]] = None
+    ) -> CacheKey:
+        """
+        Build the cache key for a chat turn.
+
+        Args:
+            user_id: User's ID
+            message: User's message
+            context: Context dictionary from _build_context
+            conversation_history: Previous messages
+
+        Returns:
+            (user ID, normalized message, context fingerprint)
+        """
+        return (str(user_id), normalize_message(message), context_fingerprint(context, conversation_history))
+
+    def get(self, key: CacheKey) -> Optional[Dict]:
+        """
+        Get a cached reply.
+
+        Args:
+            key: Key from key()
+
+        Returns:
+            Copy of the cached reply, or None on a miss or expired entry
+        """
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() < entry.expires_at:
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            log_cache_hit(f"chat:{key[0]}:{key[1][:40]}")
+            return {name: list(value) if isinstance(value, list) else value for name, value in entry.value.items()}
+
+        if entry is not None:
+            del self._entries[key]
+
+        self.stats["misses"] += 1
+        log_cache_hit(f"chat:{key[0]}:{key[1][:40]}", hit=False)
+        return None
+
+    def put(self, key: CacheKey, value: Dict):
+        """
+        Cache a reply, evicting the least recently used beyond max_entries.
+
+        Args:
+            key: Key from key()
+            value: Reply dictionary (without per-request fields)
+        """
+        self._entries[key] = _Entry(value, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def invalidate(self, user_id: str):
+        """
+        Drop every cached reply for a user.
+
+        Args:
+            user_id: User's ID
+        """
+        for key in [key for key in self._entries if key[0] == str(user_id)]:
+            del self._entries[key]
+
+
+# Singleton instance
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get response cache singleton."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache(
+            ttl_seconds=settings.response_cache_ttl_seconds,
+            max_entries=settings.response_cache_max_entries
+        )
+    return _response_cache
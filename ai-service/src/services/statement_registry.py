@@ -0,0 +1,274 @@
+"""
+Statement Registry
+
+Named SQL statements prepared once per pooled connection when it opens,
+with execution counts, latency histograms and row counts tracked per
+statement, and a slow-query log with optional sampled plan capture.
+"""
+
+import math
+import random
+import time
+from bisect import bisect_left
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional
+
+import asyncpg  # type: ignore
+
+from ..utils.logger import log_database_query, log_slow_query, logger
+
+# Histogram bucket upper bounds in ms; one more open-ended bucket follows
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with percentile estimates."""
+
+    __slots__ = ("counts", "count", "max_ms")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.max_ms = 0.0
+
+    def observe(self, elapsed_ms: float):
+        """Record one observation."""
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        self.count += 1
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimate a percentile as the upper bound of its bucket.
+
+        Args:
+            q: Percentile between 0 and 100
+
+        Returns:
+            Estimated latency in ms (capped at the observed maximum)
+        """
+        if not self.count:
+            return 0.0
+
+        rank = max(1, math.ceil(self.count * q / 100))
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(float(bound), self.max_ms)
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Percentiles and bucket counts as a JSON-friendly dictionary."""
+        labels = [f"le_{bound}" for bound in LATENCY_BUCKETS_MS] + ["gt_" + str(LATENCY_BUCKETS_MS[-1])]
+        return {
+            "p50_ms": round(self.percentile(50), 2),
+            "p95_ms": round(self.percentile(95), 2),
+            "p99_ms": round(self.percentile(99), 2),
+            "max_ms": round(self.max_ms, 2),
+            "buckets": {label: count for label, count in zip(labels, self.counts) if count}
+        }
+
+
+class StatementStats:
+    """Execution counters for one named statement."""
+
+    __slots__ = ("calls", "errors", "rows", "slow", "total_ms", "histogram", "last_error")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.slow = 0
+        self.total_ms = 0.0
+        self.histogram = LatencyHistogram()
+        self.last_error: Optional[str] = None
+
+    def record(self, elapsed_ms: float, rows: int = 0, error: Optional[Exception] = None):
+        """Record one execution."""
+        self.calls += 1
+        self.rows += rows
+        self.total_ms += elapsed_ms
+        self.histogram.observe(elapsed_ms)
+        if error is not None:
+            self.errors += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Counters as a JSON-friendly dictionary."""
+        latency = self.histogram.to_dict()
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "slow": self.slow,
+            "rows": self.rows,
+            "avg_rows": round(self.rows / self.calls, 1) if self.calls else 0.0,
+            "avg_ms": round(self.total_ms / self.calls, 2) if self.calls else 0.0,
+            "p50_ms": latency["p50_ms"],
+            "p95_ms": latency["p95_ms"],
+            "p99_ms": latency["p99_ms"],
+            "max_ms": latency["max_ms"],
+            "total_ms": round(self.total_ms, 2),
+            "histogram": latency["buckets"],
+            "last_error": self.last_error
+        }
+
+
+def _row_count(result: Any) -> int:
+    """Rows returned or affected by a fetch, fetchrow or execute result."""
+    if result is None:
+        return 0
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, str):
+        # Command status such as "INSERT 0 1" or "UPDATE 3"
+        count = result.rsplit(" ", 1)[-1]
+        return int(count) if count.isdigit() else 0
+    return 1
+
+
+class StatementRegistry:
+    """Prepares named statements per connection and runs them by name."""
+
+    def __init__(
+        self,
+        statements: Mapping[str, str],
+        slow_query_ms: Optional[float] = None,
+        explain_sample_rate: float = 0.0
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            statements: SQL text keyed by statement name
+            slow_query_ms: Log executions slower than this (None to disable)
+            explain_sample_rate: Fraction of slow executions (0-1) re-run
+                under EXPLAIN (ANALYZE, BUFFERS) to capture their plan
+        """
+        self.statements = dict(statements)
+        self.stats = {name: StatementStats() for name in self.statements}
+        self.slow_query_ms = slow_query_ms
+        self.explain_sample_rate = explain_sample_rate
+
+    async def prepare_all(self, conn: asyncpg.Connection):
+        """
+        Prepare every registered statement on a new connection.
+
+        Used as the pool's `init` callback. asyncpg keeps prepared
+        statements in a per-connection cache keyed by SQL text, and that
+        cache (unlike PreparedStatement objects) survives pool releases;
+        the pool disables its idle expiry (max_cached_statement_lifetime=0)
+        so entries last as long as the connection. An empty executemany()
+        batch parses and plans the statement into that cache without
+        executing anything, so later calls skip the parse step.
+        A statement that fails to prepare (e.g. its table is not migrated
+        yet) is skipped and prepared on first use instead.
+
+        Args:
+            conn: Newly opened connection
+        """
+        for name, sql in self.statements.items():
+            try:
+                await conn.executemany(sql, [])
+            except Exception as e:
+                logger.warning(f"Could not prepare statement '{name}': {e}")
+
+    async def fetch(self, conn: asyncpg.Connection, name: str, *args: Any) -> List[asyncpg.Record]:
+        """Run a named statement and return all rows."""
+        return await self._run(conn, "fetch", name, args)
+
+    async def fetchrow(self, conn: asyncpg.Connection, name: str, *args: Any) -> Optional[asyncpg.Record]:
+        """Run a named statement and return the first row."""
+        return await self._run(conn, "fetchrow", name, args)
+
+    async def execute(self, conn: asyncpg.Connection, name: str, *args: Any) -> str:
+        """Run a named statement for its side effects."""
+        return await self._run(conn, "execute", name, args)
+
+    async def cursor(
+        self,
+        conn: asyncpg.Connection,
+        name: str,
+        *args: Any,
+        prefetch: int = 500
+    ) -> AsyncIterator[asyncpg.Record]:
+        """
+        Iterate a named statement's rows through a server-side cursor.
+
+        Must run inside a transaction. The recorded latency covers the
+        whole iteration, including time spent by the consumer, so slow
+        cursors are logged without a captured plan.
+        """
+        start = time.perf_counter()
+        rows = 0
+        error = None
+        try:
+            async for row in conn.cursor(self.statements[name], *args, prefetch=prefetch):
+                rows += 1
+                yield row
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.stats[name].record(elapsed_ms, rows, error)
+            log_database_query(name, duration_ms=elapsed_ms, rows=rows)
+            if self._is_slow(name, elapsed_ms):
+                log_slow_query(name, elapsed_ms, rows)
+
+    def stats_dict(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-statement execution statistics.
+
+        Returns:
+            Counters keyed by statement name, busiest first
+        """
+        ordered = sorted(self.stats.items(), key=lambda item: item[1].total_ms, reverse=True)
+        return {name: stats.to_dict() for name, stats in ordered}
+
+    async def _run(self, conn: asyncpg.Connection, method: str, name: str, args: tuple) -> Any:
+        """Execute a named statement, record its latency and log it if slow."""
+        start = time.perf_counter()
+        try:
+            result = await getattr(conn, method)(self.statements[name], *args)
+        except Exception as e:
+            self.stats[name].record((time.perf_counter() - start) * 1000, error=e)
+            raise
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        rows = _row_count(result)
+        self.stats[name].record(elapsed_ms, rows)
+        log_database_query(name, duration_ms=elapsed_ms, rows=rows)
+
+        if self._is_slow(name, elapsed_ms):
+            plan = None
+            if self.explain_sample_rate > 0 and random.random() < self.explain_sample_rate:
+                plan = await self._explain(conn, name, args)
+            log_slow_query(name, elapsed_ms, rows, plan)
+
+        return result
+
+    def _is_slow(self, name: str, elapsed_ms: float) -> bool:
+        """Check an execution against the slow-query threshold."""
+        if self.slow_query_ms is None or elapsed_ms < self.slow_query_ms:
+            return False
+        self.stats[name].slow += 1
+        return True
+
+    async def _explain(self, conn: asyncpg.Connection, name: str, args: tuple) -> Optional[str]:
+        """
+        Capture a statement's plan with EXPLAIN (ANALYZE, BUFFERS).
+
+        ANALYZE executes the statement again, so it runs inside a
+        transaction (a savepoint if one is already open) that is always
+        rolled back, leaving writes from the re-run undone.
+        """
+        transaction = conn.transaction()
+        await transaction.start()
+        try:
+            rows = await conn.fetch(f"EXPLAIN (ANALYZE, BUFFERS) {self.statements[name]}", *args)
+            return "\n".join(row[0] for row in rows)
+        except Exception as e:
+            logger.warning(f"Could not capture plan for '{name}': {e}")
+            return None
+        finally:
+            await transaction.rollback()
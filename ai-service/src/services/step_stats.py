@@ -0,0 +1,158 @@
+"""
+Step Statistics Engine
+
+Vectorized NumPy computation of the step statistics used by
+FitnessAnalyzer.analyze_patterns. Works on a 2-D users x days matrix so a
+whole cohort is analyzed in a handful of array operations; a single user
+is just a one-row matrix.
+
+Zero entries mean "no steps recorded" and are excluded, matching the
+list-based analyzer which skips falsy step values. Row order is the order
+the days were loaded in (the half-split trend depends on it).
+"""
+
+import statistics
+from typing import Dict
+import numpy as np
+
+STEP_GOAL = 10000
+
+# Flag rows whose derived outputs could change within +/-1 ulp of stdev
+_BOUNDARY_EPS = 1e-9
+
+
+def compute_step_stats(steps: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Compute step statistics for every row of a users x days matrix.
+
+    Args:
+        steps: Integer array of shape (users, days) or (days,)
+
+    Returns:
+        Dictionary of per-user arrays: days_analyzed, average, median,
+        min, max, std_dev, consistency, days_hit_goal, first_half_avg and
+        second_half_avg (the half averages are NaN with fewer than 7 days)
+    """
+    steps = np.atleast_2d(np.asarray(steps, dtype=np.int64))
+    if steps.shape[1] == 0:
+        # No days at all: one empty column keeps the indexing below simple
+        steps = np.zeros((steps.shape[0], 1), dtype=np.int64)
+    users, days = steps.shape
+
+    mask = steps != 0
+    n = mask.sum(axis=1)
+    safe_n = np.maximum(n, 1)
+
+    # Unrecorded days are zero, so plain sums already skip them
+    total = steps.sum(axis=1)
+    total_sq = (steps * steps).sum(axis=1)
+
+    # Exact integer sums, so mean is correctly rounded like statistics.mean
+    average = total / safe_n
+
+    # Sample std dev from exact integer sum of squares
+    ss = n * total_sq - total * total
+    denominator = np.maximum(n * (n - 1), 1)
+    std_dev = np.where(n > 1, np.sqrt(ss / denominator), 0.0)
+
+    # Min / max / median over recorded days only
+    big = np.iinfo(np.int64).max
+    ordered = np.sort(np.where(mask, steps, big), axis=1)
+    rows = np.arange(users)
+
+    mid_low = np.where(n > 0, ordered[rows, np.clip((n - 1) // 2, 0, days - 1)], 0)
+    mid_high = np.where(n > 0, ordered[rows, np.clip(n // 2, 0, days - 1)], 0)
+    median = np.where(n % 2 == 1, mid_low, (mid_low + mid_high) / 2)
+
+    minimum = np.where(n > 0, ordered[:, 0], 0)
+    maximum = np.where(n > 0, np.where(mask, steps, 0).max(axis=1), 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(average > 0, std_dev / average * 100, 100)
+    consistency = 100 - np.minimum(ratio, 100)
+
+    # Split recorded days into halves by their position among recorded days
+    rank = np.cumsum(mask, axis=1) - 1
+    half = (n // 2)[:, None]
+    first_total = np.where(mask & (rank < half), steps, 0).sum(axis=1)
+    second_total = np.where(mask & (rank >= half), steps, 0).sum(axis=1)
+    has_halves = n >= 7
+    first_half_avg = np.where(has_halves, first_total / np.maximum(n // 2, 1), np.nan)
+    second_half_avg = np.where(has_halves, second_total / np.maximum(n - n // 2, 1), np.nan)
+
+    days_hit_goal = (mask & (steps >= STEP_GOAL)).sum(axis=1)
+
+    stats = {
+        "days_analyzed": n,
+        "average": average,
+        "median": median,
+        "min": minimum,
+        "max": maximum,
+        "std_dev": std_dev,
+        "consistency": consistency,
+        "days_hit_goal": days_hit_goal,
+        "first_half_avg": first_half_avg,
+        "second_half_avg": second_half_avg,
+    }
+
+    _correct_std_dev(stats, steps, mask)
+
+    return stats
+
+
+def _correct_std_dev(stats: Dict[str, np.ndarray], steps: np.ndarray, mask: np.ndarray):
+    """
+    Make std_dev bit-identical to statistics.stdev where it matters.
+
+    The float sqrt can be 1 ulp away from the correctly rounded value
+    statistics.stdev returns. That only changes the output when a derived
+    value (int std dev, rounded consistency, thresholds) sits on a boundary,
+    so only those rows are recomputed exactly.
+    """
+    std_dev = stats["std_dev"]
+    average = stats["average"]
+
+    low = np.nextafter(std_dev, -np.inf)
+    high = np.nextafter(std_dev, np.inf)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        c_low = 100 - np.minimum(high / average * 100, 100)
+        c_high = 100 - np.minimum(low / average * 100, 100)
+
+    ambiguous = (
+        (np.floor(low) != np.floor(high))
+        | ((low > 3000) != (high > 3000))
+        | (np.floor(c_low * 20 - _BOUNDARY_EPS) != np.floor(c_high * 20 + _BOUNDARY_EPS))
+    ) & (stats["days_analyzed"] > 1)
+
+    for row in np.flatnonzero(ambiguous):
+        values = steps[row][mask[row]].tolist()
+        exact = statistics.stdev(values)
+        std_dev[row] = exact
+        stats["consistency"][row] = 100 - min(exact / average[row] * 100, 100)
+
+
+def stats_to_dict(stats: Dict[str, np.ndarray], row: int = 0) -> Dict:
+    """
+    Render one user's statistics as the analyze_patterns "stats" dict.
+
+    Args:
+        stats: Output of compute_step_stats
+        row: User row index
+
+    Returns:
+        Stats dictionary (empty if the user has no recorded steps)
+    """
+    if stats["days_analyzed"][row] == 0:
+        return {}
+
+    return {
+        "average": int(stats["average"][row]),
+        "median": int(stats["median"][row]),
+        "min": int(stats["min"][row]),
+        "max": int(stats["max"][row]),
+        "std_dev": int(stats["std_dev"][row]),
+        "consistency": round(float(stats["consistency"][row]), 1),
+        "days_analyzed": int(stats["days_analyzed"][row]),
+        "days_hit_goal": int(stats["days_hit_goal"][row])
+    }
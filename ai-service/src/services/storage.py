@@ -0,0 +1,125 @@
+"""
+Fitness Storage
+
+Interface implemented by the storage backends behind get_database_service():
+DatabaseService (PostgreSQL via asyncpg) and InMemoryStorage (fixture data
+held in process, for load tests and benchmarks without a database).
+"""
+
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Protocol, Sequence, runtime_checkable
+
+from .daily_series import DailySeries
+
+
+@runtime_checkable
+class FitnessStorage(Protocol):
+    """Data access used by the agent, tools, caches and health routes."""
+
+    async def warmup(self):
+        """Prepare the backend before the service reports ready."""
+        ...
+
+    async def close(self):
+        """Release backend resources."""
+        ...
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Backend connection statistics ("connected" is always present)."""
+        ...
+
+    def statement_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-query execution statistics."""
+        ...
+
+    async def get_user_fitness_data(
+        self,
+        user_id: str,
+        start_date: datetime,
+        end_date: datetime
+    ) -> List[Dict[str, Any]]:
+        """Daily records for a date range, newest first."""
+        ...
+
+    def stream_user_fitness_series(
+        self,
+        user_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        chunk_days: Optional[int] = None
+    ) -> AsyncIterator[DailySeries]:
+        """Daily records for a date range in columnar chunks, newest first."""
+        ...
+
+    async def get_fitness_data_for_users(
+        self,
+        user_ids: Sequence[str],
+        start_date: datetime,
+        end_date: datetime,
+        chunk_size: Optional[int] = None
+    ) -> Dict[str, DailySeries]:
+        """Columnar series for many users, keyed by user ID."""
+        ...
+
+    async def get_goals_for_users(
+        self,
+        user_ids: Sequence[str],
+        chunk_size: Optional[int] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Latest goal record for many users, keyed by user ID."""
+        ...
+
+    async def get_fitness_summary(
+        self,
+        user_id: str,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Optional[Dict[str, Any]]:
+        """Aggregated summary for a date range (None if no days)."""
+        ...
+
+    async def get_user_goals(self, user_id: str) -> List[Dict[str, Any]]:
+        """List with the user's latest goal record."""
+        ...
+
+    async def get_today_fitness_data(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Today's record or None."""
+        ...
+
+    async def get_user_context_bundle(
+        self,
+        user_id: str,
+        windows: Sequence[int] = (7,),
+        daily_days: int = 30
+    ) -> Dict[str, Any]:
+        """Daily rows (also as "daily_series"), window summaries, today's row and goals together ("error": True on failure)."""
+        ...
+
+    async def get_cached_insights(self, user_id: str, period: str) -> Optional[Dict[str, Any]]:
+        """Cached insights for a user and period, or None."""
+        ...
+
+    async def save_cached_insights(
+        self,
+        user_id: str,
+        period: str,
+        insights: Dict[str, Any],
+        expires_at: datetime
+    ) -> bool:
+        """Insert or replace cached insights."""
+        ...
+
+    async def get_research_cache(self, query_key: str) -> Optional[Dict[str, Any]]:
+        """Unexpired research cache entry, or None."""
+        ...
+
+    async def save_research_cache(
+        self,
+        query_key: str,
+        provider: str,
+        results: List[Dict[str, Any]],
+        error: Optional[str],
+        expires_at: datetime
+    ) -> bool:
+        """Insert or replace a research cache entry."""
+        ...
@@ -0,0 +1,224 @@
+"""
+Streaming Statistics
+
+Single-pass accumulators over DailySeries chunks, for histories too long to
+load at once. Memory stays flat in the number of days: only running sums,
+per-weekday totals and a step-count histogram are kept. The histogram covers
+0 to HISTOGRAM_MAX_STEPS; negative or implausibly large (corrupt) values
+are counted separately, so one bad row can't blow up its size.
+
+Chunks must arrive newest day first, as yielded by
+DatabaseService.stream_user_fitness_series.
+"""
+
+import math
+from collections import Counter
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .daily_series import DAY_NAMES, DailySeries
+from .step_stats import STEP_GOAL
+
+# Upper bound (exclusive) of the dense step-count histogram
+HISTOGRAM_MAX_STEPS = 100_000
+
+
+class StreamingAccumulator:
+    """Running step statistics, streak and weekday averages."""
+
+    def __init__(self, goal_steps: int = STEP_GOAL):
+        """
+        Initialize accumulator.
+
+        Args:
+            goal_steps: Daily step goal for the streak
+        """
+        self.goal_steps = goal_steps
+
+        # Step stats over recorded (non-zero) days; Python ints stay exact
+        self.days = 0
+        self.recorded = 0
+        self.total = 0
+        self.total_sq = 0
+        self.minimum: Optional[int] = None
+        self.maximum: Optional[int] = None
+        self.days_hit_step_goal = 0
+        self._histogram = np.zeros(0, dtype=np.int64)
+        self._outliers: Counter = Counter()
+
+        # Streak over all days, newest first
+        self.current_streak = 0
+        self.best_streak = 0
+        self.days_hit_goal = 0
+        self._run = 0
+        self._current_open = True
+
+        # Weekday averages over all days
+        self._weekday_steps = np.zeros(7, dtype=np.int64)
+        self._weekday_days = np.zeros(7, dtype=np.int64)
+        self._weekday_order: List[int] = []
+
+        # Calories and distance over days with values recorded
+        self._calorie_total = 0
+        self._calorie_days = 0
+        self._distance_total = 0.0
+        self._distance_days = 0
+
+    def update(self, chunk: DailySeries):
+        """
+        Fold one chunk of days into the running totals.
+
+        Args:
+            chunk: Next days of the history (date DESC)
+        """
+        if not chunk:
+            return
+
+        steps = chunk.steps
+        self.days += len(chunk)
+
+        recorded = steps[steps != 0]
+        if recorded.size:
+            self.recorded += int(recorded.size)
+            self.total += int(recorded.sum())
+            self.total_sq += int((recorded * recorded).sum())
+            low, high = int(recorded.min()), int(recorded.max())
+            self.minimum = low if self.minimum is None else min(self.minimum, low)
+            self.maximum = high if self.maximum is None else max(self.maximum, high)
+            self.days_hit_step_goal += int((recorded >= STEP_GOAL).sum())
+
+            in_range = (recorded > 0) & (recorded < HISTOGRAM_MAX_STEPS)
+            if not in_range.all():
+                self._outliers.update(recorded[~in_range].tolist())
+
+            counts = np.bincount(recorded[in_range], minlength=1)
+            if counts.size > self._histogram.size:
+                counts[:self._histogram.size] += self._histogram
+                self._histogram = counts
+            else:
+                self._histogram[:counts.size] += counts
+
+        for hit in (steps >= self.goal_steps).tolist():
+            if hit:
+                self._run += 1
+                self.days_hit_goal += 1
+                self.best_streak = max(self.best_streak, self._run)
+            else:
+                self._run = 0
+                self._current_open = False
+            if self._current_open:
+                self.current_streak = self._run
+
+        weekdays = chunk.weekdays()
+        for weekday in dict.fromkeys(weekdays.tolist()):
+            if not self._weekday_days[weekday]:
+                self._weekday_order.append(weekday)
+        self._weekday_steps += np.bincount(weekdays, weights=steps, minlength=7).astype(np.int64)
+        self._weekday_days += np.bincount(weekdays, minlength=7)
+
+        calories = chunk.calories[chunk.calories != 0]
+        self._calorie_total += int(calories.sum())
+        self._calorie_days += int(calories.size)
+
+        distance = chunk.distance[chunk.distance != 0]
+        self._distance_total += float(distance.sum())
+        self._distance_days += int(distance.size)
+
+    def stats(self) -> Dict:
+        """
+        Step statistics in the analyze_patterns "stats" format.
+
+        The half-split trend needs the day count up front and is not
+        available in a single pass.
+
+        Returns:
+            Stats dictionary (empty if no steps were recorded)
+        """
+        n = self.recorded
+        if not n:
+            return {}
+
+        average = self.total / n
+        std_dev = math.sqrt((n * self.total_sq - self.total * self.total) / (n * (n - 1))) if n > 1 else 0.0
+        consistency = 100 - min(std_dev / average * 100, 100) if average > 0 else 0
+
+        return {
+            "average": int(average),
+            "median": int(self._median()),
+            "min": self.minimum,
+            "max": self.maximum,
+            "std_dev": int(std_dev),
+            "consistency": round(consistency, 1),
+            "days_analyzed": n,
+            "days_hit_goal": self.days_hit_step_goal
+        }
+
+    def streak(self) -> Dict:
+        """
+        Streak summary in the calculate_weekly_streak format.
+
+        Returns:
+            Dictionary with current streak, best streak, and streak info
+        """
+        percentage = (self.days_hit_goal / self.days * 100) if self.days else 0
+
+        return {
+            "current_streak": self.current_streak,
+            "best_streak": self.best_streak,
+            "days_hit_goal": self.days_hit_goal,
+            "total_days": self.days,
+            "percentage": round(percentage, 1)
+        }
+
+    def best_day(self) -> Optional[str]:
+        """Weekday with the highest average steps (None with no days)."""
+        if not self._weekday_order:
+            return None
+
+        best = max(
+            self._weekday_order,
+            key=lambda day: self._weekday_steps[day] / self._weekday_days[day]
+        )
+        return DAY_NAMES[best]
+
+    def calorie_average(self) -> Optional[float]:
+        """Average calories over days with calories recorded (None if none)."""
+        return self._calorie_total / self._calorie_days if self._calorie_days else None
+
+    def total_distance(self) -> Optional[float]:
+        """Total distance over days with distance recorded (None if none)."""
+        return self._distance_total if self._distance_days else None
+
+    def _median(self) -> float:
+        """Median of recorded step values from the histogram and outliers."""
+        n = self.recorded
+        low = self._kth((n - 1) // 2)
+        high = self._kth(n // 2)
+        return low if n % 2 else (low + high) / 2
+
+    def _kth(self, k: int) -> int:
+        """k-th smallest recorded step value (0-based)."""
+        outliers = sorted(self._outliers.items())
+
+        for value, count in outliers:
+            if value >= 0:
+                break
+            if k < count:
+                return value
+            k -= count
+
+        cumulative = np.cumsum(self._histogram)
+        in_range = int(cumulative[-1]) if cumulative.size else 0
+        if k < in_range:
+            return int(np.searchsorted(cumulative, k + 1))
+        k -= in_range
+
+        for value, count in outliers:
+            if value < 0:
+                continue
+            if k < count:
+                return value
+            k -= count
+
+        raise IndexError("k out of range")
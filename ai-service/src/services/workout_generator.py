@@ -15,8 +15,8 @@ from .research_service import ResearchService
 class WorkoutGenerator:
     """Generates intelligent, personalized workout plans."""
 
-    def __init__(self):
-        self.research_service = ResearchService()
+    def __init__(self, research_service: Optional[ResearchService] = None):
+        self.research_service = research_service or ResearchService()
 
     async def generate_workout_plan(
         self,
@@ -6,7 +6,7 @@ Provides structured logging with different levels and formatting.
 
 import logging
 import sys
-from typing import Optional
+from typing import Dict, Iterable, Optional
 from datetime import datetime
 from ..config.settings import settings
 
@@ -90,6 +90,9 @@ def setup_logger(
 # Create default logger
 logger = setup_logger('ai-service')
 
+# Slow-query log, optionally also written to its own file
+slow_query_logger = setup_logger('ai-service-slow-query', log_file=settings.db_slow_query_log_file)
+
 
 def log_request(user_id: int, endpoint: str, method: str = "POST"):
     """Log incoming API request."""
@@ -126,10 +129,36 @@ def log_error(error: Exception, context: Optional[str] = None):
     logger.error(f"❌ Error: {type(error).__name__}: {str(error)}{context_str}", exc_info=True)
 
 
-def log_database_query(query_type: str, table: str, user_id: Optional[int] = None):
+def log_database_query(
+    query_type: str,
+    table: Optional[str] = None,
+    user_id: Optional[int] = None,
+    duration_ms: Optional[float] = None,
+    rows: Optional[int] = None
+):
     """Log database queries."""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    table_str = f" {table}" if table else ""
     user_str = f" | User: {user_id}" if user_id else ""
-    logger.debug(f"💾 DB Query: {query_type} {table}{user_str}")
+    rows_str = f" | Rows: {rows}" if rows is not None else ""
+    duration_str = f" | Duration: {duration_ms:.2f}ms" if duration_ms is not None else ""
+    logger.debug(f"💾 DB Query: {query_type}{table_str}{user_str}{rows_str}{duration_str}")
+
+
+def log_slow_query(name: str, duration_ms: float, rows: int, plan: Optional[str] = None):
+    """Log a query over the slow-query threshold, with its plan if captured."""
+    plan_str = f"\n{plan}" if plan else ""
+    slow_query_logger.warning(f"🐢 Slow query: {name} | Rows: {rows} | Duration: {duration_ms:.2f}ms{plan_str}")
+
+
+def log_prompt_tokens(total: int, max_tokens: int, sections: Dict[str, int], trimmed: Iterable[str] = ()):
+    """Log the token breakdown of an assembled prompt."""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    sections_str = ", ".join(f"{name}={tokens}" for name, tokens in sections.items())
+    trimmed_str = f" | Trimmed: {', '.join(trimmed)}" if trimmed else ""
+    logger.debug(f"📝 Prompt: {total}/{max_tokens} tokens | {sections_str}{trimmed_str}")
 
 
 def log_cache_hit(key: str, hit: bool = True):
@@ -149,5 +178,7 @@ __all__ = [
     'log_research',
     'log_error',
     'log_database_query',
+    'log_slow_query',
+    'log_prompt_tokens',
     'log_cache_hit',
 ]
@@ -0,0 +1,19 @@
+"""Shared test fixtures."""
+
+import pytest
+
+from src.services.memory_storage import InMemoryStorage
+
+
+class FailingStorage(InMemoryStorage):
+    """Storage whose bundle query fails like DatabaseService's does."""
+
+    async def get_user_context_bundle(self, user_id, windows=(7,), daily_days=30):
+        bundle = await super().get_user_context_bundle(user_id, windows, daily_days)
+        return {**bundle, "error": True}
+
+
+@pytest.fixture
+def failing_storage():
+    """InMemoryStorage subclass whose bundle query reports a failure."""
+    return FailingStorage
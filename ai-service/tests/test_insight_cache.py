@@ -0,0 +1,69 @@
+"""Tests for the insight cache."""
+
+import asyncio
+
+import pytest
+
+from src.agent.fitness_coach import FitnessCoachAgent
+from src.agent.tools.fitness_data_tools import FitnessDataTools
+from src.services.insight_cache import InsightCache
+from src.services.memory_storage import InMemoryStorage
+
+USER_ID = "user-1"
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    """Agent with a fake API key; tests plug in their own tools and cache."""
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    return FitnessCoachAgent()
+
+
+@pytest.mark.asyncio
+async def test_failed_data_is_not_cached(agent, failing_storage):
+    storage = failing_storage()
+    agent.fitness_tools = FitnessDataTools(storage)
+    agent.insight_cache = InsightCache(db=storage)
+
+    first = await agent.generate_insights(USER_ID, "week")
+    second = await agent.generate_insights(USER_ID, "week")
+
+    assert "error" in first and "error" in second
+    assert agent.insight_cache.stats["misses"] == 2
+    assert await storage.get_cached_insights(USER_ID, "week") is None
+
+
+@pytest.mark.asyncio
+async def test_cancelled_compute_releases_waiters():
+    cache = InsightCache(db=InMemoryStorage())
+    started = asyncio.Event()
+
+    async def compute():
+        started.set()
+        await asyncio.sleep(60)
+        return {}
+
+    first = asyncio.create_task(cache.get_or_compute(USER_ID, "week", compute))
+    await started.wait()
+    second = asyncio.create_task(cache.get_or_compute(USER_ID, "week", compute))
+    await asyncio.sleep(0)
+
+    first.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(second, timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_hits_return_copies():
+    cache = InsightCache(db=InMemoryStorage())
+
+    async def compute():
+        return {"insights": ["Keep going"], "patterns": {}}
+
+    first = await cache.get_or_compute(USER_ID, "week", compute)
+    first["insights"].append("edited")
+
+    second = await cache.get_or_compute(USER_ID, "week", compute)
+    assert second["insights"] == ["Keep going"]
+    assert cache.stats["local_hits"] == 1
@@ -0,0 +1,61 @@
+"""Tests for the fast path intent router."""
+
+from datetime import datetime
+
+import pytest
+
+from src.agent.intent_router import BEST_DAY, FAST_PATH, STEPS_TODAY, STREAK, IntentRouter
+from src.agent.tools.fitness_data_tools import FitnessDataTools
+from src.services.fitness_analyzer import FitnessAnalyzer
+from src.services.memory_storage import InMemoryStorage
+
+USER_ID = "user-1"
+
+
+def make_router(storage: InMemoryStorage) -> IntentRouter:
+    """Router over fitness tools backed by the given storage."""
+    return IntentRouter(FitnessDataTools(storage), FitnessAnalyzer())
+
+
+def today_rows(steps: int):
+    """One activity row for today."""
+    return [{"userId": USER_ID, "date": datetime.now().date(), "steps": steps}]
+
+
+@pytest.mark.parametrize("message, intent", [
+    ("How many steps today?", STEPS_TODAY),
+    ("Steps so far?", STEPS_TODAY),
+    ("What's my current streak?", STREAK),
+    ("What's my best day?", BEST_DAY),
+    ("Which weekday am I most active?", BEST_DAY),
+])
+def test_classifies_fast_path_questions(message, intent):
+    assert make_router(InMemoryStorage()).classify(message) == intent
+
+
+@pytest.mark.parametrize("message", [
+    "which weekday is my worst day?",
+    "what's the top best exercise?",
+    "Is 8000 steps a good step count?",
+    "How can I improve my steps today?",
+    "What's my best day and my streak?",
+])
+def test_leaves_other_questions_to_the_llm(message):
+    assert make_router(InMemoryStorage()).classify(message) is None
+
+
+@pytest.mark.asyncio
+async def test_answers_from_data():
+    router = make_router(InMemoryStorage(activity_data=today_rows(4321)))
+
+    reply = await router.answer(USER_ID, "How many steps today?")
+
+    assert reply["tools_used"] == [f"{FAST_PATH}:{STEPS_TODAY}"]
+    assert "4,321" in reply["message"]
+
+
+@pytest.mark.asyncio
+async def test_falls_through_when_data_fails(failing_storage):
+    router = make_router(failing_storage(activity_data=today_rows(4321)))
+
+    assert await router.answer(USER_ID, "How many steps today?") is None
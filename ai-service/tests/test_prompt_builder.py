@@ -0,0 +1,81 @@
+"""Tests for the token-budgeted prompt builder."""
+
+from src.agent.prompts.prompt_builder import (
+    ELLIPSIS,
+    TRIM_START,
+    PromptBuilder,
+    PromptSection,
+    count_tokens,
+    truncate_tokens,
+)
+
+
+def items(prefix: str, count: int, words: int = 10):
+    """count items of words four-letter words each (one token per word)."""
+    return [" ".join([f"{prefix}{i:03d}"[:4]] * words) for i in range(count)]
+
+
+def test_counts_word_pieces_and_punctuation():
+    assert count_tokens("") == 0
+    assert count_tokens("steps today") == 4
+    assert count_tokens("8,000!") == 4
+
+
+def test_truncate_keeps_short_text_and_marks_cuts():
+    assert truncate_tokens("walk more", 5) == "walk more"
+    assert truncate_tokens("walk more every day", 3) == "walk more" + ELLIPSIS
+    assert count_tokens(truncate_tokens("walk more every day", 3)) <= 3
+    assert truncate_tokens("walk", 0) == ""
+
+
+def test_sections_fit_their_own_budgets():
+    section = PromptSection("history", items("h", 10), priority=20, budget=35)
+
+    build = PromptBuilder(10_000).build([section])
+
+    assert build.breakdown["history"] <= 35
+    assert build.trimmed == {"history": {"dropped_items": 7, "truncated": False}}
+
+
+def test_trim_start_drops_the_oldest_items():
+    section = PromptSection("history", ["old " * 10, "mid " * 10, "new " * 10], priority=20, budget=20, trim=TRIM_START)
+
+    build = PromptBuilder(10_000).build([section])
+
+    assert "old" not in build.text
+    assert "new" in build.text and "mid" in build.text
+
+
+def test_lowest_priority_is_trimmed_first_and_required_is_kept():
+    context = PromptSection("context", items("c", 4), priority=30)
+    history = PromptSection("history", items("h", 4), priority=20)
+    message = PromptSection("message", ["m " * 30], priority=100, required=True)
+
+    build = PromptBuilder(60).build([context, history, message])
+
+    assert build.total_tokens <= 60
+    assert build.breakdown["history"] == 0
+    assert build.breakdown["context"] > 0
+    assert build.breakdown["message"] == 30
+    assert "history" in build.trimmed
+
+
+def test_single_long_item_is_truncated():
+    section = PromptSection("message", ["word " * 100], priority=100, budget=20, header="## Message")
+
+    build = PromptBuilder(10_000).build([section])
+
+    assert build.text.startswith("## Message\n\n")
+    assert build.text.endswith(ELLIPSIS)
+    assert build.breakdown["message"] <= 20
+    assert build.trimmed["message"]["truncated"] is True
+
+
+def test_sections_render_in_order_and_empty_ones_vanish():
+    build = PromptBuilder(10_000).build([
+        PromptSection("a", ["first"], priority=1, header="## A"),
+        PromptSection("b", [], priority=1, header="## B"),
+        PromptSection("c", ["last"], priority=1),
+    ])
+
+    assert build.text == "## A\n\nfirst\n\nlast"
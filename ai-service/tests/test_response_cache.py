@@ -0,0 +1,56 @@
+"""Tests for the chat response cache."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.agent.context_loader import ContextLoader
+from src.agent.tools.fitness_data_tools import FitnessDataTools
+from src.services.memory_storage import InMemoryStorage
+from src.services.response_cache import ResponseCache
+
+USER_ID = "user-1"
+
+
+def make_tools(storage_class=InMemoryStorage) -> FitnessDataTools:
+    """Fitness tools over two weeks of in-memory activity ending today."""
+    today = datetime.now().date()
+    return FitnessDataTools(storage_class(activity_data=[
+        {"userId": USER_ID, "date": today - timedelta(days=offset), "steps": 6000 + 250 * offset}
+        for offset in range(14)
+    ]))
+
+
+@pytest.mark.asyncio
+async def test_same_context_loaded_twice_hits():
+    loader = ContextLoader(make_tools())
+    cache = ResponseCache()
+    message = "How was my week?"
+
+    first = await loader.load(USER_ID, message)
+    cache.put(cache.key(USER_ID, message, first), {"message": "cached"})
+
+    second = await loader.load(USER_ID, message)
+    assert cache.get(cache.key(USER_ID, message, second)) == {"message": "cached"}
+
+
+@pytest.mark.asyncio
+async def test_changed_data_misses():
+    loader = ContextLoader(make_tools())
+    cache = ResponseCache()
+    message = "How was my week?"
+
+    first = await loader.load(USER_ID, message)
+    cache.put(cache.key(USER_ID, message, first), {"message": "cached"})
+
+    changed = dict(first, fitness_summary=dict(first["fitness_summary"], total_steps=1))
+    assert cache.get(cache.key(USER_ID, message, changed)) is None
+
+
+@pytest.mark.asyncio
+async def test_failed_load_is_flagged(failing_storage):
+    loader = ContextLoader(make_tools(failing_storage))
+
+    context = await loader.load(USER_ID, "How was my week?")
+
+    assert context["error"] is True
@@ -0,0 +1,86 @@
+"""Tests for the rollup plan and the migration statement splitter."""
+
+import importlib.util
+import random
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+from src.services.database_service import _next_month, _rollup_plan
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+
+
+def load_migrate():
+    """Import scripts/migrate.py, which is not part of a package."""
+    spec = importlib.util.spec_from_file_location("migrate", SCRIPTS / "migrate.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def covered_days(months, weeks, days):
+    """Every day covered by a plan, in bucket order."""
+    covered = []
+    for month in months:
+        covered.extend(month + timedelta(days=i) for i in range((_next_month(month) - month).days))
+    for week in weeks:
+        covered.extend(week + timedelta(days=i) for i in range(7))
+    covered.extend(days)
+    return covered
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_plan_covers_the_range_exactly_once(seed):
+    rng = random.Random(seed)
+    start = date(2024, 1, 1) + timedelta(days=rng.randint(0, 700))
+    end = start + timedelta(days=rng.randint(0, 400))
+
+    months, weeks, days = _rollup_plan(start, end)
+    covered = covered_days(months, weeks, days)
+
+    assert sorted(covered) == [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    assert all(month.day == 1 for month in months)
+    assert all(week.weekday() == 0 for week in weeks)
+
+
+def test_year_reads_mostly_months():
+    months, weeks, days = _rollup_plan(date(2024, 1, 15), date(2025, 1, 14))
+
+    assert len(months) == 11
+    assert len(months) + len(weeks) + len(days) < 40
+
+
+def test_single_day_is_read_raw():
+    assert _rollup_plan(date(2024, 3, 6), date(2024, 3, 6)) == ([], [], [date(2024, 3, 6)])
+
+
+def test_split_keeps_dollar_quoted_bodies():
+    sql = """
+    CREATE TABLE t (id INT);
+    -- a comment; with a semicolon and a quote's apostrophe
+    CREATE FUNCTION f() RETURNS VOID AS $$
+    BEGIN
+        PERFORM 1; PERFORM 'a;b';
+    END;
+    $$ LANGUAGE plpgsql;
+    CREATE FUNCTION g() RETURNS TEXT AS $body$ SELECT ';' $body$ LANGUAGE sql;
+    COMMENT ON TABLE t IS 'x; y'
+    """
+
+    statements = load_migrate().split_statements(sql)
+
+    assert len(statements) == 4
+    assert statements[1].endswith("$$ LANGUAGE plpgsql")
+    assert "PERFORM 'a;b';" in statements[1]
+    assert statements[2].endswith("$body$ LANGUAGE sql")
+    assert statements[3] == "COMMENT ON TABLE t IS 'x; y'"
+
+
+def test_rollup_migration_splits_into_whole_statements():
+    statements = load_migrate().split_statements((SCRIPTS / "create_activity_rollups.sql").read_text())
+
+    functions = [s for s in statements if "CREATE OR REPLACE FUNCTION" in s]
+    assert len(functions) == 2
+    assert all(s.endswith("$$ LANGUAGE plpgsql") for s in functions)
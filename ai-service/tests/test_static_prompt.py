@@ -0,0 +1,24 @@
+"""Tests for the static prompt segment."""
+
+from src.agent.prompts.static_prompt import build_static_prompt
+from src.agent.prompts.system_prompt import EXAMPLES_HEADING, get_system_prompt
+
+
+def headings(text: str):
+    """Section headings in prompt order."""
+    return [line for line in text.splitlines() if line.startswith("## ")]
+
+
+def test_unlimited_budget_renders_the_system_prompt():
+    prompt = build_static_prompt(100_000, 100_000)
+
+    assert prompt.text == get_system_prompt().strip()
+
+
+def test_examples_keep_their_position():
+    full = headings(get_system_prompt())
+
+    trimmed = headings(build_static_prompt(100_000, 0).text)
+
+    assert EXAMPLES_HEADING not in trimmed
+    assert trimmed == [heading for heading in full if heading != EXAMPLES_HEADING]
@@ -0,0 +1,83 @@
+"""Tests for the vectorized step statistics engine."""
+
+import random
+import statistics
+
+import numpy as np
+import pytest
+
+from src.services.step_stats import compute_step_stats, stats_to_dict
+
+
+def baseline_stats(steps):
+    """The "stats" dict the statistics-based analyze_patterns returned."""
+    steps = [s for s in steps if s]
+    if not steps:
+        return {}
+
+    avg_steps = statistics.mean(steps)
+    stdev_steps = statistics.stdev(steps) if len(steps) > 1 else 0
+    consistency_score = 100 - min((stdev_steps / avg_steps * 100) if avg_steps > 0 else 100, 100)
+
+    return {
+        "average": int(avg_steps),
+        "median": int(statistics.median(steps)),
+        "min": int(min(steps)),
+        "max": int(max(steps)),
+        "std_dev": int(stdev_steps),
+        "consistency": round(consistency_score, 1),
+        "days_analyzed": len(steps),
+        "days_hit_goal": sum(1 for s in steps if s >= 10000)
+    }
+
+
+def random_days(seed: int):
+    """Step counts with unrecorded (zero) days mixed in."""
+    rng = random.Random(seed)
+    return [rng.choice([0, rng.randint(1, 25000)]) for _ in range(rng.randint(1, 60))]
+
+
+@pytest.mark.parametrize("steps", [
+    [],
+    [0],
+    [0, 0, 0],
+    [7000],
+    [0, 12000, 0],
+    [8000, 8000, 8000, 8000],
+    [5000, 5000, 9000, 9000],
+    [3, 1, 2],
+    [10000, 9999, 10001, 0, 10000],
+    [1, 25000] * 10,
+])
+def test_matches_statistics_baseline(steps):
+    assert stats_to_dict(compute_step_stats(np.array(steps, dtype=np.int64))) == baseline_stats(steps)
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_matches_statistics_baseline_on_random_data(seed):
+    steps = random_days(seed)
+
+    assert stats_to_dict(compute_step_stats(np.array(steps))) == baseline_stats(steps)
+
+
+def test_cohort_rows_match_single_users():
+    cohort = [random_days(seed) for seed in range(20)]
+    width = max(len(days) for days in cohort)
+    matrix = np.array([days + [0] * (width - len(days)) for days in cohort])
+
+    stats = compute_step_stats(matrix)
+
+    for row, days in enumerate(cohort):
+        assert stats_to_dict(stats, row) == baseline_stats(days)
+
+
+def test_half_averages_follow_recorded_days():
+    steps = [4000, 0, 5000, 6000, 0, 7000, 8000, 9000, 10000, 11000]
+    recorded = [s for s in steps if s]
+    half = len(recorded) // 2
+
+    stats = compute_step_stats(np.array(steps))
+
+    assert stats["first_half_avg"][0] == statistics.mean(recorded[:half])
+    assert stats["second_half_avg"][0] == statistics.mean(recorded[half:])
+    assert np.isnan(compute_step_stats(np.array(steps[:6]))["first_half_avg"][0])
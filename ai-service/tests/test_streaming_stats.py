@@ -0,0 +1,73 @@
+"""Tests for the single-pass streaming accumulator."""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from src.services.daily_series import DailySeries
+from src.services.fitness_analyzer import FitnessAnalyzer
+from src.services.streaming_stats import HISTOGRAM_MAX_STEPS, StreamingAccumulator
+
+
+def history(seed: int, days: int):
+    """Daily records ending on a fixed day, newest first, with gaps and outliers."""
+    rng = random.Random(seed)
+    last_day = date(2025, 1, 31)
+    records = []
+    for offset in range(days):
+        steps = rng.choice([0, rng.randint(1, 20000), rng.randint(8000, 14000)])
+        if rng.random() < 0.02:
+            steps = rng.choice([-5, HISTOGRAM_MAX_STEPS + rng.randint(0, 10)])
+        records.append({
+            "date": last_day - timedelta(days=offset),
+            "steps": steps,
+            "calories": rng.choice([0, rng.randint(1500, 3500)]),
+            "distance": rng.choice([0, round(rng.uniform(0.5, 15), 2)])
+        })
+    return records
+
+
+def accumulate(records, chunk_days: int) -> StreamingAccumulator:
+    """Feed records to an accumulator in chunks of chunk_days."""
+    accumulator = StreamingAccumulator()
+    for start in range(0, len(records), chunk_days):
+        accumulator.update(DailySeries.from_dicts(records[start:start + chunk_days]))
+    return accumulator
+
+
+@pytest.mark.parametrize("seed, days, chunk_days", [
+    (seed, days, chunk_days)
+    for seed in range(10)
+    for days, chunk_days in ((1, 1), (9, 4), (60, 7), (400, 30), (400, 400))
+])
+def test_matches_loading_everything_at_once(seed, days, chunk_days):
+    records = history(seed, days)
+    analyzer = FitnessAnalyzer()
+    context = analyzer.analyze(records)
+
+    accumulator = accumulate(records, chunk_days)
+
+    assert accumulator.stats() == context.patterns["stats"]
+    assert accumulator.streak() == analyzer.calculate_weekly_streak(records)
+    assert accumulator.best_day() == analyzer.identify_best_day(records)
+    assert accumulator.calorie_average() == pytest.approx(context.calorie_average)
+    assert accumulator.total_distance() == pytest.approx(context.total_distance)
+
+
+def test_empty_history():
+    accumulator = StreamingAccumulator()
+    accumulator.update(DailySeries.empty())
+
+    assert accumulator.stats() == {}
+    assert accumulator.best_day() is None
+    assert accumulator.streak()["total_days"] == 0
+
+
+def test_all_zero_days_have_no_stats():
+    records = [{"date": date(2025, 1, 10) - timedelta(days=i), "steps": 0} for i in range(5)]
+
+    accumulator = accumulate(records, 2)
+
+    assert accumulator.stats() == {}
+    assert accumulator.streak()["total_days"] == 5